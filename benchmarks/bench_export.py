@@ -0,0 +1,34 @@
+"""
+InventoryItem.export(), against the json round-trip it replaced.
+
+    PYTHONPATH=src python benchmarks/bench_export.py [count]
+"""
+import json, sys, timeit
+
+import payloads
+from myrepairapp.inventory_item import item_from_json, InventoryJSONEncoder
+
+
+def legacy_export(item) -> dict:
+    # what export() used to do, minus the print()
+    returned = json.loads(json.dumps({name: getattr(item, name) for name in item.__slots__}, cls=InventoryJSONEncoder))
+    returned["id"] = returned["item_id"]; del returned["item_id"]
+    returned["storeId"] = returned["store_id"]; del returned["store_id"]
+    return returned
+
+
+def main(count: int = 5_000, repeat: int = 5):
+    items = [item_from_json(raw) for raw in payloads.inventory_search(count)]
+    cases = [("legacy json round-trip", lambda: [legacy_export(item) for item in items]),
+             ("export()", lambda: [item.export() for item in items]),
+             ("export(only=('in_stock', 'price'))", lambda: [item.export(only=("in_stock", "price")) for item in items]),
+             ("export_bytes()", lambda: [item.export_bytes() for item in items])]
+    baseline = None
+    for name, case in cases:
+        best = min(timeit.repeat(case, number=1, repeat=repeat)) / count * 1e6
+        baseline = baseline or best
+        print(f"{name:38} {best:7.2f} us/item  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,42 @@
+"""
+Per-instance memory of the model classes.
+
+    PYTHONPATH=src python benchmarks/bench_memory.py [count]
+
+Counts only what the objects themselves allocate. The decoded JSON they were built from is excluded.
+"""
+import sys, tracemalloc
+
+import payloads
+from myrepairapp.inventory_item import item_from_json
+from myrepairapp.checkin_ticket import ticket_from_json, activity_from_json
+from myrepairapp.customer import Customer
+
+
+def per_instance(build, raw: list) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(elem) for elem in raw]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - sys.getsizeof(objects)) / len(objects)
+
+
+def customer(raw: dict) -> Customer:
+    return Customer(raw["id"], raw["firstName"], raw["lastName"], raw["company"], raw["primaryPhone"], None, raw["email"], None, 0.0, [], None, None,
+                    None, None, None, None, None, None, None)
+
+
+def main(count: int = 10_000):
+    items = payloads.inventory_search(count)
+    tickets = payloads.ticket_search(count // 10)["tickets"]
+    activities = [activity for ticket in tickets for activity in ticket["checkinTicketActivities"]]
+    for name, build, raw in [("InventoryItem", item_from_json, items),
+                             ("CheckInTicket (with activities)", ticket_from_json, tickets),
+                             ("CheckinTicketActivity", activity_from_json, activities),
+                             ("Customer", customer, [ticket["customer"] for ticket in tickets])]:
+        print(f"{name:32} {per_instance(build, raw):8.0f} bytes/instance")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
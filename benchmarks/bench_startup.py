@@ -0,0 +1,54 @@
+"""
+Cold-start cost: importing `myrepairapp.api` and building a client, in fresh interpreters.
+
+    PYTHONPATH=src python benchmarks/bench_startup.py [runs]
+
+Also checks that the import stays side-effect free: no root logger handlers, and none of the heavy optional
+modules loaded until they're used.
+"""
+import os, statistics, subprocess, sys
+
+DEFERRED = ["requests", "rich", "aiohttp", "sqlite3", "asyncio", "email.utils"]
+
+PROBE = f"""
+import logging, sys, time
+started = time.perf_counter()
+import myrepairapp.api
+imported = time.perf_counter()
+myrepairapp.api.MyRepairApp("not-a-real-key")
+built = time.perf_counter()
+loaded = [name for name in {DEFERRED!r} if name in sys.modules]
+print(imported - started, built - imported, len(logging.getLogger().handlers), ",".join(loaded))
+"""
+
+
+def run_once() -> tuple[float, float, int, str]:
+    output = subprocess.run([sys.executable, "-c", PROBE], capture_output=True, text=True, check=True, env=os.environ).stdout.split()
+    return float(output[0]), float(output[1]), int(output[2]), output[3] if len(output) > 3 else ""
+
+
+def slowest_imports(count: int = 10) -> list[tuple[int, str]]:
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", "import myrepairapp.api"], capture_output=True, text=True, env=os.environ).stderr
+    rows = []
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        rows.append((int(cumulative), name.rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main(runs: int = 20):
+    results = [run_once() for _ in range(runs)]
+    imports = [result[0] * 1000 for result in results]; builds = [result[1] * 1000 for result in results]
+    print(f"import myrepairapp.api   median {statistics.median(imports):6.2f} ms   min {min(imports):6.2f} ms")
+    print(f"MyRepairApp(...)         median {statistics.median(builds):6.2f} ms   min {min(builds):6.2f} ms")
+    handlers, loaded = results[0][2], results[0][3]
+    print(f"root logger handlers: {handlers}   deferred modules loaded: {loaded or 'none'}")
+    print("\nslowest imports (cumulative us):")
+    for cumulative, name in slowest_imports():
+        print(f"  {cumulative:8d}  {name}")
+    if handlers or loaded:
+        sys.exit("importing myrepairapp.api is no longer side-effect free")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
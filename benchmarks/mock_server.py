@@ -0,0 +1,145 @@
+"""
+A local stand-in for the MyRepairApp API, for benchmarks.
+
+Serves `payloads.py` data on the same paths as the real API, with configurable sizes, added latency and a share
+of 429/500 responses. Use it in-process:
+
+    with MockServer(inventory_size=500, rate_429=0.05) as server:
+        transport = Transport("bench-key", server.base_url)
+
+or standalone: `python benchmarks/mock_server.py --port 8080 --tickets 2000`.
+"""
+import argparse, json, random, re, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import payloads
+
+API_KEY = "bench-key"
+PREFIX = "/api/v2"
+_ITEM_PATH = re.compile(rf"^{PREFIX}/inventory/([^/]+)$")
+_CUSTOMER_PATH = re.compile(rf"^{PREFIX}/customer/([^/]+)$")
+
+
+class MockServer:
+    """
+    - `inventory_size` / `ticket_count` - results per `/inventory/search` and `/checkin-ticket` response.
+    - `latency` - seconds added to every response, plus up to `jitter` more.
+    - `rate_429` / `rate_500` - share of requests answered with that status instead. 429s carry `Retry-After: retry_after`.
+    """
+
+    def __init__(self, inventory_size: int = 100, ticket_count: int = 100, latency: float = 0.0, jitter: float = 0.0,
+                 rate_429: float = 0.0, rate_500: float = 0.0, retry_after: float = 0.0, host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.latency = latency; self.jitter = jitter
+        self.rate_429 = rate_429; self.rate_500 = rate_500; self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.inventory_body = json.dumps(payloads.inventory_search(inventory_size, seed)).encode()
+        self.tickets_body = json.dumps(payloads.ticket_search(ticket_count, seed)).encode()
+        self.customers_body = json.dumps(payloads.customer_search(20)).encode()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{PREFIX}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _injected_status(self) -> int | None:
+        with self._lock:
+            self.requests += 1
+            roll = self.random.random()
+        if roll < self.rate_429: return 429
+        if roll < self.rate_429 + self.rate_500: return 500
+        return None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # keep-alive, like the real thing
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes = b"{}", headers: dict = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _respond(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                if server.latency or server.jitter:
+                    time.sleep(server.latency + server.random.random() * server.jitter)
+                if self.headers.get("X-Api-Key") != API_KEY:
+                    return self._send(401)
+                injected = server._injected_status()
+                if injected == 429:
+                    return self._send(429, headers={"Retry-After": str(server.retry_after)})
+                if injected == 500:
+                    return self._send(500)
+                path = urlparse(self.path).path
+                if method == "GET" and path == f"{PREFIX}/inventory/search":
+                    return self._send(200, server.inventory_body)
+                if method == "GET" and path == f"{PREFIX}/checkin-ticket":
+                    return self._send(200, server.tickets_body)
+                if method == "GET" and path == f"{PREFIX}/inventory":
+                    return self._send(405)
+                if method == "GET" and path == f"{PREFIX}/customer/search":
+                    return self._send(200, server.customers_body)
+                match = _CUSTOMER_PATH.match(path)
+                if method == "GET" and match:
+                    return self._send(200, json.dumps(payloads.customer(match.group(1))).encode())
+                match = _ITEM_PATH.match(path)
+                if method == "PATCH" and match:
+                    return self._send(200, json.dumps(payloads.inventory_item(0) | {"id": match.group(1)}).encode())
+                self._send(404)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_PATCH(self):
+                self._respond("PATCH")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--inventory", type=int, default=100, help="items per /inventory/search response")
+    parser.add_argument("--tickets", type=int, default=100, help="tickets per /checkin-ticket response")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    args = parser.parse_args()
+    server = MockServer(args.inventory, args.tickets, args.latency, rate_429=args.rate_429, rate_500=args.rate_500, port=args.port)
+    print(f"serving {server.base_url} (X-Api-Key: {API_KEY})")
+    server.start()._thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Made-up but realistically shaped MyRepairApp payloads, for the benchmarks. Seeded, so runs are comparable."""
+import random
+
+MANUFACTURERS = ["Apple", "Samsung", "Google", "Motorola", "LG", "Nintendo", "Sony", "DJI"]
+TYPES = ["Part - Phone", "Part - Tablet", "Part - Special Order", "Repair - Phone", "Repair - Laptop", "Repair - Game", "Accessory - Case",
+         "Accessory - Screen Protector", "Accessory - Power", "Device - Phone", "Device - Tablet", "Service - Unlock", "Prepaid - SIM", "Tools"]
+CATEGORIES = ["Part", "Repair", "Accessory", "Device", "Service", "Prepaid", "Tool"]
+CONDITIONS = ["New", "Used", "Refurbished", "Damaged"]
+STATUSES = ["Open", "In Progress", "Waiting For Part", "Ready For Pickup", "Closed"]
+ACTIVITIES = ["CREATION", "ITEMS_CHANGED", "DEVICES_CHANGED", "STATUS_CHANGE", "SAVED"]
+
+
+def _timestamp(rng: random.Random) -> str:
+    return f"20{rng.randint(19, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.{rng.randint(0, 999):03d}Z"
+
+
+def inventory_item(n: int, rng: random.Random = None) -> dict:
+    rng = rng or random.Random(n)
+    return {
+        "id": f"inv_{n:08d}", "storeId": "store_0001", "sku": f"SKU-{n:06d}", "manufacturer": rng.choice(MANUFACTURERS),
+        "type": rng.choice(TYPES), "name": f"{rng.choice(MANUFACTURERS)} part #{n}", "instock": rng.randint(0, 40),
+        "condition": rng.choice(CONDITIONS), "bin": f"BIN-{rng.randint(1, 60):02d}", "supplierId": f"sup_{rng.randint(1, 12)}",
+        "price": round(rng.uniform(5, 900), 2), "createdAt": _timestamp(rng), "updatedAt": _timestamp(rng), "note": None,
+        "inventoried": True, "serialized": rng.random() < 0.2, "active": True, "cost": round(rng.uniform(1, 500), 2),
+        "category": rng.choice(CATEGORIES), "serialNum": None, "carrier": None, "color": rng.choice(["Black", "White", None]),
+        "storage": None, "tradeInCondition": None, "tradeInStatus": None, "additionalInfo": None, "isRebate": False,
+        "taxFree": False, "groupingId": None, "repairProvider": None, "isMotorolaSku": False, "relevance": rng.random(),
+        "pulled": False, "ordered": False, "backOrdered": False, "skuPulled": False, "skuInstock": True,
+    }
+
+
+def ticket(n: int, items: int = 3, activities: int = 6, rng: random.Random = None) -> dict:
+    rng = rng or random.Random(n)
+    closed = rng.random() < 0.6
+    customer_id = f"cus_{rng.randint(1, max(1, n // 4 + 1)):06d}"
+    assignee_id = f"usr_{rng.randint(1, 8)}"
+    return {
+        "id": f"tkt_{n:08d}", "orgId": "org_0001", "ticketNumber": 1000 + n, "active": not closed, "assigneeId": assignee_id,
+        "customerId": customer_id, "order": n, "type": {"id": "type_repair", "name": "Repair"}, "status": "Closed" if closed else rng.choice(STATUSES[:-1]),
+        "closedAt": _timestamp(rng) if closed else None, "warrantyPeriodEnd": _timestamp(rng) if rng.random() < 0.3 else None,
+        "isWarranty": rng.random() < 0.1, "isReturn": rng.random() < 0.05, "notToExceed": None, "appointmentTime": None,
+        "customerPossession": False, "storageBin": f"SB-{rng.randint(1, 30)}", "waitingForPart": rng.random() < 0.15,
+        "shipper": None, "trackingNumber": None, "shipstationShipmentId": None, "labelURL": None, "claimRepairProvider": None,
+        "createdAt": _timestamp(rng), "updatedAt": _timestamp(rng),
+        "assignee": {"id": assignee_id, "firstName": "Tech", "lastName": assignee_id[-1]},
+        "customer": {"id": customer_id, "firstName": "Pat", "lastName": f"Customer {customer_id[-4:]}", "email": f"{customer_id}@example.com",
+                     "primaryPhone": "5555550100", "company": None},
+        "checkinItems": [{"id": f"cki_{n}_{k}", "quantity": 1, "inventoryItem": inventory_item(rng.randint(0, 400), rng)} for k in range(items)],
+        "checkinDevices": [{"id": f"dev_{n}", "name": "iPhone 13", "imei": None}], "checkinPayments": [], "checkinNotes": [],
+        "checkinTicketActivities": [{"id": f"act_{n}_{k}", "checkinTicketId": f"tkt_{n:08d}", "userId": assignee_id,
+                                     "type": rng.choice(ACTIVITIES), "metadata": {}, "createdAt": _timestamp(rng)} for k in range(activities)],
+        "myProtectionPlans": [],
+    }
+
+
+def customer(customer_id: str) -> dict:
+    rng = random.Random(customer_id)
+    return {
+        "id": customer_id, "firstName": "Pat", "lastName": f"Customer {customer_id[-4:]}", "company": None, "primaryPhone": "5555550100",
+        "contactPhone": None, "email": f"{customer_id}@example.com", "driversLicense": None, "storeCredit": round(rng.uniform(0, 50), 2),
+        "preferredContactMethods": ["SMS"], "billingAgent": None, "netTerms": None, "postalCode": f"{rng.randint(10000, 99999)}",
+        "referralSourceId": None, "street1": f"{rng.randint(1, 999)} Main St", "street2": None, "country": "US", "state": "CA", "city": "Springfield",
+        "updatedAt": "2025-01-01T00:00:00.000Z",
+    }
+
+
+def customer_search(count: int) -> list[dict]:
+    return [customer(f"cus_{n:06d}") for n in range(1, count + 1)]
+
+
+def inventory_search(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [inventory_item(n, rng) for n in range(count)]
+
+
+def ticket_search(count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {"tickets": [ticket(n, rng=rng) for n in range(count)]}
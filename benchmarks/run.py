@@ -0,0 +1,200 @@
+"""
+Offline benchmark suite. Nothing here touches the real API.
+
+    PYTHONPATH=src python benchmarks/run.py [--quick] [--no-save] [--compare [FILE]]
+
+Measures, against `mock_server.MockServer`:
+
+- parse cost of `item_from_json` / `ticket_from_json` (and the lazy models) per object
+- memory per model instance
+- end-to-end throughput and p50/p99 latency of `MyRepairApp`, serial and batched, and of `AsyncMyRepairApp`
+- the same with injected 429/500 responses, counting retries and failures
+
+Results go to `benchmarks/results/<timestamp>.json`. `--compare` diffs this run against the latest saved one, or FILE.
+"""
+import argparse, asyncio, json, platform, statistics, subprocess, sys, time, timeit
+from pathlib import Path
+
+import payloads
+from bench_memory import per_instance, customer
+from mock_server import MockServer, API_KEY
+from myrepairapp import lazy
+from myrepairapp.inventory_item import item_from_json
+from myrepairapp.checkin_ticket import ticket_from_json, activity_from_json
+from myrepairapp.exceptions import BaseMRAException
+from myrepairapp.ratelimit import RateLimiter
+from myrepairapp.transport import Transport
+
+RESULTS = Path(__file__).parent / "results"
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def latency_summary(latencies: list[float], elapsed: float) -> dict:
+    return {"requests": len(latencies), "throughput_rps": len(latencies) / elapsed, "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000, "mean_ms": statistics.fmean(latencies) * 1000}
+
+
+def bench_parse(size: int) -> dict:
+    items = payloads.inventory_search(size)
+    tickets = payloads.ticket_search(size // 10 or 1)["tickets"]
+    cases = {"item_from_json_us": (item_from_json, items), "ticket_from_json_us": (ticket_from_json, tickets),
+             "lazy_item_name_us": (lambda raw: lazy.LazyInventoryItem(raw).name, items),
+             "lazy_ticket_number_us": (lambda raw: lazy.LazyCheckInTicket(raw).ticketNumber, tickets)}
+    results = {}
+    for name, (parse, raw) in cases.items():
+        best = min(timeit.repeat(lambda: [parse(elem) for elem in raw], number=1, repeat=5))
+        results[name] = best / len(raw) * 1e6
+    return results
+
+
+def bench_memory(size: int) -> dict:
+    items = payloads.inventory_search(size)
+    tickets = payloads.ticket_search(size // 10 or 1)["tickets"]
+    activities = [activity for ticket in tickets for activity in ticket["checkinTicketActivities"]]
+    return {"InventoryItem_bytes": per_instance(item_from_json, items), "CheckInTicket_bytes": per_instance(ticket_from_json, tickets),
+            "CheckinTicketActivity_bytes": per_instance(activity_from_json, activities),
+            "Customer_bytes": per_instance(customer, [ticket["customer"] for ticket in tickets])}
+
+
+def _limiter() -> RateLimiter:
+    # effectively unlimited, with fast retries, so the benchmark measures the client and not the quota
+    return RateLimiter(rate=1e6, burst=1e6, base_delay=0.005, max_delay=0.05, max_retries=20)
+
+
+def bench_sync(server: MockServer, requests: int, concurrency: int) -> dict:
+    try:
+        import requests as _
+    except ImportError:
+        return {"skipped": "requests isn't installed"}
+    from myrepairapp.api import MyRepairApp
+    limiter = _limiter()
+    client = MyRepairApp(API_KEY, transport=Transport(API_KEY, server.base_url, pool_size=concurrency, rate_limiter=limiter))
+    results = {}
+    with client:
+        latencies = []; failed = 0
+        started = time.perf_counter()
+        for n in range(requests):
+            call = time.perf_counter()
+            try:
+                client.inventory_search(f"part {n}")
+            except BaseMRAException: # injected 500s
+                failed += 1
+            latencies.append(time.perf_counter() - call)
+        results["serial_inventory"] = latency_summary(latencies, time.perf_counter() - started) | {"failed": failed}
+
+        started = time.perf_counter()
+        batch = client.inventory_search_many([f"part {n}" for n in range(requests)], concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        results["batched_inventory"] = {"requests": requests, "throughput_rps": requests / elapsed, "failed": sum(not result.ok for result in batch)}
+
+        latencies = []; failed = 0
+        started = time.perf_counter()
+        for n in range(max(1, requests // 10)):
+            call = time.perf_counter()
+            try:
+                client.ticket_search(str(n))
+            except BaseMRAException:
+                failed += 1
+            latencies.append(time.perf_counter() - call)
+        results["serial_tickets"] = latency_summary(latencies, time.perf_counter() - started) | {"failed": failed}
+    results["rate_limiter"] = limiter.stats.as_dict()
+    return results
+
+
+def bench_async(server: MockServer, requests: int, concurrency: int) -> dict:
+    try:
+        import aiohttp as _
+    except ImportError:
+        return {"skipped": "aiohttp isn't installed"}
+    from myrepairapp.api import AsyncMyRepairApp
+    limiter = _limiter()
+
+    async def run() -> dict:
+        async with AsyncMyRepairApp(API_KEY, transport=Transport(API_KEY, server.base_url, limit_per_host=concurrency, rate_limiter=limiter)) as client:
+            latencies = []
+
+            async def timed(query):
+                call = time.perf_counter()
+                try:
+                    await client.inventory_search(query)
+                except BaseMRAException:
+                    pass
+                latencies.append(time.perf_counter() - call)
+
+            started = time.perf_counter()
+            batch = await client.inventory_search_many([f"part {n}" for n in range(requests)], concurrency=concurrency)
+            elapsed = time.perf_counter() - started
+            started_timed = time.perf_counter()
+            await asyncio.gather(*[timed(f"part {n}") for n in range(requests)])
+            return {"batched_inventory": {"requests": requests, "throughput_rps": requests / elapsed, "failed": sum(not result.ok for result in batch)},
+                    "concurrent_inventory": latency_summary(latencies, time.perf_counter() - started_timed)}
+
+    results = asyncio.run(run())
+    results["rate_limiter"] = limiter.stats.as_dict()
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(current: dict, previous: dict):
+    now = flatten(current["results"]); then = flatten(previous["results"])
+    print(f"\ncompared with {previous['meta']['revision']} ({previous['meta']['timestamp']}):")
+    for key in sorted(now.keys() & then.keys()):
+        if then[key]:
+            print(f"  {key:55} {then[key]:12.2f} -> {now[key]:12.2f}  ({(now[key] - then[key]) / then[key] * 100:+6.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MyRepairApp benchmark suite.")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a smoke run")
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument("--compare", nargs="?", const="latest", help="a results file, or the latest one if left out")
+    parser.add_argument("--latency", type=float, default=0.002, help="seconds the mock server adds per response")
+    args = parser.parse_args()
+
+    size, requests, concurrency = (500, 50, 8) if args.quick else (5000, 400, 16)
+    results = {"parse": bench_parse(size), "memory": bench_memory(size)}
+    with MockServer(inventory_size=100, ticket_count=50, latency=args.latency) as server:
+        results["sync"] = bench_sync(server, requests, concurrency)
+        results["async"] = bench_async(server, requests, concurrency)
+    with MockServer(inventory_size=100, ticket_count=50, latency=args.latency, rate_429=0.05, rate_500=0.02) as server:
+        results["sync_with_errors"] = bench_sync(server, requests, concurrency)
+        results["async_with_errors"] = bench_async(server, requests, concurrency)
+
+    run = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(), "python": platform.python_version(),
+                    "platform": platform.platform(), "quick": args.quick}, "results": results}
+    print(json.dumps(run, indent=2))
+
+    previous = None
+    if args.compare:
+        saved = sorted(RESULTS.glob("*.json"))
+        path = Path(args.compare) if args.compare != "latest" else (saved[-1] if saved else None)
+        previous = json.loads(path.read_text()) if path else None
+    if not args.no_save:
+        RESULTS.mkdir(exist_ok=True)
+        (RESULTS / f"{time.strftime('%Y%m%d-%H%M%S')}-{run['meta']['revision']}.json").write_text(json.dumps(run, indent=2))
+    if previous:
+        compare(run, previous)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
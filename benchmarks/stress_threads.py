@@ -0,0 +1,87 @@
+"""
+Stress check for sharing one client between many threads, against `mock_server.MockServer`.
+
+    PYTHONPATH=src python benchmarks/stress_threads.py [--threads 64] [--calls 50] [--client shared|blocking|both]
+
+Every thread hammers the same client with a mix of inventory searches, ticket searches and ticket streams, some
+identical and some not, while the server injects 429s and 500s. It checks that every answer is complete and
+correct, that nothing but the injected errors was raised, and reports throughput, p50/p99 latency and how many
+requests coalescing saved. Exits non-zero if anything came back wrong.
+"""
+import argparse, random, sys, threading, time
+from collections import Counter
+
+import payloads
+from mock_server import MockServer, API_KEY
+from myrepairapp.exceptions import BaseMRAException
+from myrepairapp.ratelimit import RateLimiter
+from myrepairapp.transport import Transport
+
+INVENTORY_SIZE = 50
+TICKET_COUNT = 20
+
+
+def make_client(kind: str, server: MockServer, threads: int):
+    limiter = RateLimiter(rate=1e6, burst=1e6, base_delay=0.005, max_delay=0.05, max_retries=20)
+    if kind == "shared":
+        from myrepairapp.api import SharedMyRepairApp
+        return SharedMyRepairApp(API_KEY, transport=Transport(API_KEY, server.base_url, limit_per_host=16, rate_limiter=limiter), timeout=60)
+    from myrepairapp.api import MyRepairApp
+    return MyRepairApp(API_KEY, transport=Transport(API_KEY, server.base_url, pool_size=threads, rate_limiter=limiter))
+
+
+def worker(client, calls: int, seed: int, latencies: list, outcomes: Counter, lock: threading.Lock, expected_ids: set):
+    rng = random.Random(seed)
+    for _ in range(calls):
+        started = time.perf_counter()
+        try:
+            match rng.choice(("inventory", "inventory", "tickets", "stream")):
+                case "inventory":
+                    items = client.inventory_search(f"part {rng.randint(0, 5)}", lazy=rng.random() < 0.3)
+                    ok = len(items) == INVENTORY_SIZE and {item.item_id for item in items} == expected_ids
+                case "tickets":
+                    ok = len(client.ticket_search(str(rng.randint(0, 5)))) == TICKET_COUNT
+                case "stream":
+                    ok = sum(1 for _ in client.iter_tickets("all", closed_included=True)) == TICKET_COUNT
+            outcome = "ok" if ok else "wrong"
+        except BaseMRAException as error: # the injected 500s
+            outcome = type(error).__name__
+        except Exception as error:
+            outcome = f"unexpected {type(error).__name__}: {error}"
+        with lock:
+            latencies.append(time.perf_counter() - started)
+            outcomes[outcome] += 1
+
+
+def stress(kind: str, threads: int, calls: int) -> bool:
+    expected_ids = {item["id"] for item in payloads.inventory_search(INVENTORY_SIZE)}
+    with MockServer(inventory_size=INVENTORY_SIZE, ticket_count=TICKET_COUNT, latency=0.005, rate_429=0.05, rate_500=0.01) as server:
+        client = make_client(kind, server, threads)
+        latencies = []; outcomes = Counter(); lock = threading.Lock()
+        pool = [threading.Thread(target=worker, args=(client, calls, n, latencies, outcomes, lock, expected_ids)) for n in range(threads)]
+        started = time.perf_counter()
+        for thread in pool: thread.start()
+        for thread in pool: thread.join()
+        elapsed = time.perf_counter() - started
+        client.close()
+        served = server.requests
+    latencies.sort()
+    print(f"{kind}: {threads} threads x {calls} calls in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} calls/s), "
+          f"p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+    print(f"  server saw {served} requests, coalescing saved {client.single_flight.saved}, rate limiter {client.rate_limiter.stats.as_dict()}")
+    print(f"  outcomes: {dict(outcomes)}")
+    return not any(outcome == "wrong" or outcome.startswith("unexpected") for outcome in outcomes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shares one client between many threads and checks every answer.")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--calls", type=int, default=50, help="calls per thread")
+    parser.add_argument("--client", choices=("shared", "blocking", "both"), default="both")
+    args = parser.parse_args()
+    kinds = ("shared", "blocking") if args.client == "both" else (args.client,)
+    return 0 if all([stress(kind, args.threads, args.calls) for kind in kinds]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,104 +1,647 @@
-import requests, logging, asyncio, random, enum
+import copy, logging, enum, time
+from typing import TYPE_CHECKING
 if __name__ == "__main__":
     pass
     # import exceptions, inventory_item, checkin_ticket, generic
 else:
-    from . import exceptions, inventory_item, checkin_ticket, generic
-from rich.logging import RichHandler
+    from . import exceptions, inventory_item, checkin_ticket, customer, generic, batch, lazy, bulk, codec
+    from .streaming import JSONArrayStream
+    from .transport import Transport, MYREPAIRAPP_LINK
+    from .ratelimit import RateLimiter
+    from .instrumentation import Instrumentation
+    from .singleflight import SingleFlight
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .diskcache import DiskCache
+    from .mirror import InventoryMirror
+
+# importing this module has no side effects. nothing touches logging, and requests, rich, sqlite3 and asyncio
+# are only imported once something needs them. see benchmarks/bench_startup.py
 
 FORMAT = "%(message)s"
-logging.basicConfig(
-    level="INFO", format=FORMAT, datefmt="[%X]", handlers=[RichHandler()]
-)
 
 log = logging.getLogger(__name__)
 
+def setup_logging(level: str = "INFO"):
+    """Sends logs to the terminal through rich. This used to happen on import; now it's up to you."""
+    from rich.logging import RichHandler
+    logging.basicConfig(
+        level=level, format=FORMAT, datefmt="[%X]", handlers=[RichHandler()]
+    )
+
 class UpdateType(enum.Enum):
     """The item type that is being updated."""
 
     CHECKIN_TICKET = "Checkin Ticket"
     INVENTORY = "Inventory" # inventory item
 
+def _update_type(data: generic.GenericItem) -> UpdateType:
+    match data.ITEM_TYPE:
+        case "inventory": return UpdateType.INVENTORY
+        case "checkin ticket": raise NotImplementedError("Complicated function that goes beyond our limits currently. WIP.")
+
+def _patch_request(update_type: UpdateType, data: generic.GenericItem, changed: dict) -> tuple[str, dict]:
+    """
+    Builds the (path, form data) pair for a PATCH.
+
+    `changed` may use attribute names (`in_stock`) or wire names (`instock`). Keys the item doesn't have are dropped.
+    """
+    match update_type:
+        case UpdateType.INVENTORY:
+            assert type(data) in (inventory_item.InventoryItem, lazy.LazyInventoryItem)
+            _patch_data = {}
+            for key, value in changed.items():
+                wire = inventory_item.wire_name(key)
+                if wire is not None:
+                    _patch_data[wire] = inventory_item.wire_value(value)
+            return f"/inventory/{data.item_id}", _patch_data
+
+# response body -> models. the eager ones go through `codec`, which decodes straight into models on msgspec
+
+def _inventory_from_payload(payload: list) -> list[inventory_item.InventoryItem]:
+    return [inventory_item.item_from_json(elem) for elem in payload]
+
+def _lazy_inventory_from_payload(payload: list) -> list[lazy.LazyInventoryItem]:
+    return [lazy.LazyInventoryItem(elem) for elem in payload]
+
+def _lazy_tickets_from_body(body: bytes) -> list[lazy.LazyCheckInTicket]:
+    return [lazy.LazyCheckInTicket(ticket) for ticket in codec.loads(body)["tickets"]]
+
+def _ticket_parser(lazy_tickets: bool):
+    return lazy.LazyCheckInTicket if lazy_tickets else checkin_ticket.ticket_from_json
+
+def _inventory_ids(items: list) -> set:
+    return {item.item_id for item in items}
+
+def _no_ids(results: list) -> set:
+    # customers never go stale through update_item
+    return set()
+
+def _customer_path(customer_id: str) -> str:
+    # https://myrepairapp.com/api/v2/customer/<id>
+    return f"/customer/{customer_id}"
+
+def _customer_from_body(body: bytes) -> dict:
+    payload = codec.loads(body)
+    return payload["customer"] if isinstance(payload.get("customer"), dict) else payload
+
+def _ticket_item_ids(tickets: list) -> set:
+    # tickets only go stale on update_item through the inventory items checked in on them
+    return {item["inventoryItem"].get("id") for ticket in tickets for item in ticket.checkinItems or [] if item.get("inventoryItem")}
+
+def _patched(client, item_id: str, sent: dict, response):
+    """Brings every local copy of `item_id` up to date after a successful PATCH."""
+    if client.cache is not None:
+        client.cache.invalidate_id(item_id)
+    if client.disk_cache is not None:
+        client.disk_cache.invalidate_id(item_id)
+    if client.mirror is not None:
+        # the API answers with the patched item. failing that, the fields we sent are the best we know
+        returned = response if isinstance(response, dict) and response.get("id") == item_id else {}
+        client.mirror.merge(item_id, sent | returned)
+
+def _cache_lookup(client, path: str, cache_params: dict):
+    hit, result = client.cache.get(path, cache_params)
+    if client.transport.instrumentation is not None:
+        client.transport.instrumentation.cache_lookup(path, hit)
+    return hit, result
+
+def _finish_search(client, path: str, cache_params: dict, body: bytes, parse, ids, detach: bool = True):
+    """Parses a search response (timing it, if instrumented) and caches a copy of the result."""
+    instrumentation = client.transport.instrumentation
+    started = time.perf_counter() if instrumentation is not None else 0.0
+    result = parse(body)
+    if instrumentation is not None:
+        instrumentation.parsed(path, time.perf_counter() - started)
+    if client.cache is not None:
+        client.cache.set(path, cache_params, _handed_out(result, detach), size=len(body), ids=ids(result))
+    return result
+
+def _handed_out(result: list, detach: bool) -> list:
+    """
+    A shared search result as given to one more holder. The cache's copy, each cache hit and each coalesced
+    follower get their own shallow copies of the objects, so setting attributes on one (before an `update_item`,
+    say) doesn't change what anyone else gets. The caller that made the request keeps the originals. Nested lists
+    and dicts are still shared and shouldn't be edited. `detach=False` is for identity-mapped results, which are
+    shared on purpose.
+    """
+    return [copy.copy(obj) for obj in result] if detach else list(result)
+
+async def _await(awaitable):
+    # run_coroutine_threadsafe only takes real coroutines, not an async generator's __anext__/aclose
+    return await awaitable
+
+def _ticket_params(query: str, closed_included: bool) -> dict:
+    # https://myrepairapp.com/api/v2/checkin-ticket?query=<string>&closed=<boolean>
+    return {"query": query, "closed": str(closed_included)}
+
 class MyRepairApp:
+    """
+    Blocking MyRepairApp client.
+
+    A thin wrapper over `Transport`. Every call, the key check included, goes through one pooled `requests.Session`,
+    so repeat lookups skip DNS, TCP and TLS setup. `pool_size` sets how many connections it keeps open. Close it with
+    `client.close()` or use it as a `with` block. Pass `transport=` to share one with an `AsyncMyRepairApp`.
+
+    Pass a `ResponseCache` as `cache=` to answer repeat searches without going over the network. The cache keeps its
+    own copies of results and each hit returns fresh ones, so editing one doesn't leak into the next caller's. `update_item`
+    invalidates every cached result containing the item it patched, and writes the change into the mirror. Pass an `InventoryMirror` as `mirror=` to answer
+    repeat `inventory_search`es from local data for `mirror.max_age` seconds, going to the API (and storing what it returns) otherwise.
+    Pass an `Instrumentation` as `instrumentation=` for latency histograms, status/retry/cache counters and request hooks.
+    Pass a `DiskCache` as `disk_cache=` to keep raw responses on disk, so a restarted process answers from there at once
+    and refetches stale ones in the background.
+
+    Identical searches running at the same time on different threads share one request and one parsed result
+    (see `SingleFlight`). `single_flight.saved` counts the requests that saved. Pass `coalesce=False` to turn it off.
+
+    Customers from `get_customer` and `customer_search` go into `customers`, a `CustomerIdentityMap`: unless you pass
+    one, the process-wide map for this `token` (`customer.for_token`), so clients with other keys don't see them.
+    `get_customer` answers from it until the entry's TTL runs out.
+
+    One instance may be shared by threads: the session is built once, and the rate limiter, cache, mirror and
+    instrumentation all lock. Each thread holds a connection for its request, so more threads than `pool_size`
+    open throwaway connections. `SharedMyRepairApp` multiplexes any number of threads over one pool instead.
+    """
+
     headers = None
-    MYREPAIRAPP_LINK = "https://www.myrepairapp.com/api/v2"
+    MYREPAIRAPP_LINK = MYREPAIRAPP_LINK
 
-    def __init__(self, token: str):
-        self.headers = {"X-Api-Key": token}
+    def __init__(self, token: str, transport: Transport = None, pool_size: int = 10, keep_alive: bool = True, rate_limiter: RateLimiter = None,
+                 cache: "ResponseCache" = None, mirror: "InventoryMirror" = None, verify: bool = False, instrumentation: Instrumentation = None,
+                 coalesce: bool = True, disk_cache: "DiskCache" = None, customers: customer.CustomerIdentityMap = None):
+        self.transport = transport or Transport(token, self.MYREPAIRAPP_LINK, pool_size=pool_size, keep_alive=keep_alive, rate_limiter=rate_limiter,
+                                                instrumentation=instrumentation)
+        self.headers = self.transport.headers
+        self.cache = cache
+        self.mirror = mirror
+        self.disk_cache = disk_cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.customers = customers if customers is not None else customer.for_token(token)
+        self.verified = False
+        if verify:
+            self.verify()
+
+    def verify(self) -> bool:
+        """
+        Checks the API key with a throwaway request. Raises `Forbidden` if it's wrong.
+
+        Optional: the constructor doesn't do this unless `verify=True`, and a bad key raises `Forbidden` on the first real call anyway.
+        Returns False if MyRepairApp couldn't be reached.
+        """
+        import requests
         try:
-            response = requests.get(self.MYREPAIRAPP_LINK+"/inventory", headers=self.headers)
-            match response.status_code:
-                case 401: raise exceptions.Forbidden
-                case 405: pass # expected. can't get the entire inventory. for some reason.
+            self.transport.request("GET", "/inventory")
+        except exceptions.MethodNotAllowed:
+            pass # expected. can't get the entire inventory. for some reason.
         except requests.exceptions.ConnectionError:
             log.exception("Failed to connect to MyRepairApp. Are you connected to the internet?")
+            return False
+        self.verified = True
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.transport.close()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.transport.rate_limiter
+
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self.transport.instrumentation
+
+    def _search(self, path: str, params: dict, parse, ids, lazy: bool = False, detach: bool = True):
+        cache_params = {**params, "lazy": True} if lazy else params # lazy and parsed results are cached apart
+        if self.cache is not None:
+            hit, result = _cache_lookup(self, path, cache_params)
+            if hit:
+                return _handed_out(result, detach)
+        fetch = lambda: _finish_search(self, path, cache_params, self._fetch_body(path, params), parse, ids, detach)
+        if self.single_flight is None:
+            return fetch()
+        return self.single_flight.do(SingleFlight.key(path, cache_params), fetch, lambda result: _handed_out(result, detach))
+
+    def _fetch_body(self, path: str, params: dict) -> bytes:
+        """
+        A search response body, from the disk cache if it has one (refetching stale ones in the background), otherwise
+        the API. The disk cache is only an optimisation, so if it can't be read or written the API answers instead.
+        """
+        if self.disk_cache is None:
+            return self.transport.fetch("GET", path, params=params)
+        body, fresh = self.disk_cache.lookup(path, params)
+        if body is not None:
+            if not fresh:
+                self.disk_cache.revalidate(path, params, lambda: self.transport.fetch("GET", path, params=params))
+            return body
+        body = self.transport.fetch("GET", path, params=params)
+        self.disk_cache.store(path, params, body)
+        return body
+
+    def update_item(self, data: generic.GenericItem, changed: dict):
+        # raise NotImplementedError("Function reserved for future API update, estimated mid-December 2025.")
+        path, changed = _patch_request(_update_type(data), data, changed)
+        response = self.transport.request("PATCH", path, data=changed)
+        _patched(self, data.item_id, changed, response)
+        return response
+
+    def _inventory_parser(self, query: str, lazy: bool):
+        """Picks what `inventory_search` turns a response into, storing it in the mirror (as raw dicts) if there is one."""
+        if self.mirror is None:
+            return (lambda body: _lazy_inventory_from_payload(codec.loads(body))) if lazy else codec.decode_inventory
+        def parse(body: bytes):
+            payload = codec.loads(body)
+            self.mirror.store_search(query, payload)
+            return _lazy_inventory_from_payload(payload) if lazy else _inventory_from_payload(payload)
+        return parse
+
+    def _from_mirror(self, query: str, lazy: bool):
+        """The mirror's answer to `query`, as models, or None if it doesn't have a fresh, complete one."""
+        local = self.mirror.lookup(query) if self.mirror is not None else None
+        if local is None:
+            return None
+        return _lazy_inventory_from_payload(local) if lazy else _inventory_from_payload(local)
+
+    def update_items(self, updates, concurrency: int = 8) -> list[bulk.UpdateResult]:
+        """
+        `update_item` for many items at once. `updates` is an iterable of `(item, changed)` pairs.
+
+        Pairs for the same item id are merged into one PATCH, and the PATCHes go out `concurrency` at a time.
+        With a mirror, fields in `changed` that already equal the mirror's copy of the item are left out, and an
+        item with nothing left isn't sent. The item you pass isn't diffed against, so editing it first is fine.
+        Returns one `UpdateResult` per item.
+        """
+        updater = bulk.BulkUpdater(self, concurrency)
+        for item, changed in updates:
+            updater.queue(item, changed)
+        return updater.flush()
+
+    def inventory_search(self, query: str, lazy: bool = False):
+        """
+        Searches the inventory. Returns a list of `InventoryItem`s.
+
+        With `lazy=True`, results are `LazyInventoryItem`s that only parse the fields you read. Much cheaper when you just want names or SKUs.
+        With a mirror, a query the API answered less than `mirror.max_age` seconds ago is answered from the mirror.
+        """
+        local = self._from_mirror(query, lazy)
+        if local is not None:
+            return local
+        return self._search("/inventory/search", {"query": query}, self._inventory_parser(query, lazy), _inventory_ids, lazy)
+
+    def ticket_search(self, query: str, closed_included: bool = False, lazy: bool = False):
+        """
+        Searches check-in tickets. Returns a list of `CheckInTicket`s.
+
+        With `lazy=True`, results are `LazyCheckInTicket`s that only parse the fields you read.
+        """
+        parse = _lazy_tickets_from_body if lazy else codec.decode_tickets
+        return self._search("/checkin-ticket", _ticket_params(query, closed_included), parse, _ticket_item_ids, lazy)
+
+    def ticket_search_raw(self, query: str, closed_included: bool = False) -> bytes:
+        """
+        `ticket_search`'s response body, unparsed, from the disk cache if there is one. For handing pages to
+        something that decodes them elsewhere, such as `reports.run_report`. Skips the response cache.
+        """
+        return self._fetch_body("/checkin-ticket", _ticket_params(query, closed_included))
+
+    def _parse_customers(self, body: bytes) -> list[customer.Customer]:
+        return self.customers.put_many(customer.customers_from_body(codec.loads(body)))
+
+    def customer_search(self, query: str) -> list[customer.Customer]:
+        """Searches customers. Returns a list of `Customer`s, the same objects `get_customer` hands out."""
+        # https://myrepairapp.com/api/v2/customer/search?query=<string>
+        return self._search("/customer/search", {"query": query}, self._parse_customers, _no_ids, detach=False)
+
+    def get_customer(self, customer_id: str, refresh: bool = False) -> customer.Customer:
+        """
+        One customer by id, such as a ticket's `customerID`. Answered from `customers` while it's fresh there, so
+        looking up the customer of every ticket costs one request per customer. `refresh=True` always asks the API.
+        """
+        if not refresh:
+            held = self.customers.get(customer_id)
+            if held is not None:
+                return held
+        path = _customer_path(customer_id)
+        fetch = lambda: self.customers.put(_customer_from_body(self.transport.fetch("GET", path)))
+        if self.single_flight is None:
+            return fetch()
+        return self.single_flight.do(SingleFlight.key(path), fetch)
+
+    def iter_tickets(self, query: str, closed_included: bool = False, lazy: bool = False, chunk_size: int = 65536):
+        """
+        `ticket_search`, one ticket at a time.
+
+        Tickets are parsed as their bytes arrive, so the first one is ready before the response finishes and memory
+        stays flat however many there are. Handy with `closed_included=True`. Bypasses the cache.
+        """
+        parse = _ticket_parser(lazy)
+        stream = JSONArrayStream("tickets")
+        for chunk in self.transport.iter_bytes("GET", "/checkin-ticket", params=_ticket_params(query, closed_included), chunk_size=chunk_size):
+            for ticket in stream.feed(chunk):
+                yield parse(ticket)
+        stream.close()
+
+    def inventory_search_many(self, queries, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """
+        Runs `inventory_search` for every query, `concurrency` at a time, over the shared session and rate limiter.
+
+        Returns one `BatchResult` per query, in input order, or in the order they finish if `ordered` is False.
+        A query that fails carries its exception in `error` instead of failing the batch. Keep `pool_size` at or
+        above `concurrency`, or the extra threads will queue for a connection.
+        """
+        return batch.run_threaded(self.inventory_search, queries, concurrency, ordered)
+
+    def ticket_search_many(self, queries, closed_included: bool = False, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """`inventory_search_many` for `ticket_search`."""
+        return batch.run_threaded(lambda query: self.ticket_search(query, closed_included), queries, concurrency, ordered)
+
+class AsyncMyRepairApp:
+    """
+    Native asyncio MyRepairApp client.
+
+    Every call runs on the transport's pooled, keep-alive aiohttp session, so many lookups can be in flight
+    on one loop at once. `limit_per_host` caps how many connections that takes. Close it with `await client.close()`
+    or use it as an `async with` block. `cache=`, `mirror=` and `disk_cache=` work the same as on `MyRepairApp`, and the two can share them.
+    Identical searches in flight at once on different tasks are coalesced too, unless `coalesce=False`. `customers` works as on `MyRepairApp`.
+    """
 
-    async def __get(self, link: str, params: dict = None):
+    MYREPAIRAPP_LINK = MYREPAIRAPP_LINK
+
+    def __init__(self, token: str, transport: Transport = None, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                 rate_limiter: RateLimiter = None, cache: "ResponseCache" = None, mirror: "InventoryMirror" = None, instrumentation: Instrumentation = None,
+                 coalesce: bool = True, disk_cache: "DiskCache" = None, customers: customer.CustomerIdentityMap = None):
+        self.transport = transport or Transport(token, self.MYREPAIRAPP_LINK, limit=limit, limit_per_host=limit_per_host, keepalive_timeout=keepalive_timeout,
+                                                rate_limiter=rate_limiter, instrumentation=instrumentation)
+        self.headers = self.transport.headers
+        self.cache = cache
+        self.mirror = mirror
+        self.disk_cache = disk_cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.customers = customers if customers is not None else customer.for_token(token)
+        self.verified = False
+
+    async def verify(self) -> bool:
+        """See `MyRepairApp.verify`. There's no `verify=` here, since a constructor can't await."""
+        import aiohttp
         try:
-            while True:
-                response = requests.get(link, headers=self.headers, params=params)
-                match response.status_code:
-                    case 401: raise exceptions.Forbidden()
-                    case 405: raise exceptions.MethodNotAllowed()
-                    case 429:
-                        random_delay = random.uniform(10, 60)
-                        log.warn(f"Too many requests. Trying again in {round(random_delay, 2)}s.")
-                        await asyncio.sleep(random_delay)
-                    case 500: raise exceptions.InternalServerError(response.reason)
-                    case 200: break
-        except requests.exceptions.ConnectionError:
+            await self.transport.request_async("GET", "/inventory")
+        except exceptions.MethodNotAllowed:
+            pass
+        except aiohttp.ClientConnectionError:
             log.exception("Failed to connect to MyRepairApp. Are you connected to the internet?")
+            return False
+        self.verified = True
+        return True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.transport.aclose()
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.transport.rate_limiter
+
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self.transport.instrumentation
+
+    async def _search(self, path: str, params: dict, parse, ids, lazy: bool = False, detach: bool = True):
+        cache_params = {**params, "lazy": True} if lazy else params
+        if self.cache is not None:
+            hit, result = _cache_lookup(self, path, cache_params)
+            if hit:
+                return _handed_out(result, detach)
+
+        async def fetch():
+            return _finish_search(self, path, cache_params, await self._fetch_body(path, params), parse, ids, detach)
+        if self.single_flight is None:
+            return await fetch()
+        return await self.single_flight.do_async(SingleFlight.key(path, cache_params), fetch, lambda result: _handed_out(result, detach))
+
+    async def _fetch_body(self, path: str, params: dict) -> bytes:
+        """
+        See `MyRepairApp._fetch_body`. SQLite calls run on a worker thread, so a busy database doesn't stall the loop,
+        and stale entries are refetched in a task on it.
+        """
+        if self.disk_cache is None:
+            return await self.transport.fetch_async("GET", path, params=params)
+        body, fresh = await self.disk_cache.lookup_async(path, params)
+        if body is not None:
+            if not fresh:
+                self.disk_cache.revalidate_async(path, params, lambda: self.transport.fetch_async("GET", path, params=params))
+            return body
+        body = await self.transport.fetch_async("GET", path, params=params)
+        await self.disk_cache.store_async(path, params, body)
+        return body
+
+    async def update_item(self, data: generic.GenericItem, changed: dict):
+        path, changed = _patch_request(_update_type(data), data, changed)
+        response = await self.transport.request_async("PATCH", path, data=changed)
+        _patched(self, data.item_id, changed, response)
         return response
-    
-    async def __patch(self, update_type: UpdateType, data: generic.GenericItem, changed: dict):
-        _patch_data = None
-        match update_type:
-            case UpdateType.INVENTORY:
-                assert type(data) is inventory_item.InventoryItem
-                _patch_data = data.export()
-                non_matching_keys = [key for key in changed.keys() if key not in _patch_data.keys()]
-                for key in non_matching_keys:
-                    del changed[key]
-                print(changed)
-                print(_patch_data)
-                link = self.MYREPAIRAPP_LINK+f"/inventory/{_patch_data['id']}"
+
+    _inventory_parser = MyRepairApp._inventory_parser
+    _from_mirror = MyRepairApp._from_mirror
+
+    async def update_items(self, updates, concurrency: int = 8) -> list[bulk.UpdateResult]:
+        """See `MyRepairApp.update_items`."""
+        updater = bulk.BulkUpdater(self, concurrency)
+        for item, changed in updates:
+            updater.queue(item, changed)
+        return await updater.flush_async()
+
+    async def inventory_search(self, query: str, lazy: bool = False):
+        """See `MyRepairApp.inventory_search`."""
+        local = self._from_mirror(query, lazy)
+        if local is not None:
+            return local
+        return await self._search("/inventory/search", {"query": query}, self._inventory_parser(query, lazy), _inventory_ids, lazy)
+
+    async def ticket_search(self, query: str, closed_included: bool = False, lazy: bool = False):
+        """See `MyRepairApp.ticket_search`."""
+        parse = _lazy_tickets_from_body if lazy else codec.decode_tickets
+        return await self._search("/checkin-ticket", _ticket_params(query, closed_included), parse, _ticket_item_ids, lazy)
+
+    async def ticket_search_raw(self, query: str, closed_included: bool = False) -> bytes:
+        """See `MyRepairApp.ticket_search_raw`."""
+        return await self._fetch_body("/checkin-ticket", _ticket_params(query, closed_included))
+
+    _parse_customers = MyRepairApp._parse_customers
+
+    async def customer_search(self, query: str) -> list[customer.Customer]:
+        """See `MyRepairApp.customer_search`."""
+        return await self._search("/customer/search", {"query": query}, self._parse_customers, _no_ids, detach=False)
+
+    async def get_customer(self, customer_id: str, refresh: bool = False) -> customer.Customer:
+        """See `MyRepairApp.get_customer`."""
+        if not refresh:
+            held = self.customers.get(customer_id)
+            if held is not None:
+                return held
+        path = _customer_path(customer_id)
+
+        async def fetch():
+            return self.customers.put(_customer_from_body(await self.transport.fetch_async("GET", path)))
+        if self.single_flight is None:
+            return await fetch()
+        return await self.single_flight.do_async(SingleFlight.key(path), fetch)
+
+    async def iter_tickets(self, query: str, closed_included: bool = False, lazy: bool = False, chunk_size: int = 65536):
+        """See `MyRepairApp.iter_tickets`. Use it with `async for`."""
+        parse = _ticket_parser(lazy)
+        stream = JSONArrayStream("tickets")
+        async for chunk in self.transport.aiter_bytes("GET", "/checkin-ticket", params=_ticket_params(query, closed_included), chunk_size=chunk_size):
+            for ticket in stream.feed(chunk):
+                yield parse(ticket)
+        stream.close()
+
+    async def inventory_search_many(self, queries, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """
+        Runs `inventory_search` for every query, `concurrency` at a time, over the shared connection pool and rate limiter.
+
+        Returns one `BatchResult` per query, in input order, or in the order they finish if `ordered` is False.
+        A query that fails carries its exception in `error` instead of failing the batch.
+        """
+        return await batch.run_async(self.inventory_search, queries, concurrency, ordered)
+
+    async def ticket_search_many(self, queries, closed_included: bool = False, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """`inventory_search_many` for `ticket_search`."""
+        return await batch.run_async(lambda query: self.ticket_search(query, closed_included), queries, concurrency, ordered)
+
+class SharedMyRepairApp:
+    """
+    A blocking MyRepairApp client made to be shared by every thread in a process, such as web server workers.
+
+    It runs an `AsyncMyRepairApp` on one background event loop thread (see `background.LoopThread`). Each call
+    from any thread is handed to that loop and blocks until it's answered, so all threads multiplex over one
+    keep-alive aiohttp pool (`limit_per_host` connections) and one rate limiter, and no thread ever starts
+    or nests an event loop of its own. Concurrency guarantees:
+
+    - Every public method may be called from any number of threads at once. Identical searches in flight together
+      share one request, across threads (see `SingleFlight`).
+    - The cache, mirror, rate limiter and instrumentation are only touched under their own locks or on the loop thread.
+    - Results are fresh lists per call, with their own copies of items and tickets. Only `Customer`s are shared with
+      other callers (through `customers`), so treat those as read-only.
+    - `timeout` bounds how long a caller waits. The request itself carries on for anyone else waiting on it.
+    - Don't call it from code already running on its loop thread (like a hook). That raises instead of deadlocking.
+
+    `close()` (or leaving a `with` block) closes the pool and stops the thread. Needs aiohttp (`pip install myrepairapp[async]`).
+    """
+
+    def __init__(self, token: str, transport: Transport = None, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                 rate_limiter: RateLimiter = None, cache: "ResponseCache" = None, mirror: "InventoryMirror" = None, instrumentation: Instrumentation = None,
+                 coalesce: bool = True, disk_cache: "DiskCache" = None, timeout: float = None, customers: customer.CustomerIdentityMap = None):
+        from .background import LoopThread
+        self.client = AsyncMyRepairApp(token, transport, limit, limit_per_host, keepalive_timeout, rate_limiter, cache, mirror, instrumentation, coalesce,
+                                       disk_cache, customers)
+        self.transport = self.client.transport
+        self.timeout = timeout
+        self.loop_thread = LoopThread()
+
+    def _run(self, coro):
+        return self.loop_thread.run(coro, self.timeout)
+
+    def verify(self) -> bool:
+        """See `MyRepairApp.verify`."""
+        return self._run(self.client.verify())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.loop_thread.running:
+            self._run(self.client.close())
+            self.loop_thread.stop()
+
+    @property
+    def cache(self) -> "ResponseCache | None":
+        return self.client.cache
+
+    @property
+    def mirror(self) -> "InventoryMirror | None":
+        return self.client.mirror
+
+    @property
+    def disk_cache(self) -> "DiskCache | None":
+        return self.client.disk_cache
+
+    @property
+    def single_flight(self) -> SingleFlight | None:
+        return self.client.single_flight
+
+    @property
+    def customers(self) -> customer.CustomerIdentityMap:
+        return self.client.customers
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        return self.transport.rate_limiter
+
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        return self.transport.instrumentation
+
+    def update_item(self, data: generic.GenericItem, changed: dict):
+        return self._run(self.client.update_item(data, changed))
+
+    def update_items(self, updates, concurrency: int = 8) -> list[bulk.UpdateResult]:
+        """See `MyRepairApp.update_items`."""
+        return self._run(self.client.update_items(updates, concurrency))
+
+    def inventory_search(self, query: str, lazy: bool = False):
+        """See `MyRepairApp.inventory_search`."""
+        return self._run(self.client.inventory_search(query, lazy))
+
+    def ticket_search(self, query: str, closed_included: bool = False, lazy: bool = False):
+        """See `MyRepairApp.ticket_search`."""
+        return self._run(self.client.ticket_search(query, closed_included, lazy))
+
+    def ticket_search_raw(self, query: str, closed_included: bool = False) -> bytes:
+        """See `MyRepairApp.ticket_search_raw`."""
+        return self._run(self.client.ticket_search_raw(query, closed_included))
+
+    def customer_search(self, query: str) -> list[customer.Customer]:
+        """See `MyRepairApp.customer_search`."""
+        return self._run(self.client.customer_search(query))
+
+    def get_customer(self, customer_id: str, refresh: bool = False) -> customer.Customer:
+        """See `MyRepairApp.get_customer`. Fresh customers come straight from `customers`, without a trip to the loop thread."""
+        if not refresh:
+            held = self.customers.get(customer_id)
+            if held is not None:
+                return held
+        return self._run(self.client.get_customer(customer_id, True)) # just missed, no need to look again
+
+    def iter_tickets(self, query: str, closed_included: bool = False, lazy: bool = False, chunk_size: int = 65536):
+        """See `MyRepairApp.iter_tickets`. Each ticket is pulled off the loop thread as it's asked for."""
+        tickets = self.client.iter_tickets(query, closed_included, lazy, chunk_size)
         try:
             while True:
-                response = requests.patch(link, headers=self.headers, data=changed)
-                match response.status_code:
-                    case 400: raise exceptions.BadRequest(response.json())
-                    case 401: raise exceptions.Forbidden()
-                    case 405: raise exceptions.MethodNotAllowed()
-                    case 429:
-                        random_delay = random.uniform(10, 60)
-                        log.warn(f"Too many requests. Trying again in {round(random_delay, 2)}s.")
-                        await asyncio.sleep(random_delay)
-                    case 500: raise exceptions.InternalServerError()
-                    case 200: break
-        except requests.exceptions.ConnectionError:
-            log.exception("Failed to connect to MyRepairApp. Are you connected to the internet?")
-        return response.json()
-    
-    
-    def update_item(self, data: generic.GenericItem, changed: dict):
-        # raise NotImplementedError("Function reserved for future API update, estimated mid-December 2025.")
-        # get the type of the item
-        update_type = None
-        match data.ITEM_TYPE:
-            case "inventory": update_type = UpdateType.INVENTORY
-            case "checkin ticket": raise NotImplementedError("Complicated function that goes beyond our limits currently. WIP.")
-        response = asyncio.run(self.__patch(update_type, data, changed))
-        return response
+                try:
+                    yield self._run(_await(anext(tickets)))
+                except StopAsyncIteration:
+                    return
+        finally:
+            if self.loop_thread.running:
+                self._run(_await(tickets.aclose()))
+
+    def inventory_search_many(self, queries, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """See `MyRepairApp.inventory_search_many`. The queries run as tasks on the loop thread, not as extra threads."""
+        return self._run(self.client.inventory_search_many(queries, concurrency, ordered))
 
-    def inventory_search(self, query: str):
-        link = self.MYREPAIRAPP_LINK+"/inventory/search"
-        response = asyncio.run(self.__get(link, params={"query": query}))
-        item = [inventory_item.item_from_json(elem) for elem in response.json()]
-        return item
-    
-    def ticket_search(self, query: str, closed_included: bool = False):
-        link = self.MYREPAIRAPP_LINK+"/checkin-ticket"
-        # https://myrepairapp.com/api/v2/checkin-ticket?query=<string>&closed=<boolean>
-        query_link = f"{link}?query={query}&closed={str(closed_included)}"
-        response = asyncio.run(self.__get(query_link))
-        return [checkin_ticket.ticket_from_json(ticket) for ticket in response.json()["tickets"]]
\ No newline at end of file
+    def ticket_search_many(self, queries, closed_included: bool = False, concurrency: int = 8, ordered: bool = True) -> list[batch.BatchResult]:
+        """See `MyRepairApp.ticket_search_many`."""
+        return self._run(self.client.ticket_search_many(queries, closed_included, concurrency, ordered))
@@ -0,0 +1,54 @@
+import asyncio, threading
+from concurrent.futures import Future
+from typing import Any, Coroutine
+
+
+class LoopThread:
+    """
+    An asyncio event loop running forever on its own daemon thread.
+
+    Any thread can hand it a coroutine with `submit()` (returns a `concurrent.futures.Future`) or `run()` (blocks
+    for the result). Everything submitted shares the one loop, and whatever sessions live on it.
+    """
+
+    def __init__(self, name: str = "myrepairapp-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        self.loop.run_forever()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self.loop.is_closed()
+
+    def in_loop(self) -> bool:
+        """True if called from the loop's own thread, where blocking on it would deadlock."""
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> Future:
+        if not self.running:
+            coro.close()
+            raise RuntimeError("This LoopThread has been stopped.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: float = None) -> Any:
+        """Runs `coro` on the loop and blocks until it's done. Raises whatever it raised."""
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError("Can't block on the loop thread from inside it. Await the coroutine instead.")
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = None):
+        """Stops the loop and waits for the thread. Anything still pending is dropped."""
+        if not self.running:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if not self.in_loop():
+            self._thread.join(timeout)
+            self.loop.close()
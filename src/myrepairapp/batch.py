@@ -0,0 +1,48 @@
+from typing import Any, Awaitable, Callable, Iterable
+
+
+class BatchResult:
+    """The outcome of one query in a batch. `result` is set if it worked, `error` holds the exception if it didn't."""
+
+    def __init__(self, query: Any, result: Any = None, error: Exception = None):
+        self.query = query; self.result = result; self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.query!r}, {'ok' if self.ok else repr(self.error)})"
+
+
+def run_threaded(search: Callable[[Any], Any], queries: Iterable, concurrency: int, ordered: bool) -> list[BatchResult]:
+    """Runs `search` over `queries` on up to `concurrency` threads. A failed query is reported, not raised."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def one(query):
+        try:
+            return BatchResult(query, search(query))
+        except Exception as error:
+            return BatchResult(query, error=error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(one, query) for query in queries]
+        return [future.result() for future in (futures if ordered else as_completed(futures))]
+
+
+async def run_async(search: Callable[[Any], Awaitable], queries: Iterable, concurrency: int, ordered: bool) -> list[BatchResult]:
+    """`run_threaded` for coroutines. At most `concurrency` searches are awaited at once."""
+    import asyncio # deferred, see the note in api.py
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            try:
+                return BatchResult(query, await search(query))
+            except Exception as error:
+                return BatchResult(query, error=error)
+
+    tasks = [asyncio.ensure_future(one(query)) for query in queries]
+    if ordered:
+        return list(await asyncio.gather(*tasks))
+    return [await task for task in asyncio.as_completed(tasks)]
@@ -0,0 +1,110 @@
+import threading
+from typing import Iterable
+
+from . import batch
+from .inventory_item import InventoryItem, wire_name, wire_value
+
+
+class UpdateResult(batch.BatchResult):
+    """The outcome of one item's PATCH. `sent` is the body that went out, empty if nothing had really changed."""
+
+    def __init__(self, item_id: str, sent: dict, result=None, error: Exception = None):
+        super().__init__(item_id, result, error)
+        self.sent = sent
+
+    @property
+    def item_id(self) -> str:
+        return self.query
+
+    @property
+    def skipped(self) -> bool:
+        return not self.sent and self.ok
+
+
+class BulkUpdater:
+    """
+    Write-behind queue for inventory updates.
+
+    `queue()` doesn't send anything. Changes to the same item id are merged until `flush()` (or `flush_async()`
+    for an `AsyncMyRepairApp`), which sends one PATCH per item, `concurrency` at a time, through the client's
+    rate limiter. Items that were `track()`ed first are diffed against what was last seen, so only fields that
+    really changed are sent, and an item with no real changes isn't sent at all. Untracked items are diffed
+    against the client's `InventoryMirror` copy, if it has one, which holds what the API last sent (and what was
+    PATCHed since), never the caller's edits. Otherwise untracked items send every queued field. After a
+    successful PATCH, the sent values become the new last-seen state.
+
+        updater = BulkUpdater(mrp)
+        updater.track(items)
+        for item in items:
+            updater.queue(item, {"in_stock": item.in_stock + delivered[item.sku]})
+        results = updater.flush()
+    """
+
+    def __init__(self, client, concurrency: int = 8):
+        self.client = client
+        self.concurrency = concurrency
+        self._known: dict[str, dict] = {} # item id -> last seen wire values
+        self._pending: dict[str, tuple[InventoryItem, dict]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def track(self, items: Iterable[InventoryItem]):
+        """Remembers the current state of `items` to diff later changes against."""
+        with self._lock:
+            for item in items:
+                self._known[item.item_id] = item.export()
+
+    def queue(self, item: InventoryItem, changed: dict):
+        """Adds `changed` (attribute or wire names) to `item`'s pending PATCH, overriding earlier values for the same fields."""
+        with self._lock:
+            _, pending = self._pending.get(item.item_id, (item, {}))
+            for key, value in changed.items():
+                wire = wire_name(key)
+                if wire is not None:
+                    pending[wire] = wire_value(value)
+            self._pending[item.item_id] = (item, pending)
+
+    def _take(self) -> list[tuple[InventoryItem, dict]]:
+        """Empties the queue, diffing each item against its last known state."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            known = {item_id: self._known.get(item_id) for item_id in pending}
+        work = []
+        for item_id, (item, changed) in pending.items():
+            baseline = known[item_id] if known[item_id] is not None else self._mirrored(item_id)
+            if baseline is not None:
+                changed = {wire: value for wire, value in changed.items() if baseline.get(wire) != value}
+            work.append((item, changed))
+        return work
+
+    def _mirrored(self, item_id: str) -> dict | None:
+        # the mirror only ever holds what the API sent or accepted, so a caller editing their item can't fool the diff
+        mirror = getattr(self.client, "mirror", None)
+        held = mirror.get(item_id) if mirror is not None else None
+        return held.export() if held is not None else None
+
+    def _sent(self, item_id: str, sent: dict):
+        with self._lock:
+            if item_id in self._known:
+                self._known[item_id].update(sent)
+
+    def _result(self, item: InventoryItem, changed: dict, outcome: batch.BatchResult) -> UpdateResult:
+        if outcome.ok:
+            self._sent(item.item_id, changed)
+        return UpdateResult(item.item_id, changed, outcome.result, outcome.error)
+
+    def flush(self) -> list[UpdateResult]:
+        """Sends everything queued through a `MyRepairApp`. Returns one `UpdateResult` per item, in queue order."""
+        work = self._take()
+        to_send = [(item, changed) for item, changed in work if changed]
+        outcomes = iter(batch.run_threaded(lambda pair: self.client.update_item(*pair), to_send, self.concurrency, True))
+        return [self._result(item, changed, next(outcomes)) if changed else UpdateResult(item.item_id, {}) for item, changed in work]
+
+    async def flush_async(self) -> list[UpdateResult]:
+        """`flush` for an `AsyncMyRepairApp`."""
+        work = self._take()
+        to_send = [(item, changed) for item, changed in work if changed]
+        outcomes = iter(await batch.run_async(lambda pair: self.client.update_item(*pair), to_send, self.concurrency, True))
+        return [self._result(item, changed, next(outcomes)) if changed else UpdateResult(item.item_id, {}) for item, changed in work]
@@ -0,0 +1,118 @@
+import threading, time
+from collections import OrderedDict
+from typing import Any, Iterable
+
+
+class CacheStats:
+    """Hit, miss and eviction counters for a `ResponseCache`."""
+
+    def __init__(self):
+        self.hits = 0; self.misses = 0; self.evictions = 0; self.expirations = 0; self.invalidations = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations,
+                "invalidations": self.invalidations, "hit_rate": self.hit_rate}
+
+    def __repr__(self):
+        return f"CacheStats({self.as_dict()})"
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "size", "ids")
+
+    def __init__(self, value, expires, size, ids):
+        self.value = value; self.expires = expires; self.size = size; self.ids = ids
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache for parsed search results.
+
+    Entries are keyed on endpoint and parameters. Each expires after the TTL set for its endpoint in `ttls`, or
+    `ttl` seconds otherwise. Once there are more than `max_entries` entries, or more than `max_bytes` of response
+    bodies, the least recently used ones are evicted. Each entry remembers the item ids it contains, so
+    `invalidate_id` can drop every result that mentions an item after it's been patched.
+
+    Values are held as they're given and handed back as they are, so they're shared between callers and shouldn't
+    be edited. The clients copy results on the way out.
+
+    Any object with the same `get`/`set`/`invalidate`/`invalidate_id` methods can be passed to a client as `cache=`.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = None, ttl: float = 30.0, ttls: dict[str, float] = None):
+        self.max_entries = max_entries; self.max_bytes = max_bytes
+        self.ttl = ttl; self.ttls = ttls or {}
+        self.stats = CacheStats()
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None) -> tuple:
+        return (endpoint, tuple(sorted((params or {}).items())))
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        """Total bytes of response bodies held."""
+        return self._bytes
+
+    def get(self, endpoint: str, params: dict = None) -> tuple[bool, Any]:
+        """Returns `(True, value)` on a hit, `(False, None)` on a miss."""
+        key = self.key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return False, None
+            if entry.expires <= time.monotonic():
+                self._drop(key)
+                self.stats.expirations += 1; self.stats.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return True, entry.value
+
+    def set(self, endpoint: str, params: dict, value: Any, size: int = 0, ids: Iterable = ()):
+        """Stores `value`. `size` is the response body's length in bytes, `ids` the item ids it contains."""
+        key = self.key(endpoint, params)
+        ttl = self.ttls.get(endpoint, self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, time.monotonic() + ttl, size, frozenset(ids))
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                self._drop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate(self, endpoint: str = None, params: dict = None):
+        """Drops one entry, every entry for `endpoint` if `params` is left out, or everything if both are."""
+        with self._lock:
+            if endpoint is None:
+                keys = list(self._entries)
+            elif params is None:
+                keys = [key for key in self._entries if key[0] == endpoint]
+            else:
+                keys = [key for key in [self.key(endpoint, params)] if key in self._entries]
+            for key in keys:
+                self._drop(key)
+            self.stats.invalidations += len(keys)
+
+    def invalidate_id(self, item_id: str):
+        """Drops every entry whose results contain `item_id`."""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if item_id in entry.ids]
+            for key in keys:
+                self._drop(key)
+            self.stats.invalidations += len(keys)
+
+    def _drop(self, key: tuple):
+        self._bytes -= self._entries.pop(key).size
@@ -0,0 +1,199 @@
+import logging, threading
+from typing import AsyncIterator, Callable
+
+from . import codec
+from .inventory_item import InventoryItem, item_from_json
+from .checkin_ticket import CheckInTicket, ticket_from_json
+
+log = logging.getLogger(__name__)
+
+ADDED = "added"
+CHANGED = "changed"
+CLOSED = "closed"
+
+
+class ChangeEvent:
+    """
+    One record that moved past the watermark.
+
+    `kind` is `ADDED`, `CHANGED` or `CLOSED`. `resource` is "tickets" or "inventory". `record` is the new
+    `CheckInTicket`/`InventoryItem` and `previous` the copy the store held before, None if it's new.
+    """
+
+    __slots__ = ("kind", "resource", "record", "previous")
+
+    def __init__(self, kind: str, resource: str, record, previous=None):
+        self.kind = kind; self.resource = resource; self.record = record; self.previous = previous
+
+    def __repr__(self):
+        return f"<ChangeEvent {self.kind} {self.resource} {self.record!r}>"
+
+
+class _Resource:
+    """What the feed keeps per resource: where to fetch it, how to read it, and the local copy."""
+
+    def __init__(self, name: str, path: str, params: dict, unwrap: Callable, parse: Callable, closed: Callable):
+        self.name = name; self.path = path; self.params = params
+        self.unwrap = unwrap; self.parse = parse; self.closed = closed
+        self.store: dict[str, object] = {}
+        self.watermark: str | None = None
+        self.at_watermark: set[str] = set() # ids already merged whose updatedAt is the watermark
+        self.undated: dict[str, int] = {} # id -> hash of the raw record, for records without an updatedAt
+
+
+def _ticket_closed(ticket: CheckInTicket) -> bool:
+    return bool(ticket.closedAt)
+
+def _item_closed(item: InventoryItem) -> bool:
+    return item.active is False
+
+
+class ChangeFeed:
+    """
+    Keeps a local copy of tickets (and optionally inventory) in sync by polling, and reports what changed.
+
+    Each resource has an `updatedAt` watermark. On every poll, records under it, and the ones at it that were
+    already merged, are skipped before they're parsed. Records without an `updatedAt` are compared by content
+    instead, and skipped if they're the same as last time. Only the rest are turned into models, merged into `tickets`/`inventory` and reported as
+    `ChangeEvent`s: `ADDED` for an id not seen before, `CLOSED` when a ticket gains a `closedAt` (or an item goes
+    inactive), `CHANGED` otherwise. The API has no "updated since" filter, so each poll still downloads the search
+    results. What's saved is the parsing, diffing and handling of everything that didn't change.
+
+    Get events from `poll()`/`poll_async()`, from callbacks added with `subscribe()` while `run()` loops, or with
+    `async for event in feed.events()` on an `AsyncMyRepairApp`. The wait between polls starts at `min_interval`,
+    is multiplied by `backoff` after every poll that finds nothing, up to `max_interval`, and drops back to
+    `min_interval` as soon as something changes.
+
+        feed = ChangeFeed(mrp, inventory_query="")
+        feed.subscribe(lambda event: print(event.kind, event.record))
+        feed.run()
+    """
+
+    def __init__(self, client, ticket_query: str | None = "", inventory_query: str | None = None, closed_included: bool = True,
+                 min_interval: float = 5.0, max_interval: float = 300.0, backoff: float = 2.0):
+        self.client = client
+        self.min_interval = min_interval; self.max_interval = max_interval; self.backoff = backoff
+        self.interval = min_interval
+        self.resources: list[_Resource] = []
+        if ticket_query is not None:
+            self.resources.append(_Resource("tickets", "/checkin-ticket", {"query": ticket_query, "closed": str(closed_included)},
+                                            lambda payload: payload["tickets"], ticket_from_json, _ticket_closed))
+        if inventory_query is not None:
+            self.resources.append(_Resource("inventory", "/inventory/search", {"query": inventory_query}, lambda payload: payload,
+                                            item_from_json, _item_closed))
+        self._subscribers: list[Callable[[ChangeEvent], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def tickets(self) -> dict[str, CheckInTicket]:
+        return self._resource("tickets").store
+
+    @property
+    def inventory(self) -> dict[str, InventoryItem]:
+        return self._resource("inventory").store
+
+    @property
+    def watermarks(self) -> dict[str, str | None]:
+        return {resource.name: resource.watermark for resource in self.resources}
+
+    def _resource(self, name: str) -> _Resource:
+        for resource in self.resources:
+            if resource.name == name:
+                return resource
+        raise KeyError(f"This feed doesn't follow {name}.")
+
+    def subscribe(self, callback: Callable[[ChangeEvent], None]) -> Callable[[ChangeEvent], None]:
+        """Calls `callback` with every event from now on. Returns it, so it can be passed to `unsubscribe` later."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Callable[[ChangeEvent], None]):
+        self._subscribers.remove(callback)
+
+    def _merge(self, resource: _Resource, body: bytes) -> list[ChangeEvent]:
+        """Folds one response into the store. Only records past the watermark, or undated ones that changed, are parsed."""
+        events = []
+        with self._lock:
+            watermark = resource.watermark
+            newest = watermark; at_newest = set(resource.at_watermark)
+            for raw in resource.unwrap(codec.loads(body)):
+                updated = raw.get("updatedAt"); record_id = raw.get("id")
+                if updated is None:
+                    # nothing to order it by, so it's new to us only if its content is
+                    fingerprint = hash(codec.dumps(raw))
+                    if resource.undated.get(record_id) == fingerprint:
+                        continue
+                    resource.undated[record_id] = fingerprint
+                elif watermark is not None and (updated < watermark or (updated == watermark and record_id in resource.at_watermark)):
+                    continue
+                else:
+                    resource.undated.pop(record_id, None)
+                    # several records can share a timestamp, so the ids at the newest one are kept to tell them apart
+                    if newest is None or updated > newest:
+                        newest = updated; at_newest = {record_id}
+                    elif updated == newest:
+                        at_newest.add(record_id)
+                record = resource.parse(raw)
+                previous = resource.store.get(record_id)
+                resource.store[record_id] = record
+                if previous is None:
+                    kind = ADDED
+                elif resource.closed(record) and not resource.closed(previous):
+                    kind = CLOSED
+                else:
+                    kind = CHANGED
+                events.append(ChangeEvent(kind, resource.name, record, previous))
+            resource.watermark = newest; resource.at_watermark = at_newest
+        return events
+
+    def _finish_poll(self, events: list[ChangeEvent]) -> list[ChangeEvent]:
+        self.interval = self.min_interval if events else min(self.max_interval, self.interval * self.backoff)
+        for event in events:
+            for callback in list(self._subscribers):
+                try:
+                    callback(event)
+                except Exception:
+                    log.exception(f"Change feed subscriber {callback!r} failed on {event!r}.")
+        return events
+
+    def poll(self) -> list[ChangeEvent]:
+        """Fetches every resource once through a `MyRepairApp`, merges what's new and returns (and publishes) the events."""
+        events = []
+        for resource in self.resources:
+            events += self._merge(resource, self.client.transport.fetch("GET", resource.path, params=resource.params))
+        return self._finish_poll(events)
+
+    async def poll_async(self) -> list[ChangeEvent]:
+        """`poll` for an `AsyncMyRepairApp`."""
+        events = []
+        for resource in self.resources:
+            events += self._merge(resource, await self.client.transport.fetch_async("GET", resource.path, params=resource.params))
+        return self._finish_poll(events)
+
+    def run(self, stop: threading.Event = None):
+        """Polls until `stop` is set, waiting `interval` in between. Events go to subscribers. A failed poll is logged and retried later."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                log.exception("Change feed poll failed.")
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            stop.wait(self.interval)
+
+    async def events(self) -> AsyncIterator[ChangeEvent]:
+        """Polls forever through an `AsyncMyRepairApp`, yielding each event (subscribers still get them too). Stop by breaking out."""
+        import asyncio # deferred, see the note in api.py
+        while True:
+            try:
+                events = await self.poll_async()
+            except Exception:
+                log.exception("Change feed poll failed.")
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+                events = []
+            for event in events:
+                yield event
+            await asyncio.sleep(self.interval)
+
+    def __aiter__(self) -> AsyncIterator[ChangeEvent]:
+        return self.events()
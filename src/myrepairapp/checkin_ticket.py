@@ -4,10 +4,11 @@ if __name__ == "checkin_ticket":
     pass
     # from inventory_item import InventoryItem, item_from_json
 else:
-    from .inventory_item import InventoryItem, item_from_json
+    from .inventory_item import InventoryItem, item_from_json, EnumDecoder, _enum_table
+    from .timestamps import ParsedTimestamp
     
 class CheckinTicketActivity:
-    jsonID = None; checkinTicketID = None; userID = None; activity_type = None; metadata = None; createdAt = None
+    __slots__ = ("jsonID", "checkinTicketID", "userID", "activity_type", "metadata", "createdAt", "_createdDatetime")
 
     class CheckinActivityType(enum.Enum):
 
@@ -27,14 +28,36 @@ class CheckinTicketActivity:
             except KeyError:
                 raise ValueError(f"{input_str} is not a valid category name!")
 
+    createdDatetime = ParsedTimestamp("createdAt")
+
     def __init__(self, jsonID: str, checkinTicketID: str, userID: str, activity_type: str, metadata: str, createdAt: str):
         self.jsonID = jsonID; self.checkinTicketID = checkinTicketID; self.userID = userID
-        self.activity_type = CheckinTicketActivity.CheckinActivityType.get_from_string(activity_type)
+        self.activity_type = decode_activity_type(activity_type)
         self.metadata = metadata; self.createdAt = createdAt
     
     def __repr__(self):
         return str(self.activity_type)
 
+decode_activity_type = EnumDecoder("activity type", _enum_table(CheckinTicketActivity.CheckinActivityType), CheckinTicketActivity.CheckinActivityType.get_from_string)
+
+
+class CheckinLine:
+    """
+    One `checkinItems` line of a hydrated ticket (see `hydrate.hydrate`).
+
+    `line_id`, `quantity` and `price` are the line's own, and `item` is the shared `InventoryItem` it's for, None
+    for lines without one, such as labor or custom lines. `raw` is the line as the API sent it, for anything else.
+    """
+
+    __slots__ = ("line_id", "quantity", "price", "item", "raw")
+
+    def __init__(self, raw: dict, item: InventoryItem | None):
+        self.line_id = raw.get("id"); self.quantity = raw.get("quantity"); self.price = raw.get("price")
+        self.item = item; self.raw = raw
+
+    def __repr__(self):
+        return f"{self.quantity} x {self.item if self.item is not None else self.raw.get('name', 'custom line')}"
+
 
 class CheckInTicket:
     """
@@ -43,11 +66,18 @@ class CheckInTicket:
     This handles organization. WIP.
     """
 
-    jsonID = None; orgID = None; ticketNumber = None; active = None; assigneeID = None; customerID = None; order = None; type = None; status = None
-    closedAt = None; warrantyPeriodEnd = None; isWarranty = None; isReturn = None; notToExceed = None; appointmentTime = None; customerPossession = None
-    storageBin = None; waitingForPart = None; shipper = None; trackingNumber = None; shipstationShipmentID = None; labelURL = None; claimRepairProvider = None
-    createdAt = None; updatedAt = None; assignee = None; customer = None; checkinItems = None; checkinDevices = None; checkinPayments = None; checkinNotes = None
-    checkinTicketActivities = None; myProtectionPlans = None
+    __slots__ = ("jsonID", "orgID", "ticketNumber", "active", "assigneeID", "customerID", "order", "type", "status", "closedAt", "warrantyPeriodEnd",
+                 "isWarranty", "isReturn", "notToExceed", "appointmentTime", "customerPossession", "storageBin", "waitingForPart", "shipper",
+                 "trackingNumber", "shipstationShipmentID", "labelURL", "claimRepairProvider", "createdAt", "updatedAt", "assignee", "customer",
+                 "checkinItems", "checkinDevices", "checkinPayments", "checkinNotes", "checkinTicketActivities", "myProtectionPlans",
+                 "_createdDatetime", "_updatedDatetime", "_closedDatetime", "_appointmentDatetime", "_warrantyPeriodEndDatetime")
+
+    # the timestamp fields stay the API's strings. these parse them on first read, once per object
+    createdDatetime = ParsedTimestamp("createdAt")
+    updatedDatetime = ParsedTimestamp("updatedAt")
+    closedDatetime = ParsedTimestamp("closedAt")
+    appointmentDatetime = ParsedTimestamp("appointmentTime")
+    warrantyPeriodEndDatetime = ParsedTimestamp("warrantyPeriodEnd")
 
     def __init__(self, jsonID: str, orgID: str, ticketNumber: int, active: bool, assigneeID: str, customerID: str, order: int, _type: dict, status: str, closedAt: str,\
                  warrantyPeriodEnd: str, isWarranty: bool, isReturn: bool, notToExceed: float, appointmentTime: str, customerPossession: bool, storageBin: str,       \
@@ -60,21 +90,36 @@ class CheckInTicket:
         self.isReturn = isReturn; self.notToExceed = notToExceed; self.appointmentTime = appointmentTime; self.customerPossession = customerPossession
         self.storageBin = storageBin; self.waitingForPart = waitingForPart; self.shipper = shipper; self.trackingNumber = trackingNumber
         self.shipstationShipmentID = shipstationShipmentID; self.labelURL = labelURL; self.claimRepairProvider = claimRepairProvider
-        # - todo: same as inventory_item.py:275 -
-        self.createdAt = createdAt
-        self.updatedAt = updatedAt
-        # ---------------------------------------
+        self.createdAt = createdAt; self.updatedAt = updatedAt
         self.assignee = assignee; self.customer = customer; self.checkinItems = checkinItems; self.checkinDevices = checkinDevices; self.checkinPayments = checkinPayments
         self.checkinNotes = checkinNotes; self.checkinTicketActivities = checkinTicketActivities; self.myProtectionPlans = myProtectionPlans
     
     def __repr__(self):
-        if len(self.checkinItems) > 0:
-            self.checkinItems = [item_from_json(item["inventoryItem"]) for item in self.checkinItems]
-        else: self.checkinItems = "NO ITEMS"
-        return str(self.__dict__)
+        # printing used to swap checkinItems for InventoryItems in place. hydrate.hydrate() does that on purpose now
+        shown = {name: getattr(self, name) for name in self.__slots__ if not name.startswith("_")}
+        if self.checkinItems:
+            shown["checkinItems"] = [item_from_json(line["inventoryItem"]) if isinstance(line, dict) and line.get("inventoryItem") else line
+                                     for line in self.checkinItems]
+        else: shown["checkinItems"] = "NO ITEMS"
+        return str(shown)
+
+# CheckInTicket attribute -> key in the API's JSON
+FIELD_WIRE_NAMES = {
+    "jsonID": "id", "orgID": "orgId", "ticketNumber": "ticketNumber", "active": "active", "assigneeID": "assigneeId", "customerID": "customerId",
+    "order": "order", "type": "type", "status": "status", "closedAt": "closedAt", "warrantyPeriodEnd": "warrantyPeriodEnd", "isWarranty": "isWarranty",
+    "isReturn": "isReturn", "notToExceed": "notToExceed", "appointmentTime": "appointmentTime", "customerPossession": "customerPossession",
+    "storageBin": "storageBin", "waitingForPart": "waitingForPart", "shipper": "shipper", "trackingNumber": "trackingNumber",
+    "shipstationShipmentID": "shipstationShipmentId", "labelURL": "labelURL", "claimRepairProvider": "claimRepairProvider", "createdAt": "createdAt",
+    "updatedAt": "updatedAt", "assignee": "assignee", "customer": "customer", "checkinItems": "checkinItems", "checkinDevices": "checkinDevices",
+    "checkinPayments": "checkinPayments", "checkinNotes": "checkinNotes", "checkinTicketActivities": "checkinTicketActivities",
+    "myProtectionPlans": "myProtectionPlans",
+}
+
+def activity_from_json(item: dict) -> CheckinTicketActivity:
+    return CheckinTicketActivity(item["id"], item["checkinTicketId"], item["userId"], item["type"], item["metadata"], item["createdAt"])
 
 def ticket_from_json(json: dict):
-    activities = [CheckinTicketActivity(item["id"], item["checkinTicketId"], item["userId"], item["type"], item["metadata"], item["createdAt"]) for item in json["checkinTicketActivities"]]
+    activities = [activity_from_json(item) for item in json["checkinTicketActivities"]]
     return CheckInTicket(json["id"], json["orgId"], json["ticketNumber"], json["active"], json["assigneeId"], json["customerId"], json["order"], json["type"], json["status"],
                   json["closedAt"], json["warrantyPeriodEnd"], json["isWarranty"], json["isReturn"], json["notToExceed"], json["appointmentTime"], json["customerPossession"],
                   json["storageBin"], json["waitingForPart"], json["shipper"], json["trackingNumber"], json["shipstationShipmentId"], json["labelURL"], json["claimRepairProvider"],
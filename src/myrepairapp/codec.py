@@ -0,0 +1,116 @@
+import json
+from functools import lru_cache
+
+from .inventory_item import InventoryItem, item_from_json, decode_condition, decode_category, decode_type, FIELD_WIRE_NAMES as ITEM_WIRE_NAMES
+from .checkin_ticket import CheckInTicket, CheckinTicketActivity, ticket_from_json, FIELD_WIRE_NAMES as TICKET_WIRE_NAMES
+
+# JSON backends, fastest first. the first one that imports is used, unless `use()` says otherwise.
+# nothing is imported until the first response needs decoding, so importing the package stays cheap
+BACKENDS = ("msgspec", "orjson", "json")
+
+
+class JSONBackend:
+    """A JSON implementation: `loads` takes bytes or str, `dumps` returns bytes. `typed` is True if it has schema decoding."""
+
+    def __init__(self, name: str, loads, dumps, typed: bool = False):
+        self.name = name; self.loads = loads; self.dumps = dumps; self.typed = typed
+
+    def __repr__(self):
+        return f"<JSONBackend {self.name}>"
+
+
+def _load_backend(name: str) -> JSONBackend:
+    match name:
+        case "msgspec":
+            import msgspec
+            decoder = msgspec.json.Decoder(); encoder = msgspec.json.Encoder()
+            return JSONBackend(name, decoder.decode, encoder.encode, typed=True)
+        case "orjson":
+            import orjson
+            return JSONBackend(name, orjson.loads, orjson.dumps)
+        case "json":
+            return JSONBackend(name, json.loads, lambda obj: json.dumps(obj, separators=(",", ":")).encode())
+    raise ValueError(f"{name} is not a JSON backend! Pick one of {', '.join(BACKENDS)}.")
+
+_backend: JSONBackend = None
+_typed = True
+
+def use(name: str = None, typed: bool = True) -> JSONBackend:
+    """
+    Picks the JSON backend every client decodes with: "msgspec", "orjson" or "json". Leave `name` out for the fastest one installed.
+
+    Naming one that isn't installed raises ImportError. `typed=False` turns off msgspec's schema decoding (see `decode_inventory`).
+    """
+    global _backend, _typed
+    if name is not None:
+        _backend = _load_backend(name)
+    else:
+        for candidate in BACKENDS:
+            try:
+                _backend = _load_backend(candidate)
+                break
+            except ImportError:
+                continue
+    _typed = typed
+    return _backend
+
+def backend() -> JSONBackend:
+    """The backend in use, picked on first call if `use()` hasn't been."""
+    return _backend or use()
+
+def loads(body: bytes | str):
+    return (_backend or use()).loads(body)
+
+def dumps(obj) -> bytes:
+    return (_backend or use()).dumps(obj)
+
+# typed schemas. with msgspec, response bytes decode straight into these structs in one pass (no dict per object),
+# and the models are built from their attributes. unknown keys are skipped. missing item keys come back as None, like
+# item_from_json's .get()s. ticket keys are required, since ticket_from_json raises KeyError without them
+
+@lru_cache(maxsize=None)
+def _schemas() -> tuple:
+    import msgspec
+    from typing import Any
+    Item = msgspec.defstruct("InventoryItemSchema", [(name, Any, None) for name in ITEM_WIRE_NAMES], rename=ITEM_WIRE_NAMES)
+    Activity = msgspec.defstruct("CheckinTicketActivitySchema", [("jsonID", Any), ("checkinTicketID", Any), ("userID", Any), ("type", Any), ("metadata", Any),
+                                                                ("createdAt", Any)],
+                                 rename={"jsonID": "id", "checkinTicketID": "checkinTicketId", "userID": "userId"})
+    Ticket = msgspec.defstruct("CheckInTicketSchema", [(name, list[Activity] if name == "checkinTicketActivities" else Any) for name in TICKET_WIRE_NAMES],
+                               rename=TICKET_WIRE_NAMES)
+    Tickets = msgspec.defstruct("TicketSearchSchema", [("tickets", list[Ticket])])
+    return msgspec.json.Decoder(list[Item]), msgspec.json.Decoder(Tickets)
+
+def _item_from_struct(s) -> InventoryItem:
+    return InventoryItem(s.item_id, s.store_id, s.sku, s.manufacturer, decode_type(s.type), s.name, s.in_stock, decode_condition(s.condition), s.bin,
+                         s.supplier_id, s.price, s.created_at, s.updated_at, s.note, s.inventoried, s.serialized, s.active, s.cost, decode_category(s.category),
+                         s.serial_num, s.carrier, s.color, s.storage, s.trade_in_condition, None, s.trade_in_status, s.additional_info, s.is_rebate, s.tax_free,
+                         s.grouping_id, s.repair_provider, s.is_motorola_sku, s.pulled, s.ordered, s.back_ordered, s.sku_pulled, s.sku_instock)
+
+def _ticket_from_struct(s) -> CheckInTicket:
+    activities = [CheckinTicketActivity(a.jsonID, a.checkinTicketID, a.userID, a.type, a.metadata, a.createdAt) for a in s.checkinTicketActivities]
+    return CheckInTicket(s.jsonID, s.orgID, s.ticketNumber, s.active, s.assigneeID, s.customerID, s.order, s.type, s.status, s.closedAt, s.warrantyPeriodEnd,
+                         s.isWarranty, s.isReturn, s.notToExceed, s.appointmentTime, s.customerPossession, s.storageBin, s.waitingForPart, s.shipper,
+                         s.trackingNumber, s.shipstationShipmentID, s.labelURL, s.claimRepairProvider, s.createdAt, s.updatedAt, s.assignee, s.customer,
+                         s.checkinItems, s.checkinDevices, s.checkinPayments, s.checkinNotes, activities, s.myProtectionPlans)
+
+def decode_inventory(body: bytes) -> list[InventoryItem]:
+    """An `/inventory/search` response body -> `InventoryItem`s. Uses the typed schema on msgspec, `item_from_json` on anything else."""
+    current = _backend or use()
+    if current.typed and _typed:
+        return [_item_from_struct(s) for s in _schemas()[0].decode(body)]
+    return [item_from_json(elem) for elem in current.loads(body)]
+
+def decode_tickets(body: bytes) -> list[CheckInTicket]:
+    """
+    A `/checkin-ticket` response body -> `CheckInTicket`s. See `decode_inventory`. A body the typed schema rejects,
+    such as one missing a key, goes through `ticket_from_json` instead, so it fails (or not) the same on every backend.
+    """
+    current = _backend or use()
+    if current.typed and _typed:
+        import msgspec
+        try:
+            return [_ticket_from_struct(s) for s in _schemas()[1].decode(body).tickets]
+        except msgspec.ValidationError:
+            pass
+    return [ticket_from_json(ticket) for ticket in current.loads(body)["tickets"]]
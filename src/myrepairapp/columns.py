@@ -0,0 +1,249 @@
+from array import array
+from typing import Iterable
+
+from .inventory_item import (InventoryItem, InventoryItemCategory, InventoryItemCondition, InventoryItemType, wire_value,
+                             decode_condition, decode_category, decode_type)
+
+# enum field -> every member, in code order. a code is an index into this; -1 means None
+ENUM_MEMBERS = {
+    "category": tuple(InventoryItemCategory),
+    "condition": tuple(InventoryItemCondition),
+    "type": tuple(member for enum_class in (InventoryItemType.RepairItem, InventoryItemType.PartItem, InventoryItemType.ServiceItem,
+                                            InventoryItemType.AccessoryItem, InventoryItemType.PrepaidItem, InventoryItemType.DeviceItem,
+                                            InventoryItemType.ToolItem) for member in enum_class),
+}
+_CODES = {field: {member: code for code, member in enumerate(members)} for field, members in ENUM_MEMBERS.items()}
+_ENUM_DECODERS = {"category": decode_category, "condition": decode_condition, "type": decode_type}
+
+# numeric field -> array typecode. missing prices and costs are NaN, a missing stock count is 0
+NUMERIC_FIELDS = {"price": "d", "cost": "d", "in_stock": "q"}
+TEXT_FIELDS = ("item_id", "sku", "name", "manufacturer", "bin")
+_WIRE = {"price": "price", "cost": "cost", "in_stock": "instock", "category": "category", "condition": "condition", "type": "type",
+         "item_id": "id", "sku": "sku", "name": "name", "manufacturer": "manufacturer", "bin": "bin"}
+_DTYPES = {"d": "float64", "q": "int64", "h": "int16"}
+_MISSING_CAST = {"d": (float("nan"), float), "q": (0, int)}
+
+_numpy = None
+
+def _np():
+    """numpy, if it's installed. Imported on first use."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+class InventoryColumns:
+    """
+    Inventory results stored by column instead of as objects, for totals over thousands of items.
+
+    `price`, `cost` and `in_stock` are typed `array.array`s, `category`, `condition` and `type` are int16 codes into
+    `ENUM_MEMBERS` (-1 for None), and `item_id`, `sku`, `name`, `manufacturer` and `bin` are plain lists. Build one
+    with `from_items()` (search results, lazy or not) or `from_records()` (raw JSON, such as `InventoryMirror.columns()`).
+
+    `sum()`, `group_sum()` and `stock_value()` add up whole columns in one pass, on NumPy when it's installed. `where()`
+    and `filter()` select rows. `to_numpy()` wraps the arrays without copying, and `to_pandas()`/`to_arrow()` turn
+    the enum codes into categoricals/dictionary arrays.
+
+        columns = InventoryColumns.from_items(mrp.inventory_search(""))
+        columns.stock_value(by="category", basis="cost")
+    """
+
+    def __init__(self, numeric: dict[str, array], codes: dict[str, array], text: dict[str, list]):
+        self.numeric = numeric; self.codes = codes; self.text = text
+
+    @classmethod
+    def _empty(cls) -> "InventoryColumns":
+        return cls({field: array(typecode) for field, typecode in NUMERIC_FIELDS.items()}, {field: array("h") for field in ENUM_MEMBERS},
+                   {field: [] for field in TEXT_FIELDS})
+
+    @classmethod
+    def from_items(cls, items: Iterable[InventoryItem]) -> "InventoryColumns":
+        """From `InventoryItem`s or `LazyInventoryItem`s. Lazy ones only decode the columns' fields."""
+        columns = cls._empty()
+        numeric = [(columns.numeric[field].append, field, *_MISSING_CAST[typecode]) for field, typecode in NUMERIC_FIELDS.items()]
+        codes = [(columns.codes[field].append, field, _CODES[field]) for field in ENUM_MEMBERS]
+        text = [(columns.text[field].append, field) for field in TEXT_FIELDS]
+        for item in items:
+            for append, field, missing, cast in numeric:
+                value = getattr(item, field)
+                append(missing if value is None else cast(value))
+            for append, field, table in codes:
+                append(table.get(getattr(item, field), -1))
+            for append, field in text:
+                append(getattr(item, field))
+        return columns
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "InventoryColumns":
+        """From raw `/inventory/search` JSON records, without building an `InventoryItem` for each."""
+        columns = cls._empty()
+        numeric = [(columns.numeric[field].append, _WIRE[field], *_MISSING_CAST[typecode]) for field, typecode in NUMERIC_FIELDS.items()]
+        codes = [(columns.codes[field].append, _WIRE[field], _CODES[field], _ENUM_DECODERS[field]) for field in ENUM_MEMBERS]
+        text = [(columns.text[field].append, _WIRE[field]) for field in TEXT_FIELDS]
+        for record in records:
+            for append, key, missing, cast in numeric:
+                value = record.get(key)
+                append(missing if value is None else cast(value))
+            for append, key, table, decode in codes:
+                append(table.get(decode(record.get(key)), -1))
+            for append, key in text:
+                append(record.get(key))
+        return columns
+
+    def __len__(self):
+        return len(self.codes["category"])
+
+    def __getitem__(self, field: str):
+        """The raw column: an `array.array` for numeric and enum fields (codes), a list for text."""
+        for columns in (self.numeric, self.codes, self.text):
+            if field in columns:
+                return columns[field]
+        raise KeyError(f"{field} isn't a column! Pick one of {', '.join([*NUMERIC_FIELDS, *ENUM_MEMBERS, *TEXT_FIELDS])}.")
+
+    def labels(self, field: str) -> list:
+        """An enum column as members (None where missing)."""
+        members = ENUM_MEMBERS[field]
+        return [members[code] if code >= 0 else None for code in self.codes[field]]
+
+    # selecting rows
+
+    def filter(self, mask) -> "InventoryColumns":
+        """The rows where `mask` (a sequence of bools, or a NumPy bool array) is true, as a new `InventoryColumns`."""
+        np = _np()
+        if np is not None:
+            mask = np.asarray(mask, dtype=bool)
+            arrays = self._arrays()
+            return InventoryColumns({field: array(typecode, arrays[field][mask].tobytes()) for field, typecode in NUMERIC_FIELDS.items()},
+                                    {field: array("h", arrays[field][mask].tobytes()) for field in ENUM_MEMBERS},
+                                    {field: [value for value, keep in zip(self.text[field], mask) if keep] for field in TEXT_FIELDS})
+        keep = [index for index, flag in enumerate(mask) if flag]
+        return InventoryColumns({field: array(typecode, [self.numeric[field][index] for index in keep]) for field, typecode in NUMERIC_FIELDS.items()},
+                                {field: array("h", [self.codes[field][index] for index in keep]) for field in ENUM_MEMBERS},
+                                {field: [self.text[field][index] for index in keep] for field in TEXT_FIELDS})
+
+    def mask(self, **equals) -> list[bool]:
+        """
+        A row mask for `filter()`: each keyword is an enum or text field, matched against one value or a collection of them.
+
+        Enum fields take members, such as `category=InventoryItemCategory.PART`.
+        """
+        mask = [True] * len(self)
+        for field, wanted in equals.items():
+            wanted = set(wanted) if isinstance(wanted, (set, frozenset, list, tuple)) else {wanted}
+            if field in self.codes:
+                codes = {_CODES[field][member] for member in wanted if member in _CODES[field]}
+                column = self.codes[field]
+            else:
+                codes = wanted
+                column = self[field]
+            mask = [keep and value in codes for keep, value in zip(mask, column)]
+        return mask
+
+    def where(self, **equals) -> "InventoryColumns":
+        """`filter(mask(**equals))`."""
+        return self.filter(self.mask(**equals))
+
+    # adding up
+
+    def sum(self, field: str, by: str = None) -> float | dict:
+        """Total of a numeric column, skipping NaNs. With `by` (an enum field), a dict of member -> total instead."""
+        if by is None:
+            np = _np()
+            if np is not None:
+                return float(np.nansum(self._arrays()[field]))
+            return float(sum(value for value in self.numeric[field] if value == value))
+        return {member: totals[field] for member, totals in self.group_sum(by, (field,)).items()}
+
+    def group_sum(self, by: str, fields: Iterable[str] = tuple(NUMERIC_FIELDS)) -> dict:
+        """`{member: {field: total}}` for every member of enum field `by` that occurs. Rows where `by` is None are left out."""
+        members = ENUM_MEMBERS[by]
+        np = _np()
+        if np is not None:
+            arrays = self._arrays()
+            codes = arrays[by]; present = codes >= 0
+            counts = np.bincount(codes[present], minlength=len(members))
+            totals = {field: np.bincount(codes[present], weights=np.nan_to_num(arrays[field][present].astype("float64")), minlength=len(members))
+                      for field in fields}
+            return {members[code]: {field: float(totals[field][code]) for field in fields} for code in np.flatnonzero(counts)}
+        grouped = {}
+        columns = [(field, self.numeric[field]) for field in fields]
+        for row, code in enumerate(self.codes[by]):
+            if code < 0:
+                continue
+            totals = grouped.get(code)
+            if totals is None:
+                totals = grouped[code] = dict.fromkeys(fields, 0.0)
+            for field, column in columns:
+                value = column[row]
+                if value == value:
+                    totals[field] += value
+        return {members[code]: totals for code, totals in sorted(grouped.items())}
+
+    def stock_value(self, by: str = None, basis: str = "price") -> float | dict:
+        """`sum(basis * in_stock)`: what the stock is worth at `price` (or `cost`). Per member of `by` if given."""
+        np = _np()
+        if np is not None:
+            arrays = self._arrays()
+            values = np.nan_to_num(arrays[basis]) * arrays["in_stock"]
+            if by is None:
+                return float(values.sum())
+            codes = arrays[by]; present = codes >= 0
+            totals = np.bincount(codes[present], weights=values[present], minlength=len(ENUM_MEMBERS[by]))
+            counts = np.bincount(codes[present], minlength=len(ENUM_MEMBERS[by]))
+            return {ENUM_MEMBERS[by][code]: float(totals[code]) for code in np.flatnonzero(counts)}
+        values = [price * stock if price == price else 0.0 for price, stock in zip(self.numeric[basis], self.numeric["in_stock"])]
+        if by is None:
+            return float(sum(values))
+        grouped = {}
+        for code, value in zip(self.codes[by], values):
+            if code >= 0:
+                grouped[code] = grouped.get(code, 0.0) + value
+        return {ENUM_MEMBERS[by][code]: total for code, total in sorted(grouped.items())}
+
+    # converting
+
+    def to_numpy(self) -> dict:
+        """Every column as a NumPy array. Numeric and enum code columns share memory with this object. Text columns are object arrays."""
+        arrays = self._arrays()
+        for field, column in self.text.items():
+            arrays[field] = _np().array(column, dtype=object)
+        return arrays
+
+    def _arrays(self) -> dict:
+        """The numeric and code columns as NumPy views of the same memory."""
+        np = _np()
+        if np is None:
+            raise ImportError("to_numpy() needs numpy. Install it with `pip install numpy`.")
+        return {field: np.frombuffer(column, dtype=_DTYPES[column.typecode]) for field, column in (self.numeric | self.codes).items()}
+
+    def _label_strings(self, field: str) -> list[str]:
+        return [wire_value(member) for member in ENUM_MEMBERS[field]]
+
+    def to_pandas(self):
+        """A pandas DataFrame. Enum columns become categoricals of their wire strings, built straight from the codes."""
+        import pandas
+        arrays = self.to_numpy()
+        for field in ENUM_MEMBERS:
+            arrays[field] = pandas.Categorical.from_codes(arrays[field], categories=self._label_strings(field))
+        return pandas.DataFrame(arrays, copy=False)
+
+    def to_arrow(self):
+        """A pyarrow Table. Numeric columns wrap the arrays' buffers without copying, and enum columns become dictionary arrays of their wire strings."""
+        import pyarrow
+        columns = {field: pyarrow.Array.from_buffers(pyarrow.float64() if typecode == "d" else pyarrow.int64(), len(self), [None, pyarrow.py_buffer(self.numeric[field])])
+                   for field, typecode in NUMERIC_FIELDS.items()}
+        for field in ENUM_MEMBERS:
+            codes = self.codes[field]
+            indices = pyarrow.array([code if code >= 0 else None for code in codes], pyarrow.int16())
+            columns[field] = pyarrow.DictionaryArray.from_arrays(indices, pyarrow.array(self._label_strings(field)))
+        for field in TEXT_FIELDS:
+            columns[field] = pyarrow.array(self.text[field], pyarrow.string())
+        return pyarrow.table(columns)
+
+    def __repr__(self):
+        return f"<InventoryColumns {len(self)} items>"
@@ -1,4 +1,13 @@
+import threading, time
+from collections import OrderedDict
+from typing import Iterable
+
+
 class Customer:
+    __slots__ = ("customer_id", "first_name", "last_name", "company", "primary_phone", "contact_phone", "email", "drivers_license", "store_credit",
+                 "preferred_contact_methods", "billing_agent", "net_terms", "postal_code", "referral_source_id", "street1", "street2", "country",
+                 "state", "city")
+
     customer_id               : int
     first_name                : str
     last_name                 : str
@@ -42,12 +51,142 @@ class Customer:
         self.state = state
         self.city = city
 
-    def __dict__(self):
+    def export(self):
         return {"id": self.customer_id, "firstName": self.first_name, "lastName": self.last_name, "company": self.company, "primaryPhone": self.primary_phone,            \
                 "contactPhone": self.contact_phone, "email": self.email, "driversLicense": self.drivers_license, "storeCredit": self.store_credit,                        \
                 "preferredContactMethods": self.preferred_contact_methods if len(self.preferred_contact_methods) != 0 else None, "billingAgent": self.billing_agent,      \
                 "netTerms": self.net_terms, "postalCode": self.postal_code, "referralSourceId": self.referral_source_id, "street1": self.street1, "street2": self.street2,\
                 "country": self.country, "state": self.state, "city": self.city}
     
+    @classmethod
+    def from_json(cls, data: dict) -> "Customer":
+        """From the API's JSON. See `customer_from_json`."""
+        return customer_from_json(data)
+
     def __repr__(self):
-        return f"{self.first_name} {self.last_name}"
\ No newline at end of file
+        return f"{self.first_name} {self.last_name}"
+
+def customer_from_json(data: dict) -> Customer:
+    # ticket payloads embed a trimmed-down customer, so every key is optional
+    return Customer(data.get("id"), data.get("firstName"), data.get("lastName"), data.get("company"), data.get("primaryPhone"), data.get("contactPhone"),
+                    data.get("email"), data.get("driversLicense"), data.get("storeCredit"), data.get("preferredContactMethods") or [], data.get("billingAgent"),
+                    data.get("netTerms"), data.get("postalCode"), data.get("referralSourceId"), data.get("street1"), data.get("street2"), data.get("country"),
+                    data.get("state"), data.get("city"))
+
+
+def customers_from_body(payload) -> list[dict]:
+    # customer search answers with a list, like inventory search. take {"customers": [...]} too, like ticket search
+    return payload["customers"] if isinstance(payload, dict) else payload
+
+
+class CustomerMapStats:
+    """Counters for a `CustomerIdentityMap`."""
+
+    def __init__(self):
+        self.hits = 0; self.misses = 0; self.expirations = 0; self.evictions = 0; self.refreshes = 0; self.stale = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "expirations": self.expirations, "evictions": self.evictions, "refreshes": self.refreshes,
+                "stale": self.stale}
+
+    def __repr__(self):
+        return f"CustomerMapStats({self.as_dict()})"
+
+
+class CustomerIdentityMap:
+    """
+    One `Customer` per `customer_id`, shared by every client in the process built with the same API key (see `for_token`).
+
+    Customers fetched by `get_customer`/`customer_search` are kept here, so looking up the customer behind each
+    ticket at a busy front desk hits the API once per customer, not once per ticket. An entry is served for
+    `ttl` seconds, then looked up again. A newer copy replaces the held object's fields in place, so anything
+    already pointing at it sees the update. A copy with an older `updatedAt` than the held one, such as a stale
+    cached search, is ignored and doesn't extend the TTL (`stats.stale`). Customers without an `id` aren't held.
+    Past `max_entries` the least recently used go. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 300.0):
+        self.max_entries = max_entries; self.ttl = ttl
+        self.stats = CustomerMapStats()
+        self._entries: OrderedDict[str, tuple[Customer, float, str | None]] = OrderedDict() # id -> (customer, expires, updatedAt)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, customer_id) -> bool:
+        return self.get(customer_id, count=False) is not None
+
+    def get(self, customer_id, count: bool = True) -> Customer | None:
+        """The held customer, or None if there isn't one or it's past its TTL."""
+        with self._lock:
+            entry = self._entries.get(customer_id)
+            if entry is None:
+                if count: self.stats.misses += 1
+                return None
+            if entry[1] <= time.monotonic():
+                if count: self.stats.expirations += 1; self.stats.misses += 1
+                return None # kept, so a refresh can update the same object in place
+            self._entries.move_to_end(customer_id)
+            if count: self.stats.hits += 1
+            return entry[0]
+
+    def put(self, raw: dict) -> Customer:
+        """
+        Stores a customer from the API's JSON and returns the shared object, updated in place if one was held.
+        If the held one is newer, it's returned untouched. Without an `id`, the customer is built but not held.
+        """
+        customer_id = raw.get("id")
+        if customer_id is None:
+            return customer_from_json(raw)
+        updated = raw.get("updatedAt")
+        fresh = customer_from_json(raw)
+        with self._lock:
+            entry = self._entries.get(customer_id)
+            if entry is not None:
+                customer, _, held_updated = entry
+                if (updated or "") < (held_updated or ""):
+                    self.stats.stale += 1
+                    return customer
+                for name in Customer.__slots__:
+                    setattr(customer, name, getattr(fresh, name))
+                self.stats.refreshes += 1
+            else:
+                customer = fresh
+            self._entries[customer_id] = (customer, time.monotonic() + self.ttl, updated)
+            self._entries.move_to_end(customer_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        return customer
+
+    def put_many(self, raws: Iterable[dict]) -> list[Customer]:
+        return [self.put(raw) for raw in raws]
+
+    def invalidate(self, customer_id=None):
+        """Forgets one customer, or all of them."""
+        with self._lock:
+            if customer_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(customer_id, None)
+
+    def __repr__(self):
+        return f"<CustomerIdentityMap {len(self)} customers>"
+
+
+_BY_TOKEN: dict[str, CustomerIdentityMap] = {}
+_BY_TOKEN_LOCK = threading.Lock()
+
+
+def for_token(token: str) -> CustomerIdentityMap:
+    """
+    The process-wide map for one API key, which clients use unless given their own. Clients with the same key
+    share it. A client with another key never gets a customer fetched under this one, since what a key may read
+    is up to the API. To share across keys anyway, pass the same map to each client as `customers=`.
+    """
+    with _BY_TOKEN_LOCK:
+        customers = _BY_TOKEN.get(token)
+        if customers is None:
+            customers = _BY_TOKEN[token] = CustomerIdentityMap()
+        return customers
@@ -0,0 +1,222 @@
+import logging, os, sqlite3, threading, time
+from typing import Awaitable, Callable
+from urllib.parse import urlencode
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_endpoint ON responses (endpoint);
+"""
+
+
+class DiskCacheStats:
+    """Counters for one process's use of a `DiskCache`."""
+
+    def __init__(self):
+        self.hits = 0; self.stale_hits = 0; self.misses = 0; self.stores = 0; self.evictions = 0; self.revalidations = 0; self.failed_revalidations = 0
+        self.errors = 0 # reads and writes that failed, such as on a database locked past busy_timeout
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "stale_hits": self.stale_hits, "misses": self.misses, "stores": self.stores, "evictions": self.evictions,
+                "revalidations": self.revalidations, "failed_revalidations": self.failed_revalidations, "errors": self.errors}
+
+    def __repr__(self):
+        return f"DiskCacheStats({self.as_dict()})"
+
+
+class DiskCache:
+    """
+    Raw API responses kept in an SQLite file, so a restarted worker starts warm.
+
+    Bodies are keyed on endpoint and parameters and stamped with when they were stored. A body younger than its
+    endpoint's TTL (`ttls`, else `ttl`) is served as is. An older one, up to `max_stale` seconds old, is still
+    served straight away, but the client refetches it in the background ("stale while revalidate") and stores the
+    new copy. Past `max_stale` it's a miss. Once the file holds more than `max_bytes` of bodies, the least recently
+    read are evicted.
+
+    Any number of processes can share one file. It runs in WAL mode, so readers don't block the writer, and a
+    busy database is waited on for `busy_timeout` seconds. Each process (and each fork) opens its own connection.
+    Pass one to a client as `disk_cache=`. It sits under the in-memory `ResponseCache`, if there is one. Clients go
+    through `lookup` and `store`, so a database that's locked or broken only costs a trip to the API. The async
+    client runs those on a worker thread, so a busy database never stalls the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, ttl: float = 30.0, ttls: dict[str, float] = None,
+                 max_stale: float = 24 * 60 * 60, busy_timeout: float = 5.0):
+        self.path = path
+        self.max_bytes = max_bytes; self.ttl = ttl; self.ttls = ttls or {}; self.max_stale = max_stale
+        self.busy_timeout = busy_timeout
+        self.stats = DiskCacheStats()
+        self._db = None; self._pid = None
+        self._lock = threading.Lock()
+        self._revalidating: set[str] = set()
+        self._pool = None # ThreadPoolExecutor for background refetches
+        self._tasks = set() # keeps asyncio revalidation tasks alive
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None) -> str:
+        return f"{endpoint}?{urlencode(sorted((params or {}).items()))}"
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        # opened lazily, and again after a fork. an inherited sqlite connection isn't safe to use
+        if self._db is None or self._pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._pid = os.getpid()
+        return self._db
+
+    def __len__(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        """Total bytes of bodies held, across every process."""
+        with self._lock:
+            return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, endpoint: str, params: dict = None) -> tuple[bytes | None, bool]:
+        """Returns `(body, fresh)`. `(None, False)` if there's nothing usable."""
+        key = self.key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self.db.execute("SELECT body, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.max_stale:
+                self.stats.misses += 1
+                return None, False
+            self.db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        fresh = now - row[1] <= self.ttls.get(endpoint, self.ttl)
+        if fresh: self.stats.hits += 1
+        else: self.stats.stale_hits += 1
+        return row[0], fresh
+
+    def set(self, endpoint: str, params: dict, body: bytes):
+        key = self.key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            db = self.db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("INSERT OR REPLACE INTO responses (key, endpoint, body, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                           (key, endpoint, body, len(body), now, now))
+                self.stats.stores += 1
+                self._evict(db)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def lookup(self, endpoint: str, params: dict = None) -> tuple[bytes | None, bool]:
+        """`get`, but a database error is logged and counted as a miss."""
+        try:
+            return self.get(endpoint, params)
+        except sqlite3.Error:
+            self.stats.errors += 1
+            log.warning(f"Couldn't read {self.key(endpoint, params)} from the disk cache. Asking the API.", exc_info=True)
+            return None, False
+
+    def store(self, endpoint: str, params: dict, body: bytes):
+        """`set`, but a database error is logged and the body just isn't kept."""
+        try:
+            self.set(endpoint, params, body)
+        except sqlite3.Error:
+            self.stats.errors += 1
+            log.warning(f"Couldn't write {self.key(endpoint, params)} to the disk cache.", exc_info=True)
+
+    async def lookup_async(self, endpoint: str, params: dict = None) -> tuple[bytes | None, bool]:
+        """`lookup` on a worker thread, so a busy database doesn't block the running loop."""
+        import asyncio # deferred, see the note in api.py
+        return await asyncio.to_thread(self.lookup, endpoint, params)
+
+    async def store_async(self, endpoint: str, params: dict, body: bytes):
+        """`store` on a worker thread."""
+        import asyncio # deferred, see the note in api.py
+        await asyncio.to_thread(self.store, endpoint, params, body)
+
+    def _evict(self, db: sqlite3.Connection):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size; self.stats.evictions += 1
+
+    def invalidate(self, endpoint: str = None, params: dict = None):
+        """Drops one entry, every entry for `endpoint` if `params` is left out, or everything if both are."""
+        with self._lock:
+            if endpoint is None:
+                self.db.execute("DELETE FROM responses")
+            elif params is None:
+                self.db.execute("DELETE FROM responses WHERE endpoint = ?", (endpoint,))
+            else:
+                self.db.execute("DELETE FROM responses WHERE key = ?", (self.key(endpoint, params),))
+
+    def invalidate_id(self, item_id: str):
+        """Drops every stored body that mentions `item_id`, such as after it's been patched."""
+        with self._lock:
+            self.db.execute("DELETE FROM responses WHERE instr(body, ?) > 0", (f'"{item_id}"'.encode(),))
+
+    def revalidate(self, endpoint: str, params: dict, fetch: Callable[[], bytes]):
+        """Refetches an entry on a background thread with `fetch` and stores the result. Does nothing if that's already underway."""
+        key = self.key(endpoint, params)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            if self._pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="myrepairapp-revalidate")
+
+        def refresh():
+            try:
+                self.set(endpoint, params, fetch())
+                self.stats.revalidations += 1
+            except Exception:
+                self.stats.failed_revalidations += 1
+                log.warning(f"Couldn't revalidate {key}. Keeping the stale copy.", exc_info=True)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+        self._pool.submit(refresh)
+
+    def revalidate_async(self, endpoint: str, params: dict, fetch: Callable[[], Awaitable[bytes]]):
+        """`revalidate` as a task on the running loop, for the async client. The store runs on a worker thread."""
+        import asyncio # deferred, see the note in api.py
+        key = self.key(endpoint, params)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        async def refresh():
+            try:
+                body = await fetch()
+                await asyncio.to_thread(self.set, endpoint, params, body)
+                self.stats.revalidations += 1
+            except Exception:
+                self.stats.failed_revalidations += 1
+                log.warning(f"Couldn't revalidate {key}. Keeping the stale copy.", exc_info=True)
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._tasks.add(task); task.add_done_callback(self._tasks.discard)
+
+    def close(self):
+        """Waits for background revalidations, then closes this process's connection."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._lock:
+            if self._db is not None and self._pid == os.getpid():
+                self._db.close()
+            self._db = None
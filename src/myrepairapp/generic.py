@@ -1,5 +1,5 @@
 class GenericItem:
-    ITEM_TYPE = None
+    __slots__ = ("ITEM_TYPE",)
 
     def __init__(self, item_type: str):
         super().__init__()
@@ -0,0 +1,102 @@
+import threading
+from typing import Iterable
+
+from .inventory_item import InventoryItem, item_from_json
+from .checkin_ticket import CheckInTicket, CheckinLine
+from .customer import Customer, CustomerIdentityMap, customer_from_json
+from .lazy import LazyCheckInTicket
+
+
+class IdentityMap:
+    """
+    One object per id for the records nested in tickets: `items` (`InventoryItem`s), `customers` (`Customer`s) and
+    `assignees` (the assignee dicts, shared as-is).
+
+    An item is only rebuilt when a copy with a newer `updatedAt` turns up. Keep one around between `hydrate()`
+    calls to reuse objects across reports. `built` and `reused` count how often each happened.
+
+    Tickets only embed part of a customer, so if you pass `known` (such as `client.customers`), a customer already
+    fetched into it is used as is, the same object `get_customer` returns. Without it every customer is built from
+    the ticket, since a shared map may hold customers fetched under another API key.
+    """
+
+    def __init__(self, known: CustomerIdentityMap = None):
+        self.known = known
+        self.items: dict[str, InventoryItem] = {}
+        self.customers: dict[str, Customer] = {}
+        self.assignees: dict[str, dict] = {}
+        self.built = 0; self.reused = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.items) + len(self.customers) + len(self.assignees)
+
+    def _merge_items(self, raw_items: Iterable[dict]):
+        for raw in raw_items:
+            held = self.items.get(raw.get("id"))
+            if held is not None and (held.updated_at or "") >= (raw.get("updatedAt") or ""):
+                self.reused += 1
+                continue
+            self.items[raw.get("id")] = item_from_json(raw)
+            self.built += 1
+
+    def _merge_customers(self, raw_customers: Iterable[dict]):
+        for raw in raw_customers:
+            if raw.get("id") in self.customers:
+                self.reused += 1
+                continue
+            known = self.known.get(raw.get("id"), count=False) if self.known is not None else None # not a get_customer lookup, so it stays out of the hit rate
+            if known is not None:
+                self.customers[raw.get("id")] = known
+                self.reused += 1
+                continue
+            self.customers[raw.get("id")] = customer_from_json(raw)
+            self.built += 1
+
+    def __repr__(self):
+        return f"<IdentityMap {len(self.items)} items, {len(self.customers)} customers, {len(self.assignees)} assignees>"
+
+
+def _newest(found: dict, raw: dict):
+    """Keeps the copy of `raw`'s id with the latest `updatedAt`."""
+    held = found.get(raw.get("id"))
+    if held is None or (raw.get("updatedAt") or "") > (held.get("updatedAt") or ""):
+        found[raw.get("id")] = raw
+
+
+def hydrate(tickets: Iterable[CheckInTicket | LazyCheckInTicket], identity: IdentityMap = None) -> list[CheckInTicket]:
+    """
+    Turns tickets' nested raw data into models, in place: each `checkinItems` line becomes a `CheckinLine`, keeping
+    its quantity, price and id, with the shared `InventoryItem` as `item` (None for labor and custom lines, which
+    are kept too). `customer` becomes a `Customer` and `assignee` the one shared dict for that assignee. Lazy
+    tickets are materialized first.
+
+    It works in one batched pass. Every raw item and customer across all the tickets is collected first, deduplicated
+    by id, and built once through `identity` (a fresh `IdentityMap` if left out). Then each ticket is pointed at the
+    shared objects. So a part checked in on 500 tickets becomes a single `InventoryItem`. Already hydrated fields
+    are left alone, so hydrating twice is harmless. Returns the tickets.
+    """
+    identity = identity if identity is not None else IdentityMap()
+    tickets = [ticket.materialize() if isinstance(ticket, LazyCheckInTicket) else ticket for ticket in tickets]
+    raw_items = {}; raw_customers = {}
+    for ticket in tickets:
+        for entry in ticket.checkinItems or []:
+            if isinstance(entry, dict) and entry.get("inventoryItem"):
+                _newest(raw_items, entry["inventoryItem"])
+        if isinstance(ticket.customer, dict):
+            raw_customers.setdefault(ticket.customer.get("id"), ticket.customer)
+    with identity._lock:
+        identity._merge_items(raw_items.values())
+        identity._merge_customers(raw_customers.values())
+        for ticket in tickets:
+            if ticket.checkinItems:
+                ticket.checkinItems = [CheckinLine(entry, identity.items[entry["inventoryItem"].get("id")] if entry.get("inventoryItem") else None)
+                                       if isinstance(entry, dict) else entry for entry in ticket.checkinItems]
+            customer = ticket.customer
+            if isinstance(customer, dict):
+                ticket.customer = identity.customers[customer.get("id")]
+            elif isinstance(customer, str) and customer in identity.customers: # an id on its own
+                ticket.customer = identity.customers[customer]
+            if isinstance(ticket.assignee, dict):
+                ticket.assignee = identity.assignees.setdefault(ticket.assignee.get("id"), ticket.assignee)
+    return tickets
@@ -0,0 +1,192 @@
+import bisect, re, threading
+from collections import defaultdict
+from typing import Callable
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"/[^/]*\d[^/]*")
+
+
+def endpoint_label(path: str) -> str:
+    """Collapses ids out of a path, so `/inventory/clx81a...` is counted as `/inventory/{id}`."""
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, Prometheus style. Not locked on its own. `Instrumentation` does that."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1) # the last one is +Inf
+        self.count = 0; self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1; self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates the `q` quantile (0-1) by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count; seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def as_dict(self) -> dict:
+        return {"count": self.count, "sum": self.sum, "buckets": dict(zip(self.buckets + (float("inf"),), self.counts)),
+                "p50": self.quantile(0.5), "p99": self.quantile(0.99)}
+
+
+class RequestRecord:
+    """
+    What a post-request hook is told about a finished request.
+
+    `status` is the last response's status, None if it never got one. `statuses` has every response's, retried 429s
+    included, in order. `elapsed` is time spent on the network. `waited` is time spent before that, held back by the
+    rate limiter or sleeping off a 429, so `elapsed + waited` is how long the caller was kept.
+    """
+
+    __slots__ = ("method", "endpoint", "params", "status", "statuses", "elapsed", "waited", "size", "retries", "error")
+
+    def __init__(self, method: str, endpoint: str, params: dict):
+        self.method = method; self.endpoint = endpoint; self.params = params
+        self.status = None; self.statuses = []; self.elapsed = 0.0; self.waited = 0.0; self.size = 0; self.retries = 0; self.error = None
+
+    def responded(self, status: int, attempt: int, waited: float = 0.0):
+        """Notes one response, to attempt number `attempt` (counting from 0), sent after `waited` seconds on the rate limiter."""
+        self.status = status; self.retries = attempt; self.waited += waited
+        self.statuses.append(status)
+
+    def __repr__(self):
+        return f"<RequestRecord {self.method} {self.endpoint} {self.status} {self.elapsed * 1000:.1f}ms>"
+
+
+class Instrumentation:
+    """
+    Request metrics and hooks for a client.
+
+    Pass one as `instrumentation=` to `MyRepairApp`/`AsyncMyRepairApp` (or a `Transport`). It keeps, per endpoint:
+
+    - `latency` - network time histogram, from first attempt to last byte, retries included. Waiting isn't.
+    - `wait` - histogram of time held back by the rate limiter and 429 backoff.
+    - `parse` - histogram of time spent in `item_from_json`/`ticket_from_json`.
+    - `statuses` - every response by status code, retried ones included, `retries`, `bytes`, and `cache_hits`/`cache_misses`.
+
+    `add_hook(before=..., after=...)` registers callables run before each request with `(method, endpoint, params)`,
+    and after it with a `RequestRecord`. `prometheus()` renders everything in the Prometheus text format, and
+    `snapshot()` gives a plain dict for anything else, such as `opentelemetry_hook`.
+
+    Leaving `instrumentation` unset costs one `is None` check per request.
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, namespace: str = "myrepairapp"):
+        self.buckets = buckets; self.namespace = namespace
+        self.latency: dict[str, Histogram] = defaultdict(lambda: Histogram(self.buckets))
+        self.wait: dict[str, Histogram] = defaultdict(lambda: Histogram(self.buckets))
+        self.parse: dict[str, Histogram] = defaultdict(lambda: Histogram(self.buckets))
+        self.statuses: dict[tuple[str, int], int] = defaultdict(int)
+        self.retries: dict[str, int] = defaultdict(int)
+        self.bytes: dict[str, int] = defaultdict(int)
+        self.cache_hits: dict[str, int] = defaultdict(int)
+        self.cache_misses: dict[str, int] = defaultdict(int)
+        self._before: list[Callable] = []
+        self._after: list[Callable] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, before: Callable[[str, str, dict], None] = None, after: Callable[[RequestRecord], None] = None):
+        if before is not None: self._before.append(before)
+        if after is not None: self._after.append(after)
+
+    # called by Transport and the clients
+
+    def request_started(self, method: str, path: str, params: dict) -> RequestRecord:
+        record = RequestRecord(method, endpoint_label(path), params)
+        for hook in self._before:
+            hook(method, record.endpoint, params)
+        return record
+
+    def request_finished(self, record: RequestRecord):
+        with self._lock:
+            self.latency[record.endpoint].observe(record.elapsed)
+            self.wait[record.endpoint].observe(record.waited)
+            for status in record.statuses:
+                self.statuses[(record.endpoint, status)] += 1
+            self.retries[record.endpoint] += record.retries
+            self.bytes[record.endpoint] += record.size
+        for hook in self._after:
+            hook(record)
+
+    def parsed(self, path: str, elapsed: float):
+        with self._lock:
+            self.parse[endpoint_label(path)].observe(elapsed)
+
+    def cache_lookup(self, path: str, hit: bool):
+        with self._lock:
+            (self.cache_hits if hit else self.cache_misses)[endpoint_label(path)] += 1
+
+    # exporting
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "latency": {endpoint: histogram.as_dict() for endpoint, histogram in self.latency.items()},
+                "wait": {endpoint: histogram.as_dict() for endpoint, histogram in self.wait.items()},
+                "parse": {endpoint: histogram.as_dict() for endpoint, histogram in self.parse.items()},
+                "statuses": {f"{endpoint} {status}": count for (endpoint, status), count in self.statuses.items()},
+                "retries": dict(self.retries), "bytes": dict(self.bytes),
+                "cache_hits": dict(self.cache_hits), "cache_misses": dict(self.cache_misses),
+            }
+
+    def prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines = []
+        with self._lock:
+            for name, histograms, help_text in [("request_duration_seconds", self.latency, "Time spent on the network per request, retries included."),
+                                                ("wait_duration_seconds", self.wait, "Time per request held back by the rate limiter and 429 backoff."),
+                                                ("parse_duration_seconds", self.parse, "Time spent turning responses into model objects.")]:
+                lines += [f"# HELP {ns}_{name} {help_text}", f"# TYPE {ns}_{name} histogram"]
+                for endpoint, histogram in histograms.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{ns}_{name}_bucket{{endpoint="{endpoint}",le="{le}"}} {cumulative}')
+                    lines.append(f'{ns}_{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                    lines.append(f'{ns}_{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+            lines += [f"# HELP {ns}_responses_total Responses by status code.", f"# TYPE {ns}_responses_total counter"]
+            lines += [f'{ns}_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}' for (endpoint, status), count in self.statuses.items()]
+            for name, counter, help_text in [("retries_total", self.retries, "Requests retried after a 429."),
+                                             ("response_bytes_total", self.bytes, "Response body bytes received."),
+                                             ("cache_hits_total", self.cache_hits, "Searches answered from the response cache."),
+                                             ("cache_misses_total", self.cache_misses, "Searches the response cache couldn't answer.")]:
+                lines += [f"# HELP {ns}_{name} {help_text}", f"# TYPE {ns}_{name} counter"]
+                lines += [f'{ns}_{name}{{endpoint="{endpoint}"}} {count}' for endpoint, count in counter.items()]
+        return "\n".join(lines) + "\n"
+
+
+def opentelemetry_hook(meter) -> Callable[[RequestRecord], None]:
+    """
+    An `after` hook that records each request into OpenTelemetry instruments made from `meter`.
+
+        instrumentation.add_hook(after=opentelemetry_hook(metrics.get_meter("myrepairapp")))
+    """
+    duration = meter.create_histogram("myrepairapp.request.duration", unit="s", description="Time spent on the network per request.")
+    wait = meter.create_histogram("myrepairapp.request.wait", unit="s", description="Time per request held back by the rate limiter and 429 backoff.")
+    responses = meter.create_counter("myrepairapp.responses", description="Responses by status code.")
+    retries = meter.create_counter("myrepairapp.retries", description="Requests retried after a 429.")
+
+    def hook(record: RequestRecord):
+        attributes = {"endpoint": record.endpoint, "method": record.method}
+        duration.record(record.elapsed, attributes)
+        wait.record(record.waited, attributes)
+        for status in record.statuses:
+            responses.add(1, {**attributes, "status": status})
+        if record.retries:
+            retries.add(record.retries, attributes)
+    return hook
@@ -1,12 +1,17 @@
-import enum, json
+import enum, json, logging
 from enum import Enum
 from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Iterable
 
 if __name__ == "inventory_item":
     # import generic
     pass
 else:
     from . import generic
+    from .timestamps import ParsedTimestamp
+
+log = logging.getLogger(__name__)
 
 class InventoryJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle Enum members and dataclasses."""
@@ -289,10 +294,16 @@ class InventoryItemType:
 @dataclass(repr=True)
 class InventoryItem(generic.GenericItem):
     """A MyRepairApp inventory item. This handles organization, inventory counts, price, cost, etcetera."""
-    item_id = None; store_id = None; sku = None; manufacturer = None; type = None; name = None; in_stock = None; condition = None; bin = None; supplier_id = None
-    price = None; created_at = None; updated_at = None; note = None; inventoried = None; serialized = None; active = None; cost = None; category = None; serial_num = None
-    carrier = None; color = None; storage = None; trade_in_condition = None; trade_in_device = None; trade_in_status = None; additional_info = None; is_rebate = None; tax_free = None
-    grouping_id = None; repair_provider = None; is_motorola_sku = None; pulled = None; ordered = None; back_ordered = None; sku_pulled = None; sku_instock = None
+    # slotted, so tens of thousands of these don't each carry a __dict__. see benchmarks/bench_memory.py
+    __slots__ = ("item_id", "store_id", "sku", "manufacturer", "type", "name", "in_stock", "condition", "bin", "supplier_id", "price", "created_at",
+                 "updated_at", "note", "inventoried", "serialized", "active", "cost", "category", "serial_num", "carrier", "color", "storage",
+                 "trade_in_condition", "trade_in_device", "trade_in_status", "additional_info", "is_rebate", "tax_free", "grouping_id",
+                 "repair_provider", "is_motorola_sku", "pulled", "ordered", "back_ordered", "sku_pulled", "sku_instock",
+                 "_created_datetime", "_updated_datetime")
+
+    # created_at/updated_at stay the API's strings. these parse them on first read, once per object
+    created_datetime = ParsedTimestamp("created_at")
+    updated_datetime = ParsedTimestamp("updated_at")
 
     def __init__(self, item_id: str = None, store_id: str = None, sku: str = None, manufacturer: str = None, item_type: InventoryItemType = None, name: str = None,
                  in_stock: int = None, condition: InventoryItemCondition = None, bin: str = None, supplier_id: str = None, price: float = None, created_at: str = None,
@@ -308,28 +319,37 @@ class InventoryItem(generic.GenericItem):
         
         self.item_id = item_id; self.store_id = store_id; self.sku = sku; self.manufacturer = manufacturer; self.type = item_type; self.name = name; self.in_stock = in_stock
         self.condition = condition; self.bin = bin; self.supplier_id = supplier_id; self.price = price
-        # - todo: translate the below into datetime instances -
-        self.created_at = created_at
-        self.updated_at = updated_at
-        # -----------------------------------------------------
+        self.created_at = created_at; self.updated_at = updated_at # parsed versions: created_datetime, updated_datetime
         self.note = note; self.inventoried = inventoried; self.serialized = serialized; self.active = active; self.cost = cost; self.category = category; self.serial_num = serial_num
         self.carrier = carrier; self.color = color; self.storage = storage; self.trade_in_condition = trade_in_condition; self.trade_in_device = trade_in_device
-        self.trade_in_status = trade_in_status; self.additional_info = additional_info; self.is_rebate = is_rebate; self.taxFree = tax_free; self.grouping_id = grouping_id
+        self.trade_in_status = trade_in_status; self.additional_info = additional_info; self.is_rebate = is_rebate; self.tax_free = tax_free; self.grouping_id = grouping_id
         self.repair_provider = repair_provider; self.is_motorola_sku = is_motorola_sku; self.pulled = pulled; self.ordered = ordered; self.back_ordered = back_ordered
         self.sku_pulled = sku_pulled; self.sku_instock = sku_instock
     
     def __repr__(self):
         return self.name
     
-    def export(self):
-        raw_dump = json.loads(json.dumps(self.__dict__, cls=InventoryJSONEncoder)) # awful.
-        returned = raw_dump
-        del returned["ITEM_TYPE"]
-        returned["id"] = returned["item_id"]; del returned["item_id"]
-        returned["storeId"] = returned["store_id"]; del returned["store_id"]
-        print(returned)
+    def export(self, only: Iterable[str] = None) -> dict:
+        """
+        The item as the API's camelCase JSON dict, enums turned back into their wire strings.
+
+        `only` limits it to some fields, by attribute or wire name, such as when building a PATCH body.
+        """
+        fields = _EXPORT_FIELDS if only is None else _export_fields(tuple(only))
+        returned = {wire: getattr(self, name) for name, wire in fields}
+        for wire in _ENUM_WIRE_NAMES:
+            value = returned.get(wire)
+            if value is not None:
+                returned[wire] = wire_value(value)
+        if self.trade_in_device is not None and only is None:
+            returned["tradeInDevice"] = self.trade_in_device.export()
         return returned
 
+    def export_bytes(self, only: Iterable[str] = None) -> bytes:
+        """`export`, encoded as compact JSON by the `codec` backend."""
+        from . import codec # codec imports this module
+        return codec.dumps(self.export(only))
+
     
     # def __dict__(self):
     #     return {
@@ -344,6 +364,110 @@ class InventoryItem(generic.GenericItem):
 
     #     }
 
+# InventoryItem attribute -> key in the API's JSON. trade_in_device never comes over the wire.
+FIELD_WIRE_NAMES = {
+    "item_id": "id", "store_id": "storeId", "sku": "sku", "manufacturer": "manufacturer", "type": "type", "name": "name", "in_stock": "instock",
+    "condition": "condition", "bin": "bin", "supplier_id": "supplierId", "price": "price", "created_at": "createdAt", "updated_at": "updatedAt",
+    "note": "note", "inventoried": "inventoried", "serialized": "serialized", "active": "active", "cost": "cost", "category": "category",
+    "serial_num": "serialNum", "carrier": "carrier", "color": "color", "storage": "storage", "trade_in_condition": "tradeInCondition",
+    "trade_in_status": "tradeInStatus", "additional_info": "additionalInfo", "is_rebate": "isRebate", "tax_free": "taxFree",
+    "grouping_id": "groupingId", "repair_provider": "repairProvider", "is_motorola_sku": "isMotorolaSku", "pulled": "pulled",
+    "ordered": "ordered", "back_ordered": "backOrdered", "sku_pulled": "skuPulled", "sku_instock": "skuInstock",
+}
+
+class EnumDecoder:
+    """
+    Raw wire string -> enum member, in one dict lookup.
+
+    The table is built once, at import, from every spelling `get_from_string` would accept for a known member.
+    Anything else goes through `fallback` (the old `get_from_string` path) once and the answer is remembered.
+    Values that still don't decode come back as None with a warning, instead of a `ValueError` halfway through
+    a result list.
+    """
+
+    _MAX_LEARNED = 1024 # so garbage input can't grow the table forever
+
+    def __init__(self, name: str, table: dict, fallback):
+        self.name = name; self.table = table; self.fallback = fallback
+        self._learned = 0
+
+    def __call__(self, raw: str | None):
+        if not raw:
+            return None
+        try:
+            return self.table[raw]
+        except KeyError:
+            pass
+        try:
+            member = self.fallback(raw)
+        except ValueError:
+            log.warning(f"Unknown {self.name} {raw!r} from MyRepairApp. Leaving it as None.")
+            member = None
+        if self._learned < self._MAX_LEARNED:
+            self.table[raw] = member; self._learned += 1
+        return member
+
+def _spellings(member: enum.Enum) -> set[str]:
+    """Every way `get_from_string` would accept a member: its value or name, in any of the common cases."""
+    found = set()
+    for spelling in (member.name, member.name.replace("_", " "), member.value):
+        found.update((spelling, spelling.upper(), spelling.lower(), spelling.title()))
+    return found
+
+def _enum_table(enum_class) -> dict:
+    return {spelling: member for member in enum_class for spelling in _spellings(member)}
+
+def _type_table() -> dict:
+    table = {}
+    for prefix, enum_class in [("Repair", InventoryItemType.RepairItem), ("Device", InventoryItemType.DeviceItem), ("Prepaid", InventoryItemType.PrepaidItem),
+                               ("Part", InventoryItemType.PartItem), ("Accessory", InventoryItemType.AccessoryItem), ("Service", InventoryItemType.ServiceItem)]:
+        for member in enum_class:
+            for spelling in _spellings(member):
+                if " - " in spelling: # RepairItem values already carry the prefix
+                    table[spelling] = member
+                    continue
+                for head in (prefix, prefix.upper(), prefix.lower()):
+                    table[f"{head} - {spelling}"] = member
+    for spelling in ("Tools", "TOOLS", "tools"):
+        table[spelling] = InventoryItemType.ToolItem.TOOL
+    return table
+
+decode_condition = EnumDecoder("condition", _enum_table(InventoryItemCondition), InventoryItemCondition.get_from_string)
+decode_category = EnumDecoder("category", _enum_table(InventoryItemCategory), InventoryItemCategory.get_from_string)
+decode_type = EnumDecoder("type", _type_table(), InventoryItemType.get_from_string)
+
+# attributes that item_from_json turns into enums
+FIELD_DECODERS = {
+    "condition": decode_condition,
+    "category": decode_category,
+    "type": decode_type,
+}
+
+_EXPORT_FIELDS = tuple(FIELD_WIRE_NAMES.items())
+_EXPORT_LOOKUP = {**{name: (name, wire) for name, wire in _EXPORT_FIELDS}, **{wire: (name, wire) for name, wire in _EXPORT_FIELDS}}
+_ENUM_WIRE_NAMES = tuple(FIELD_WIRE_NAMES[name] for name in FIELD_DECODERS)
+
+# enum member -> how the API spells it. most are just the value, but part/device/etc. types lose their prefix in the enum
+_WIRE_VALUES = {member: f"{prefix} - {member.value}" for prefix, enum_class in [("Part", InventoryItemType.PartItem), ("Device", InventoryItemType.DeviceItem),
+                                                                               ("Prepaid", InventoryItemType.PrepaidItem), ("Accessory", InventoryItemType.AccessoryItem),
+                                                                               ("Service", InventoryItemType.ServiceItem)] for member in enum_class}
+_WIRE_VALUES[InventoryItemType.ToolItem.TOOL] = "Tools"
+
+def wire_value(value):
+    """Turns an enum member into the string the API uses for it. Anything else passes through."""
+    if isinstance(value, Enum):
+        return _WIRE_VALUES.get(value, value.value)
+    return value
+
+def wire_name(field: str) -> str | None:
+    """The API's key for an `InventoryItem` attribute or wire key. None if it isn't one."""
+    found = _EXPORT_LOOKUP.get(field)
+    return found[1] if found else None
+
+@lru_cache(maxsize=256)
+def _export_fields(only: tuple) -> tuple:
+    return tuple(_EXPORT_LOOKUP[field] for field in only if field in _EXPORT_LOOKUP)
+
 def item_from_json(data: dict) -> InventoryItem:
     # Use .get() for optional keys
     pulled = data.get("pulled")
@@ -353,9 +477,9 @@ def item_from_json(data: dict) -> InventoryItem:
     sku_instock = data.get("skuInstock")
     
     # Safely get and convert condition, category, and type
-    condition = InventoryItemCondition.get_from_string(data.get("condition"))
-    category  = InventoryItemCategory.get_from_string(data.get("category"))
-    item_type = InventoryItemType.get_from_string(data.get("type"))
+    condition = decode_condition(data.get("condition"))
+    category  = decode_category(data.get("category"))
+    item_type = decode_type(data.get("type"))
     
     # Pass arguments by name, which is clearer than positional arguments
     return InventoryItem(
@@ -0,0 +1,85 @@
+from . import generic
+from .inventory_item import InventoryItem, item_from_json, FIELD_WIRE_NAMES as ITEM_WIRE_NAMES, FIELD_DECODERS as ITEM_DECODERS
+from .checkin_ticket import CheckInTicket, ticket_from_json, activity_from_json, FIELD_WIRE_NAMES as TICKET_WIRE_NAMES
+
+
+class LazyInventoryItem(generic.GenericItem):
+    """
+    An `InventoryItem` that hasn't been parsed yet.
+
+    Wraps the raw JSON dict from the API. Each attribute is read (and its enum resolved) the first time it's
+    accessed, then cached on the instance, so reading `name` or `sku` off a search result costs a dict lookup.
+    Attribute names match `InventoryItem`. Call `materialize()` for the real thing.
+    """
+
+    created_datetime = InventoryItem.created_datetime
+    updated_datetime = InventoryItem.updated_datetime
+
+    def __init__(self, raw: dict):
+        super().__init__("inventory")
+        self.raw = raw
+
+    def __getattr__(self, name: str):
+        # only reached when `name` hasn't been decoded yet
+        try:
+            key = ITEM_WIRE_NAMES[name]
+        except KeyError:
+            if name == "trade_in_device": return None
+            raise AttributeError(f"'LazyInventoryItem' object has no attribute '{name}'") from None
+        value = self.raw.get(key)
+        decoder = ITEM_DECODERS.get(name)
+        if decoder is not None:
+            value = decoder(value)
+        self.__dict__[name] = value
+        return value
+
+    def materialize(self) -> InventoryItem:
+        return item_from_json(self.raw)
+
+    def export(self, only=None) -> dict:
+        return self.materialize().export(only)
+
+    def __repr__(self):
+        return self.name
+
+
+class LazyCheckInTicket:
+    """
+    A `CheckInTicket` that hasn't been parsed yet.
+
+    Same idea as `LazyInventoryItem`: fields, and the `checkinTicketActivities` list, are only decoded the first
+    time they're read. `inventory_items` gives the checked-in items as `LazyInventoryItem`s.
+    """
+
+    createdDatetime = CheckInTicket.createdDatetime
+    updatedDatetime = CheckInTicket.updatedDatetime
+    closedDatetime = CheckInTicket.closedDatetime
+    appointmentDatetime = CheckInTicket.appointmentDatetime
+    warrantyPeriodEndDatetime = CheckInTicket.warrantyPeriodEndDatetime
+
+    def __init__(self, raw: dict):
+        self.raw = raw
+
+    def __getattr__(self, name: str):
+        try:
+            key = TICKET_WIRE_NAMES[name]
+        except KeyError:
+            raise AttributeError(f"'LazyCheckInTicket' object has no attribute '{name}'") from None
+        value = self.raw[key]
+        if name == "checkinTicketActivities":
+            value = [activity_from_json(item) for item in value]
+        self.__dict__[name] = value
+        return value
+
+    @property
+    def inventory_items(self) -> list[LazyInventoryItem]:
+        items = self.__dict__.get("_inventory_items")
+        if items is None:
+            items = self.__dict__["_inventory_items"] = [LazyInventoryItem(item["inventoryItem"]) for item in self.raw["checkinItems"] if item.get("inventoryItem")]
+        return items
+
+    def materialize(self) -> CheckInTicket:
+        return ticket_from_json(self.raw)
+
+    def __repr__(self):
+        return f"<LazyCheckInTicket #{self.ticketNumber}>"
@@ -0,0 +1,192 @@
+import json, re, sqlite3, threading, time
+from typing import Iterable, TYPE_CHECKING
+
+from . import codec
+from .inventory_item import InventoryItem, item_from_json, wire_value
+if TYPE_CHECKING:
+    from .columns import InventoryColumns
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory (
+    id TEXT PRIMARY KEY, sku TEXT, name TEXT, manufacturer TEXT, category TEXT, type TEXT, bin TEXT, updated_at TEXT, data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS inventory_sku ON inventory (sku);
+CREATE INDEX IF NOT EXISTS inventory_category ON inventory (category);
+CREATE INDEX IF NOT EXISTS inventory_type ON inventory (type);
+CREATE INDEX IF NOT EXISTS inventory_bin ON inventory (bin);
+CREATE INDEX IF NOT EXISTS inventory_updated_at ON inventory (updated_at);
+CREATE TABLE IF NOT EXISTS searches (query TEXT PRIMARY KEY, ids TEXT NOT NULL, fetched_at REAL NOT NULL);
+"""
+
+_UPSERT = """
+INSERT INTO inventory (id, sku, name, manufacturer, category, type, bin, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    sku = excluded.sku, name = excluded.name, manufacturer = excluded.manufacturer, category = excluded.category,
+    type = excluded.type, bin = excluded.bin, updated_at = excluded.updated_at, data = excluded.data
+WHERE inventory.updated_at IS NULL OR excluded.updated_at > inventory.updated_at
+"""
+
+_REPLACE = "INSERT OR REPLACE INTO inventory (id, sku, name, manufacturer, category, type, bin, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def _row(record: dict) -> tuple:
+    return (record.get("id"), record.get("sku"), record.get("name"), record.get("manufacturer"), record.get("category"),
+            record.get("type"), record.get("bin"), record.get("updatedAt"), json.dumps(record))
+
+
+class InventoryMirror:
+    """
+    A local, indexed copy of `InventoryItem` records, stored in SQLite.
+
+    Searches run against an FTS5 index over name, SKU and manufacturer, and there are plain indexes on `sku`,
+    `item_id`, `category`, `type` and `bin`. Records are only rewritten when their `updatedAt` is newer than the
+    stored copy, so refreshing is cheap when little has changed.
+
+    Pass one to a client as `mirror=`. Every `inventory_search` the API answers is stored along with which items
+    it returned, and for `max_age` seconds after that the same query is answered from here: the same items, as
+    they stand locally, PATCHes included. Past `max_age`, or if any of those items has gone missing, the API is
+    asked again. `max_age=None` never expires. `search()` is the looser full-text search over everything held.
+
+    `path` defaults to an in-memory database. Give it a file to keep the mirror between runs.
+    """
+
+    def __init__(self, path: str = ":memory:", max_age: float | None = 300.0):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        try:
+            self._db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS inventory_fts USING fts5 (id UNINDEXED, name, sku, manufacturer)")
+            self.fts = True
+        except sqlite3.OperationalError: # sqlite built without FTS5. LIKE it is
+            self.fts = False
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+
+    @property
+    def watermark(self) -> str | None:
+        """The newest `updatedAt` held."""
+        with self._lock:
+            return self._db.execute("SELECT MAX(updated_at) FROM inventory").fetchone()[0]
+
+    def upsert(self, records: Iterable[dict]) -> int:
+        """Stores raw `/inventory/search` records, skipping any that aren't newer than what's held. Returns how many changed."""
+        changed = 0
+        with self._lock:
+            for record in records:
+                row = _row(record)
+                if self._db.execute(_UPSERT, row).rowcount == 0:
+                    continue
+                changed += 1
+                self._reindex(row)
+            self._db.commit()
+        return changed
+
+    def merge(self, item_id: str, fields: dict) -> bool:
+        """
+        Writes `fields` (wire names, such as a PATCH body or the item the API sent back) over the held copy of
+        `item_id`, whatever its `updatedAt`. Returns False if the item isn't held.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT data FROM inventory WHERE id = ?", (item_id,)).fetchone()
+            if row is None:
+                return False
+            row = _row(codec.loads(row[0]) | fields | {"id": item_id})
+            self._db.execute(_REPLACE, row)
+            self._reindex(row)
+            self._db.commit()
+        return True
+
+    def discard(self, item_id: str):
+        """Forgets `item_id`."""
+        with self._lock:
+            self._db.execute("DELETE FROM inventory WHERE id = ?", (item_id,))
+            if self.fts:
+                self._db.execute("DELETE FROM inventory_fts WHERE id = ?", (item_id,))
+            self._db.commit()
+
+    def _reindex(self, row: tuple):
+        if self.fts:
+            self._db.execute("DELETE FROM inventory_fts WHERE id = ?", (row[0],))
+            self._db.execute("INSERT INTO inventory_fts (id, name, sku, manufacturer) VALUES (?, ?, ?, ?)", (row[0], row[2], row[1], row[3]))
+
+    def store_search(self, query: str, records: list[dict]) -> int:
+        """`upsert`s what the API answered `query` with, and remembers it as that query's answer for `lookup`."""
+        changed = self.upsert(records)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO searches (query, ids, fetched_at) VALUES (?, ?, ?)",
+                             (query, json.dumps([record.get("id") for record in records]), time.time()))
+            self._db.commit()
+        return changed
+
+    def lookup(self, query: str) -> list[dict] | None:
+        """
+        The raw records the API last answered `query` with, as held now. None if the query hasn't been stored,
+        was stored more than `max_age` seconds ago, or any of its items is no longer held.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT ids, fetched_at FROM searches WHERE query = ?", (query,)).fetchone()
+            if row is None or (self.max_age is not None and time.time() - row[1] > self.max_age):
+                return None
+            ids = json.loads(row[0])
+            held = {}
+            for start in range(0, len(ids), 500): # sqlite caps bound parameters
+                chunk = ids[start:start + 500]
+                held.update(self._db.execute(f"SELECT id, data FROM inventory WHERE id IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+        if len(held) < len(set(ids)):
+            return None
+        return [codec.loads(held[item_id]) for item_id in ids]
+
+    def refresh(self, client, queries: Iterable[str] = ("",)) -> int:
+        """Re-runs `queries` against the API through `client` (a `MyRepairApp`) and stores whatever has changed. Returns how many records did."""
+        return sum(self.store_search(query, client.transport.request("GET", "/inventory/search", params={"query": query})) for query in queries)
+
+    def search(self, query: str, limit: int = None) -> list[InventoryItem]:
+        """Every held item matching all words in `query`, as a prefix, in name, SKU or manufacturer."""
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        if self.fts:
+            sql = "SELECT inventory.data FROM inventory_fts JOIN inventory ON inventory.id = inventory_fts.id WHERE inventory_fts MATCH ? ORDER BY rank"
+            args = [" AND ".join(f'"{word}"*' for word in words)]
+        else:
+            sql = "SELECT data FROM inventory WHERE " + " AND ".join("(name LIKE ? OR sku LIKE ? OR manufacturer LIKE ?)" for _ in words)
+            args = [f"%{word}%" for word in words for _ in range(3)]
+        if limit is not None:
+            sql += " LIMIT ?"; args.append(limit)
+        return self._items(sql, args)
+
+    def get(self, item_id: str) -> InventoryItem | None:
+        items = self._items("SELECT data FROM inventory WHERE id = ?", [item_id])
+        return items[0] if items else None
+
+    def find(self, sku: str = None, category=None, item_type=None, bin: str = None) -> list[InventoryItem]:
+        """
+        Exact-match lookup on the indexed columns. Leave a column out to not filter on it.
+
+        `category` takes an `InventoryItemCategory` or its wire string. `item_type` takes an `InventoryItemType` member or the full wire string, like "Part - Phone".
+        """
+        filters = {"sku": sku, "category": wire_value(category), "type": wire_value(item_type), "bin": bin}
+        filters = {column: value for column, value in filters.items() if value is not None}
+        where = " AND ".join(f"{column} = ?" for column in filters) or "1"
+        return self._items(f"SELECT data FROM inventory WHERE {where}", list(filters.values()))
+
+    def columns(self) -> "InventoryColumns":
+        """Every held item as an `InventoryColumns`, straight from the stored JSON without building `InventoryItem`s."""
+        from .columns import InventoryColumns
+        with self._lock:
+            rows = self._db.execute("SELECT data FROM inventory").fetchall()
+        return InventoryColumns.from_records(codec.loads(row[0]) for row in rows)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _items(self, sql: str, args: list) -> list[InventoryItem]:
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [item_from_json(codec.loads(row[0])) for row in rows]
@@ -0,0 +1,153 @@
+import random, threading, time
+
+from . import exceptions
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Refills at `rate` tokens per second up to `capacity`. Callers reserve a token and get back how long they need
+    to wait for it, so the blocking and asyncio paths can share one bucket and sleep their own way.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic() # when `_tokens` was counted. in the future while paused
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token. Returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return wait + self._updated - now
+
+    def pause(self, seconds: float):
+        """
+        Holds every caller back for `seconds`, such as after the server sends a `Retry-After`. Nothing refills
+        during the pause, and there's no burst after it: whatever queued up meanwhile goes out at `rate`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now + seconds > self._updated:
+                self._updated = now + seconds
+                self._tokens = min(self._tokens, 1.0)
+
+
+class RateLimiterStats:
+    """
+    Counters for how much a `RateLimiter` has slowed things down. `requests` counts every request let through,
+    `waited` the ones that had to wait for it. Wait times are in seconds.
+    """
+
+    def __init__(self):
+        self.requests = 0; self.waited = 0; self.throttled = 0; self.retries = 0; self.gave_up = 0
+        self.total_wait = 0.0; self.max_wait = 0.0
+        self._lock = threading.Lock()
+
+    def _record_wait(self, waited: float):
+        with self._lock:
+            self.requests += 1
+            if waited > 0: self.waited += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def _record_retry(self, waited: float):
+        with self._lock:
+            self.throttled += 1; self.retries += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> dict:
+        return {"requests": self.requests, "waited": self.waited, "throttled": self.throttled, "retries": self.retries, "gave_up": self.gave_up,
+                "total_wait": self.total_wait, "max_wait": self.max_wait, "mean_wait": self.mean_wait}
+
+    def __repr__(self):
+        return f"RateLimiterStats({self.as_dict()})"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Reads a `Retry-After` header, either delay-seconds or an HTTP date. Returns seconds, or None if missing/unreadable."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Client-side rate limiting for every request a `Transport` sends.
+
+    Requests draw from a token bucket refilled at `rate` per second (bursting up to `burst`), so we stay under the
+    API quota instead of finding it with 429s. When a 429 does come back, the retry waits for `Retry-After` if the
+    server sent one, or a jittered exponential backoff (`base_delay` doubling up to `max_delay`) if not. The whole
+    bucket is paused for that long, so other callers back off too, then picks up again at `rate`. After `max_retries` retries, or once `deadline`
+    seconds have passed since the first attempt, `TooManyRequests` is raised.
+
+    One limiter can be shared by several clients through `transport=`/`rate_limiter=`. `stats` counts the waiting.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: float = None, base_delay: float = 1.0, max_delay: float = 60.0,
+                 max_retries: int | None = 5, deadline: float | None = None):
+        self.bucket = TokenBucket(rate, burst)
+        self.base_delay = base_delay; self.max_delay = max_delay
+        self.max_retries = max_retries; self.deadline = deadline
+        self.stats = RateLimiterStats()
+
+    def wait(self) -> float:
+        """Blocks until a request may be sent. Returns the seconds waited."""
+        delay = self.bucket.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        self.stats._record_wait(delay)
+        return delay
+
+    async def wait_async(self) -> float:
+        """`wait`, without blocking the event loop."""
+        delay = self.bucket.reserve()
+        if delay > 0:
+            import asyncio # deferred, see the note in api.py
+            await asyncio.sleep(delay)
+        self.stats._record_wait(delay)
+        return delay
+
+    def retry_delay(self, attempt: int, retry_after: str | None, started: float) -> float:
+        """
+        How long to sleep before retry number `attempt` (counting from 0) of a request first sent at `started` (`time.monotonic()`).
+
+        Raises `TooManyRequests` once the retry budget or deadline is used up.
+        """
+        server_delay = parse_retry_after(retry_after)
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)) # "full jitter"
+        delay = max(server_delay, backoff) if server_delay is not None else backoff
+        out_of_retries = self.max_retries is not None and attempt >= self.max_retries
+        past_deadline = self.deadline is not None and time.monotonic() + delay - started > self.deadline
+        if out_of_retries or past_deadline:
+            with self.stats._lock:
+                self.stats.gave_up += 1
+            raise exceptions.TooManyRequests()
+        self.bucket.pause(delay)
+        self.stats._record_retry(delay)
+        return delay
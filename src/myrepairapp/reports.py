@@ -0,0 +1,242 @@
+import bisect
+from typing import Iterable, Iterator
+
+from . import codec
+from .timestamps import epoch_seconds
+
+DAY = 86400
+# turnaround histogram bounds, in hours. mergeable, and good enough for percentiles
+TURNAROUND_BUCKETS = (1, 2, 4, 8, 12, 24, 36, 48, 72, 96, 120, 168, 240, 336, 504, 720, 1440, 2160, 4320, 8760)
+
+
+def compact(ticket: dict) -> tuple:
+    """
+    The fields a report needs from one raw ticket, timestamps parsed once into epoch seconds:
+
+    `(created, closed, is_warranty, is_return, waiting_for_part, assignee_id, assignee_name)`
+    """
+    assignee = ticket.get("assignee")
+    name = " ".join(filter(None, (assignee.get("firstName"), assignee.get("lastName")))) if isinstance(assignee, dict) else None
+    return (epoch_seconds(ticket.get("createdAt")), epoch_seconds(ticket.get("closedAt")), bool(ticket.get("isWarranty")),
+            bool(ticket.get("isReturn")), bool(ticket.get("waitingForPart")), ticket.get("assigneeId"), name)
+
+
+class TicketReport:
+    """
+    Ticket metrics that can be built in pieces and merged: `a.merge(b)` is the report over both sets of tickets,
+    which have to be disjoint. Nothing here knows ticket ids. `run_report` is what removes duplicates.
+
+    - `tickets`, `closed`, `warranty`, `returns` - counts. `warranty_rate`/`return_rate` are shares of `tickets`.
+    - turnaround, `createdAt` to `closedAt`: `turnaround_sum`/`turnaround_min`/`turnaround_max` in whole milliseconds,
+      so partial sums merge exactly in any order, and a histogram for `turnaround_quantile()`. A closedAt before
+      createdAt is counted in `bad_timestamps` and skipped.
+    - `waiting_for_part` - open tickets waiting on a part, by assignee id. `assignees` maps ids to names.
+    - `daily` - `{day: [created, closed, turnaround milliseconds of those closed]}`, keyed on the UTC day as days since the epoch.
+    """
+
+    def __init__(self):
+        self.tickets = 0; self.closed = 0; self.warranty = 0; self.returns = 0; self.bad_timestamps = 0
+        self.turnaround_sum = 0; self.turnaround_min = None; self.turnaround_max = None
+        self.turnaround_counts = [0] * (len(TURNAROUND_BUCKETS) + 1)
+        self.waiting_for_part: dict[str, int] = {}
+        self.assignees: dict[str, str] = {}
+        self.daily: dict[int, list] = {}
+
+    def add(self, row: tuple):
+        """Counts one `compact()` row."""
+        created, closed, is_warranty, is_return, waiting, assignee_id, assignee_name = row
+        self.tickets += 1; self.warranty += is_warranty; self.returns += is_return
+        if assignee_id is not None and assignee_name:
+            self.assignees[assignee_id] = assignee_name
+        if created is not None:
+            self._day(int(created // DAY))[0] += 1
+        if closed is None:
+            if waiting:
+                self.waiting_for_part[assignee_id] = self.waiting_for_part.get(assignee_id, 0) + 1
+            return
+        self.closed += 1
+        day = self._day(int(closed // DAY)); day[1] += 1
+        if created is None:
+            return
+        turnaround = round((closed - created) * 1000)
+        if turnaround < 0:
+            self.bad_timestamps += 1
+            return
+        day[2] += turnaround
+        self.turnaround_sum += turnaround
+        self.turnaround_min = turnaround if self.turnaround_min is None else min(self.turnaround_min, turnaround)
+        self.turnaround_max = turnaround if self.turnaround_max is None else max(self.turnaround_max, turnaround)
+        self.turnaround_counts[bisect.bisect_left(TURNAROUND_BUCKETS, turnaround / 3_600_000)] += 1
+
+    def _day(self, day: int) -> list:
+        found = self.daily.get(day)
+        if found is None:
+            found = self.daily[day] = [0, 0, 0]
+        return found
+
+    def add_tickets(self, tickets: Iterable[dict]) -> "TicketReport":
+        for ticket in tickets:
+            self.add(compact(ticket))
+        return self
+
+    def merge(self, other: "TicketReport") -> "TicketReport":
+        """Folds `other` into this report. Returns it."""
+        self.tickets += other.tickets; self.closed += other.closed; self.warranty += other.warranty; self.returns += other.returns
+        self.bad_timestamps += other.bad_timestamps; self.turnaround_sum += other.turnaround_sum
+        for bound in ("turnaround_min", "turnaround_max"):
+            mine, theirs = getattr(self, bound), getattr(other, bound)
+            if theirs is not None:
+                setattr(self, bound, theirs if mine is None else (min if bound.endswith("min") else max)(mine, theirs))
+        self.turnaround_counts = [mine + theirs for mine, theirs in zip(self.turnaround_counts, other.turnaround_counts)]
+        for assignee_id, count in other.waiting_for_part.items():
+            self.waiting_for_part[assignee_id] = self.waiting_for_part.get(assignee_id, 0) + count
+        self.assignees.update(other.assignees)
+        for day, (created, closed, turnaround) in other.daily.items():
+            mine = self._day(day)
+            mine[0] += created; mine[1] += closed; mine[2] += turnaround
+        return self
+
+    @property
+    def turnaround_count(self) -> int:
+        return sum(self.turnaround_counts)
+
+    @property
+    def mean_turnaround(self) -> float | None:
+        """Hours."""
+        return self.turnaround_sum / self.turnaround_count / 3_600_000 if self.turnaround_count else None
+
+    @property
+    def warranty_rate(self) -> float:
+        return self.warranty / self.tickets if self.tickets else 0.0
+
+    @property
+    def return_rate(self) -> float:
+        return self.returns / self.tickets if self.tickets else 0.0
+
+    def turnaround_quantile(self, q: float) -> float | None:
+        """Estimated `q` quantile (0-1) of turnaround, in hours, read off the histogram."""
+        total = self.turnaround_count
+        if not total:
+            return None
+        rank = q * total; seen = 0
+        for index, count in enumerate(self.turnaround_counts):
+            if count and seen + count >= rank:
+                lower = TURNAROUND_BUCKETS[index - 1] if index else 0
+                upper = TURNAROUND_BUCKETS[index] if index < len(TURNAROUND_BUCKETS) else self.turnaround_max / 3_600_000
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.turnaround_max / 3_600_000
+
+    def as_dict(self) -> dict:
+        from datetime import date, timedelta
+        epoch = date(1970, 1, 1)
+        return {"tickets": self.tickets, "closed": self.closed, "warranty_rate": self.warranty_rate, "return_rate": self.return_rate,
+                "turnaround_hours": {"mean": self.mean_turnaround,
+                                     "p50": self.turnaround_quantile(0.5), "p90": self.turnaround_quantile(0.9)},
+                "waiting_for_part": {self.assignees.get(assignee_id, assignee_id): count for assignee_id, count in self.waiting_for_part.items()},
+                "daily": {(epoch + timedelta(days=day)).isoformat(): {"created": created, "closed": closed,
+                                                                      "mean_turnaround_hours": turnaround / closed / 3_600_000 if closed else None}
+                          for day, (created, closed, turnaround) in sorted(self.daily.items())},
+                "bad_timestamps": self.bad_timestamps}
+
+    def __repr__(self):
+        return f"<TicketReport {self.tickets} tickets, {self.closed} closed>"
+
+
+def _tickets(page: bytes | str | dict | list) -> list[dict]:
+    if isinstance(page, (bytes, bytearray, str)):
+        page = codec.loads(page)
+    return page["tickets"] if isinstance(page, dict) else page
+
+
+def report_page(page: bytes | str | dict | list) -> TicketReport:
+    """The report over one page of tickets: a `/checkin-ticket` response body, its decoded JSON, or a list of raw tickets. Duplicates are counted once."""
+    rows, anonymous = _rows_of([page])
+    return _report_rows(rows, anonymous)
+
+
+def _rows_of(pages: list) -> tuple[dict, list]:
+    """
+    `({ticket id: (updatedAt, compact row)}, [rows of tickets without an id])` over `pages`. A ticket seen more than
+    once keeps its newest copy. This is what a worker sends back: small tuples, already parsed.
+    """
+    rows = {}; anonymous = []
+    for page in pages:
+        for ticket in _tickets(page):
+            ticket_id = ticket.get("id")
+            if ticket_id is None:
+                anonymous.append(compact(ticket))
+                continue
+            updated = ticket.get("updatedAt") or ""
+            held = rows.get(ticket_id)
+            if held is None or updated > held[0]:
+                rows[ticket_id] = (updated, compact(ticket))
+    return rows, anonymous
+
+
+def _keep_newest(rows: dict, more: dict):
+    for ticket_id, found in more.items():
+        held = rows.get(ticket_id)
+        if held is None or found[0] > held[0]:
+            rows[ticket_id] = found
+
+
+def _report_rows(rows: dict, anonymous: list) -> TicketReport:
+    report = TicketReport()
+    for _, row in rows.values():
+        report.add(row)
+    for row in anonymous:
+        report.add(row)
+    return report
+
+
+def _batches(pages: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for page in pages:
+        batch.append(page)
+        if len(batch) >= size:
+            yield batch; batch = []
+    if batch:
+        yield batch
+
+
+def run_report(pages: Iterable[bytes | str | dict | list], processes: int = None, pages_per_task: int = 4) -> TicketReport:
+    """
+    Builds a `TicketReport` over many pages of tickets on a process pool.
+
+    The API has no paging. A "page" here is simply one response, usually the whole answer to one ticket search,
+    so pages from overlapping queries share tickets. Every ticket is counted once, by `id`, using its newest
+    `updatedAt` copy. Tickets without an id can't be matched up and are all counted.
+
+    Pages are handed out `pages_per_task` at a time. Each worker decodes its pages and reduces every ticket to a
+    `compact()` row (the costly part: JSON and timestamps), and sends the rows back keyed by ticket id. The rows
+    are deduplicated and added up here. Raw response bodies are the cheapest pages to send to a worker.
+    `processes` defaults to the number of cores. With `processes=1` everything runs in this process, with no pool.
+    """
+    import os
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return _report_rows(*_rows_of(pages))
+    from concurrent.futures import ProcessPoolExecutor
+    rows = {}; anonymous = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for partial, partial_anonymous in pool.map(_rows_of, _batches(pages, pages_per_task)):
+            _keep_newest(rows, partial); anonymous += partial_anonymous
+    return _report_rows(rows, anonymous)
+
+
+def fetch_pages(client, queries: Iterable[str], closed_included: bool = True) -> Iterator[bytes]:
+    """
+    The raw `/checkin-ticket` body for each query, through a `MyRepairApp` or `SharedMyRepairApp` (see
+    `ticket_search_raw`), ready for `run_report`. There's no real paging in the API: each query is fetched whole,
+    and tickets that more than one query matches come back in each page (`run_report` counts them once). Nothing
+    is parsed here: fetching stays in this process and decoding happens in the workers.
+    """
+    for query in queries:
+        yield client.ticket_search_raw(query, closed_included)
+
+
+async def fetch_pages_async(client, queries: Iterable[str], closed_included: bool = True) -> list[bytes]:
+    """`fetch_pages` for an `AsyncMyRepairApp`. The pages are fetched concurrently, over its connection pool and rate limiter."""
+    import asyncio # deferred, see the note in api.py
+    return list(await asyncio.gather(*(client.ticket_search_raw(query, closed_included) for query in queries)))
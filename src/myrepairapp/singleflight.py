@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Collapses identical requests that are in flight at the same time into one.
+
+    The first caller for a key does the work. Anyone asking for the same key before it finishes waits for that
+    result (or exception) instead of sending their own request. Once it's done the key is forgotten, so this
+    never serves anything stale. It isn't a cache. `do()` is for threads and `do_async()` for asyncio tasks, and
+    the two don't share flights with each other.
+
+    `saved` counts the calls that got a result without a request of their own, and `leaders` the ones that made one.
+    Pass `share` to hand each follower something made from the result, such as their own copy, instead of the
+    result itself. The leader always gets the result as is.
+    """
+
+    def __init__(self):
+        self.saved = 0; self.leaders = 0
+        self._calls: dict[tuple, Future] = {}
+        self._tasks: dict[tuple, Any] = {} # (loop, key) -> asyncio.Task
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint: str, params: dict = None) -> tuple:
+        return (endpoint, tuple(sorted((params or {}).items())))
+
+    def __len__(self):
+        """Flights in the air right now."""
+        return len(self._calls) + len(self._tasks)
+
+    def do(self, key: tuple, call: Callable[[], Any], share: Callable[[Any], Any] = None):
+        """Runs `call`, unless another thread is already running it for `key`, in which case waits for theirs."""
+        with self._lock:
+            flight = self._calls.get(key)
+            follower = flight is not None
+            if follower:
+                self.saved += 1
+            else:
+                flight = self._calls[key] = Future()
+                self.leaders += 1
+        if follower:
+            return flight.result() if share is None else share(flight.result())
+        try:
+            flight.set_result(call())
+        except BaseException as error:
+            flight.set_exception(error)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return flight.result()
+
+    async def do_async(self, key: tuple, call: Callable[[], Awaitable], share: Callable[[Any], Any] = None):
+        """`do` for coroutines. `call` makes the coroutine. Cancelling one waiter doesn't cancel the request for the others."""
+        import asyncio # deferred, see the note in api.py
+        loop_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._tasks.get(loop_key)
+            follower = task is not None
+            if follower:
+                self.saved += 1
+            else:
+                task = self._tasks[loop_key] = asyncio.ensure_future(call())
+                task.add_done_callback(lambda _: self._forget(loop_key))
+                self.leaders += 1
+        result = await asyncio.shield(task)
+        return share(result) if follower and share is not None else result
+
+    def _forget(self, loop_key: tuple):
+        with self._lock:
+            self._tasks.pop(loop_key, None)
+
+    def as_dict(self) -> dict:
+        return {"saved": self.saved, "leaders": self.leaders, "in_flight": len(self)}
+
+    def __repr__(self):
+        return f"SingleFlight({self.as_dict()})"
@@ -0,0 +1,99 @@
+import codecs, json, re
+
+from . import codec
+
+_KEY = r'"{}"\s*:\s*\['
+_STRUCTURAL = re.compile(r'[{}\[\]"\\]')
+_STRING_END = re.compile(r'["\\]')
+_SEPARATOR = re.compile(r'[\s,]*')
+_decoder = json.JSONDecoder()
+
+
+class JSONArrayStream:
+    """
+    Pulls the elements of one JSON array out of a response as the bytes arrive.
+
+    `feed()` takes raw chunks and returns every element completed so far, decoded. Only one element is held
+    as text at a time, so memory stays flat however long the array is. `key` picks the array out of the top-level
+    object, such as `{"tickets": [...]}`. Leave it out if the body is the array itself.
+
+    The key is found by text match, so it's assumed that it shows up before anything else containing `"key": [`.
+    """
+
+    def __init__(self, key: str = None):
+        self._start = re.compile(_KEY.format(re.escape(key))) if key else re.compile(r'\[')
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0 # where scanning picks up next time
+        self._element = None # start of the element being read, if any
+        self._depth = 0; self._in_string = False; self._escaped = False
+        self._opened = False; self.done = False
+
+    def feed(self, chunk: bytes) -> list:
+        if self.done:
+            return []
+        self._buffer += self._decoder.decode(chunk)
+        found = []
+        if not self._opened:
+            match = self._start.search(self._buffer)
+            if match is None:
+                return found
+            self._opened = True
+            self._buffer = self._buffer[match.end():]; self._pos = 0
+        while self._scan(found):
+            pass
+        # drop what's already been decoded so the buffer only ever holds the current element
+        cut = self._element if self._element is not None else self._pos
+        self._buffer = self._buffer[cut:]; self._pos -= cut
+        if self._element is not None:
+            self._element = 0
+        return found
+
+    def close(self):
+        """Raises if the array never finished, such as when the connection dropped partway."""
+        if not self.done:
+            raise ValueError("Response ended before the JSON array did.")
+
+    def _scan(self, found: list) -> bool:
+        """Advances as far as the buffer allows. Returns True if there may be more to do."""
+        buffer = self._buffer
+        if self._element is None:
+            self._pos = _SEPARATOR.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                return False
+            if buffer[self._pos] == "]":
+                self.done = True
+                return False
+            if buffer[self._pos] not in "{[": # scalar element. let the decoder find its end
+                try:
+                    value, end = _decoder.raw_decode(buffer, self._pos)
+                except json.JSONDecodeError:
+                    return False
+                if end >= len(buffer): # a number might continue in the next chunk
+                    return False
+                found.append(value); self._pos = end
+                return True
+            self._element = self._pos
+        while True:
+            if self._escaped:
+                if self._pos >= len(buffer):
+                    return False
+                self._pos += 1; self._escaped = False
+            pattern = _STRING_END if self._in_string else _STRUCTURAL
+            match = pattern.search(buffer, self._pos)
+            if match is None:
+                self._pos = len(buffer)
+                return False
+            char = match.group(); self._pos = match.end()
+            if char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = not self._in_string
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    found.append(codec.loads(buffer[self._element:self._pos]))
+                    self._element = None
+                    return True
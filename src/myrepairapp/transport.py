@@ -0,0 +1,265 @@
+import logging, threading, time
+from typing import AsyncIterator, Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+from . import exceptions, codec
+from .ratelimit import RateLimiter
+from .instrumentation import Instrumentation, RequestRecord
+
+log = logging.getLogger(__name__)
+
+MYREPAIRAPP_LINK = "https://www.myrepairapp.com/api/v2"
+
+
+def check_status(status: int, body: bytes) -> bool:
+    """Raises the matching exception for an error status. Returns True if the request should be retried (429)."""
+    match status:
+        case 200: return False
+        case 400: raise exceptions.BadRequest(codec.loads(body))
+        case 401: raise exceptions.Forbidden()
+        case 405: raise exceptions.MethodNotAllowed()
+        case 429: return True
+        case 500: raise exceptions.InternalServerError()
+        case _ if status >= 400: raise exceptions.BaseMRAException(f"MyRepairApp responded with status code {status}.")
+    return False
+
+
+class Transport:
+    """
+    The HTTP layer shared by `MyRepairApp` and `AsyncMyRepairApp`.
+
+    Owns the API key, the status code handling and the `RateLimiter`, so both clients behave the same way.
+    The blocking side runs on one `requests.Session`, the async side on one aiohttp session. Both keep
+    connections alive between calls. The aiohttp session is created on first use, so it binds to whichever
+    event loop is running at the time.
+
+    - `limit` - Total connections the async pool may keep open.
+    - `limit_per_host` - Connections per host. MyRepairApp is one host, so this is the real cap.
+    - `keepalive_timeout` - Seconds an idle async connection stays open for reuse.
+    - `pool_size` - Connections the blocking session keeps per host. Raise it if many threads share one client.
+    - `keep_alive` - Set to False to close every blocking connection after its response.
+    - `rate_limiter` - Every request waits on this first, and 429s are retried through it. Pass one in to share a quota.
+    - `instrumentation` - Optional `Instrumentation` that times and counts every request, and every response to it.
+    """
+
+    def __init__(self, token: str, base_url: str = MYREPAIRAPP_LINK, limit: int = 100, limit_per_host: int = 10, keepalive_timeout: float = 30.0,
+                 pool_size: int = 10, keep_alive: bool = True, rate_limiter: RateLimiter = None, instrumentation: Instrumentation = None):
+        self.headers = {"X-Api-Key": token}
+        self.base_url = base_url
+        self.limit = limit; self.limit_per_host = limit_per_host; self.keepalive_timeout = keepalive_timeout
+        self.pool_size = pool_size; self.keep_alive = keep_alive
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.instrumentation = instrumentation
+        self._sync_session = None # requests.Session
+        self._session_lock = threading.Lock() # so threads racing to the first request don't each build a session
+        self._session = None # aiohttp.ClientSession
+
+    @property
+    def sync_session(self) -> "requests.Session":
+        """The pooled `requests.Session`, created the first time it's needed."""
+        if self._sync_session is not None:
+            return self._sync_session
+        with self._session_lock:
+            if self._sync_session is not None:
+                return self._sync_session
+            import requests # deferred so importing the package doesn't pay for it
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount("https://", adapter); session.mount("http://", adapter)
+            session.headers.update(self.headers)
+            if not self.keep_alive:
+                session.headers["Connection"] = "close"
+            self._sync_session = session
+        return self._sync_session
+
+    def request(self, method: str, path: str, params: dict = None, data: dict = None):
+        """Blocking request. Returns the decoded JSON body."""
+        return codec.loads(self.fetch(method, path, params, data))
+
+    def fetch(self, method: str, path: str, params: dict = None, data: dict = None) -> bytes:
+        """Blocking request. Returns the raw response body."""
+        if self.instrumentation is None:
+            return self._fetch(method, path, params, data)
+        record = self.instrumentation.request_started(method, path, params)
+        started = time.perf_counter()
+        try:
+            body = self._fetch(method, path, params, data, record)
+            record.size = len(body)
+            return body
+        except Exception as error:
+            record.error = error
+            raise
+        finally:
+            record.elapsed = time.perf_counter() - started - record.waited
+            self.instrumentation.request_finished(record)
+
+    def _fetch(self, method: str, path: str, params: dict, data: dict, record: RequestRecord = None) -> bytes:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.wait()
+            response = self.sync_session.request(method, self.base_url+path, params=params, data=data)
+            if record is not None:
+                record.responded(response.status_code, attempt, waited)
+            if not check_status(response.status_code, response.content):
+                return response.content
+            delay = self.rate_limiter.retry_delay(attempt, response.headers.get("Retry-After"), started)
+            log.warning(f"Too many requests. Trying again in {round(delay, 2)}s.")
+            time.sleep(delay)
+            if record is not None:
+                record.waited += delay
+            attempt += 1
+
+    def iter_bytes(self, method: str, path: str, params: dict = None, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Blocking request whose body is yielded in chunks as it arrives, instead of read whole."""
+        if self.instrumentation is None:
+            yield from self._iter_bytes(method, path, params, chunk_size)
+            return
+        record = self.instrumentation.request_started(method, path, params)
+        started = time.perf_counter()
+        try:
+            for chunk in self._iter_bytes(method, path, params, chunk_size, record):
+                record.size += len(chunk)
+                yield chunk
+        except Exception as error:
+            record.error = error
+            raise
+        finally:
+            record.elapsed = time.perf_counter() - started - record.waited
+            self.instrumentation.request_finished(record)
+
+    def _iter_bytes(self, method: str, path: str, params: dict, chunk_size: int, record: RequestRecord = None) -> Iterator[bytes]:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            waited = self.rate_limiter.wait()
+            with self.sync_session.request(method, self.base_url+path, params=params, stream=True) as response:
+                if record is not None:
+                    record.responded(response.status_code, attempt, waited)
+                if response.status_code == 200:
+                    yield from response.iter_content(chunk_size)
+                    return
+                body = response.content
+                if not check_status(response.status_code, body):
+                    yield body
+                    return
+                retry_after = response.headers.get("Retry-After")
+            delay = self.rate_limiter.retry_delay(attempt, retry_after, started)
+            log.warning(f"Too many requests. Trying again in {round(delay, 2)}s.")
+            time.sleep(delay)
+            if record is not None:
+                record.waited += delay
+            attempt += 1
+
+    async def session(self):
+        """The pooled aiohttp session, created on the running loop the first time it's needed."""
+        if self._session is None or self._session.closed:
+            try:
+                import aiohttp
+            except ImportError:
+                raise ImportError("AsyncMyRepairApp needs aiohttp. Install it with `pip install myrepairapp[async]`.") from None
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host, keepalive_timeout=self.keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, headers=self.headers)
+        return self._session
+
+    async def request_async(self, method: str, path: str, params: dict = None, data: dict = None):
+        """Awaitable request on the shared connection pool. Returns the decoded JSON body."""
+        return codec.loads(await self.fetch_async(method, path, params, data))
+
+    async def fetch_async(self, method: str, path: str, params: dict = None, data: dict = None) -> bytes:
+        """Awaitable request on the shared connection pool. Returns the raw response body."""
+        if self.instrumentation is None:
+            return await self._fetch_async(method, path, params, data)
+        record = self.instrumentation.request_started(method, path, params)
+        started = time.perf_counter()
+        try:
+            body = await self._fetch_async(method, path, params, data, record)
+            record.size = len(body)
+            return body
+        except Exception as error:
+            record.error = error
+            raise
+        finally:
+            record.elapsed = time.perf_counter() - started - record.waited
+            self.instrumentation.request_finished(record)
+
+    async def _fetch_async(self, method: str, path: str, params: dict, data: dict, record: RequestRecord = None) -> bytes:
+        import asyncio # deferred, see the note in api.py
+        session = await self.session()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            waited = await self.rate_limiter.wait_async()
+            async with session.request(method, self.base_url+path, params=params, data=data) as response:
+                status = response.status
+                body = await response.read()
+                retry_after = response.headers.get("Retry-After")
+            if record is not None:
+                record.responded(status, attempt, waited)
+            if not check_status(status, body):
+                return body
+            delay = self.rate_limiter.retry_delay(attempt, retry_after, started)
+            log.warning(f"Too many requests. Trying again in {round(delay, 2)}s.")
+            await asyncio.sleep(delay)
+            if record is not None:
+                record.waited += delay
+            attempt += 1
+
+    async def aiter_bytes(self, method: str, path: str, params: dict = None, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """`iter_bytes` on the shared connection pool."""
+        if self.instrumentation is None:
+            async for chunk in self._aiter_bytes(method, path, params, chunk_size):
+                yield chunk
+            return
+        record = self.instrumentation.request_started(method, path, params)
+        started = time.perf_counter()
+        try:
+            async for chunk in self._aiter_bytes(method, path, params, chunk_size, record):
+                record.size += len(chunk)
+                yield chunk
+        except Exception as error:
+            record.error = error
+            raise
+        finally:
+            record.elapsed = time.perf_counter() - started - record.waited
+            self.instrumentation.request_finished(record)
+
+    async def _aiter_bytes(self, method: str, path: str, params: dict, chunk_size: int, record: RequestRecord = None) -> AsyncIterator[bytes]:
+        import asyncio # deferred, see the note in api.py
+        session = await self.session()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            waited = await self.rate_limiter.wait_async()
+            async with session.request(method, self.base_url+path, params=params) as response:
+                if record is not None:
+                    record.responded(response.status, attempt, waited)
+                if response.status == 200:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        yield chunk
+                    return
+                body = await response.read()
+                if not check_status(response.status, body):
+                    yield body
+                    return
+                retry_after = response.headers.get("Retry-After")
+            delay = self.rate_limiter.retry_delay(attempt, retry_after, started)
+            log.warning(f"Too many requests. Trying again in {round(delay, 2)}s.")
+            await asyncio.sleep(delay)
+            if record is not None:
+                record.waited += delay
+            attempt += 1
+
+    def close(self):
+        """Closes the blocking session's pooled connections. The session is rebuilt if the transport is used again."""
+        if self._sync_session is not None:
+            self._sync_session.close()
+        self._sync_session = None
+
+    async def aclose(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from myrepairapp.transport import Transport
+from myrepairapp.ratelimit import RateLimiter
+
+
+def record(n: int, **fields) -> dict:
+    """A raw `/inventory/search` record."""
+    return {"id": f"inv_{n}", "sku": f"SKU-{n}", "name": f"Screen {n}", "manufacturer": "Apple", "type": "Part - Phone", "category": "Part",
+            "condition": "New", "instock": 5, "price": 10.0, "cost": 4.0, "bin": "A1", "updatedAt": "2025-01-01T00:00:00.000Z"} | fields
+
+
+def raw_ticket(n: int, **fields) -> dict:
+    """A raw `/checkin-ticket` record, with every key the API sends."""
+    from myrepairapp.checkin_ticket import FIELD_WIRE_NAMES
+    return dict.fromkeys(FIELD_WIRE_NAMES.values()) | {
+        "id": f"tic_{n}", "ticketNumber": 1000 + n, "active": True, "status": "Open", "isWarranty": False, "isReturn": False,
+        "customerPossession": False, "waitingForPart": False, "createdAt": "2025-01-01T00:00:00.000Z", "updatedAt": "2025-01-01T00:00:00.000Z",
+        "checkinItems": [], "checkinDevices": [], "checkinPayments": [], "checkinNotes": [], "myProtectionPlans": [],
+        "checkinTicketActivities": [{"id": f"act_{n}", "checkinTicketId": f"tic_{n}", "userId": "usr_1", "type": "CREATION", "metadata": {},
+                                     "createdAt": "2025-01-01T00:00:00.000Z"}],
+    } | fields
+
+
+class FakeTransport(Transport):
+    """
+    A `Transport` that answers from `routes` instead of the network: `(method, path)` -> a body (bytes or anything
+    JSON-able), or a callable taking `(params, data)` that returns one. Every call is kept in `calls`.
+    """
+
+    def __init__(self, routes: dict = None, **kwargs):
+        super().__init__("test-key", "http://test", rate_limiter=kwargs.pop("rate_limiter", RateLimiter(rate=1e6, burst=1e6)), **kwargs)
+        self.routes = routes or {}
+        self.calls = []
+
+    def _answer(self, method: str, path: str, params: dict, data: dict) -> bytes:
+        self.calls.append((method, path, params, data))
+        body = self.routes[(method, path)]
+        if callable(body):
+            body = body(params, data)
+        return body if isinstance(body, bytes) else json.dumps(body).encode()
+
+    def _fetch(self, method, path, params, data, record=None):
+        return self._answer(method, path, params, data)
+
+    async def _fetch_async(self, method, path, params, data, record=None):
+        return self._answer(method, path, params, data)
+
+
+@pytest.fixture
+def transport() -> FakeTransport:
+    return FakeTransport()
@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from myrepairapp.api import SharedMyRepairApp
+from myrepairapp.background import LoopThread
+
+from .conftest import FakeTransport, record
+
+
+async def _answer(value):
+    return value
+
+
+def test_loop_thread_runs_coroutines_from_any_thread():
+    loop_thread = LoopThread()
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda n=n: results.append(loop_thread.run(_answer(n)))) for n in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        assert sorted(results) == list(range(8))
+    finally:
+        loop_thread.stop()
+    assert not loop_thread.running
+    with pytest.raises(RuntimeError):
+        loop_thread.run(_answer(1))
+
+
+def test_blocking_on_the_loop_from_inside_it_raises():
+    loop_thread = LoopThread()
+
+    async def nested():
+        loop_thread.run(_answer(1))
+    try:
+        with pytest.raises(RuntimeError, match="inside it"):
+            loop_thread.run(nested(), timeout=5)
+    finally:
+        loop_thread.stop()
+
+
+def test_shared_client_answers_every_thread_from_one_loop():
+    transport = FakeTransport({("GET", "/inventory/search"): [record(1), record(2)]})
+    with SharedMyRepairApp("test-key", transport=transport) as mrp:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(mrp.inventory_search("Screen"))) for _ in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+        assert len(results) == 8 and all([item.name for item in result] == ["Screen 1", "Screen 2"] for result in results)
+        assert len({id(result[0]) for result in results}) == 8 # each caller gets its own items
+        assert 1 <= len(transport.calls) <= 8
+    assert not mrp.loop_thread.running
+
+
+def test_shared_client_called_from_its_own_loop_raises():
+    transport = FakeTransport({("GET", "/inventory/search"): [record(1)]})
+    with SharedMyRepairApp("test-key", transport=transport, timeout=5) as mrp:
+        async def hook():
+            mrp.inventory_search("Screen")
+        with pytest.raises(RuntimeError, match="inside it"):
+            mrp.loop_thread.run(hook(), timeout=5)
+        assert mrp.inventory_search("Screen")[0].name == "Screen 1" # still usable afterwards
@@ -0,0 +1,52 @@
+from myrepairapp.api import MyRepairApp
+from myrepairapp.bulk import BulkUpdater
+from myrepairapp.mirror import InventoryMirror
+
+from .conftest import FakeTransport, record
+
+
+def client(records: list, mirror: InventoryMirror = None) -> tuple[MyRepairApp, FakeTransport]:
+    routes = {("GET", "/inventory/search"): records} | {("PATCH", f"/inventory/{raw['id']}"): {} for raw in records}
+    transport = FakeTransport(routes)
+    return MyRepairApp("test-key", transport=transport, mirror=mirror), transport
+
+
+def patches(transport: FakeTransport) -> list:
+    return [(path, data) for method, path, params, data in transport.calls if method == "PATCH"]
+
+
+def test_update_items_only_sends_fields_that_changed_from_the_mirror_copy():
+    mrp, transport = client([record(1), record(2)], InventoryMirror())
+    first, second = mrp.inventory_search("Screen")
+    results = mrp.update_items([(first, {"in_stock": 5, "bin": "B2"}), (second, {"in_stock": 5})])
+    assert patches(transport) == [("/inventory/inv_1", {"bin": "B2"})]
+    assert results[0].sent == {"bin": "B2"} and results[1].skipped
+
+
+def test_editing_the_item_before_queueing_it_still_sends_the_change():
+    for mirror in (InventoryMirror(), None):
+        mrp, transport = client([record(1)], mirror)
+        item = mrp.inventory_search("Screen")[0]
+        item.in_stock = 9
+        results = mrp.update_items([(item, {"in_stock": 9})])
+        assert patches(transport) == [("/inventory/inv_1", {"instock": 9})]
+        assert not results[0].skipped
+
+
+def test_tracked_items_are_diffed_against_their_snapshot():
+    mrp, transport = client([record(1)])
+    item = mrp.inventory_search("Screen")[0]
+    updater = BulkUpdater(mrp)
+    updater.track([item])
+    updater.queue(item, {"in_stock": 5, "bin": "C3"})
+    updater.flush()
+    updater.queue(item, {"bin": "C3"}) # already sent
+    assert updater.flush()[0].skipped
+    assert patches(transport) == [("/inventory/inv_1", {"bin": "C3"})]
+
+
+def test_update_items_writes_through_to_the_mirror():
+    mrp, transport = client([record(1)], InventoryMirror())
+    mrp.update_items([(mrp.inventory_search("Screen")[0], {"in_stock": 0})])
+    assert mrp.inventory_search("Screen")[0].in_stock == 0
+    assert mrp.mirror.get("inv_1").in_stock == 0
@@ -0,0 +1,61 @@
+from myrepairapp.api import MyRepairApp
+from myrepairapp.cache import ResponseCache
+
+from .conftest import FakeTransport, record
+
+
+def cached_client(records: list) -> tuple[MyRepairApp, FakeTransport]:
+    transport = FakeTransport({("GET", "/inventory/search"): records, ("PATCH", "/inventory/inv_1"): {}})
+    return MyRepairApp("test-key", transport=transport, cache=ResponseCache()), transport
+
+
+def test_repeat_search_is_a_cache_hit():
+    mrp, transport = cached_client([record(1)])
+    mrp.inventory_search("Screen"); mrp.inventory_search("Screen")
+    assert len(transport.calls) == 1 and mrp.cache.stats.hits == 1
+
+
+def test_editing_a_result_does_not_change_what_the_cache_hands_out():
+    mrp, transport = cached_client([record(1)])
+    mrp.inventory_search("Screen")[0].name = "Edited"
+    hit = mrp.inventory_search("Screen")[0]
+    assert hit.name == "Screen 1"
+    hit.in_stock = 0
+    assert mrp.inventory_search("Screen")[0].in_stock == 5
+    lazy = mrp.inventory_search("Screen", lazy=True)[0]
+    lazy.name = "Edited"
+    assert mrp.inventory_search("Screen", lazy=True)[0].name == "Screen 1"
+
+
+def test_update_item_invalidates_cached_results_containing_the_item():
+    mrp, transport = cached_client([record(1), record(2)])
+    mrp.update_item(mrp.inventory_search("Screen")[0], {"in_stock": 9})
+    mrp.inventory_search("Screen")
+    assert [call[0] for call in transport.calls] == ["GET", "PATCH", "GET"]
+    assert mrp.cache.stats.invalidations == 1
+
+
+def test_entries_expire_and_least_recently_used_are_evicted():
+    cache = ResponseCache(max_entries=2, ttl=30, ttls={"/short": 0})
+    cache.set("/short", {}, ["x"])
+    assert cache.get("/short") == (False, None) and cache.stats.expirations == 1
+    cache.set("/a", {}, [1]); cache.set("/b", {}, [2])
+    cache.get("/a")
+    cache.set("/c", {}, [3])
+    assert cache.get("/b") == (False, None) and cache.get("/a") == (True, [1])
+
+
+def test_a_lone_uncached_search_copies_nothing(monkeypatch):
+    import copy
+    copies = []
+    real = copy.copy
+    monkeypatch.setattr(copy, "copy", lambda obj: copies.append(obj) or real(obj))
+    transport = FakeTransport({("GET", "/inventory/search"): [record(1), record(2)]})
+    MyRepairApp("test-key", transport=transport).inventory_search("Screen")
+    assert copies == []
+
+
+def test_the_first_callers_edits_do_not_reach_the_cache():
+    mrp, transport = cached_client([record(1)])
+    mrp.inventory_search("Screen")[0].name = "Edited"
+    assert mrp.inventory_search("Screen")[0].name == "Screen 1"
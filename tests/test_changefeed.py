@@ -0,0 +1,40 @@
+from myrepairapp.api import MyRepairApp
+from myrepairapp.changefeed import ADDED, CHANGED, ChangeFeed
+
+from .conftest import FakeTransport, record
+
+
+def feed_over(pages: list) -> ChangeFeed:
+    """A feed over inventory whose successive polls answer with `pages`."""
+    answers = iter(pages)
+    transport = FakeTransport({("GET", "/inventory/search"): lambda params, data: next(answers)})
+    return ChangeFeed(MyRepairApp("test-key", transport=transport), ticket_query=None, inventory_query="")
+
+
+def ids(events) -> list[tuple[str, str]]:
+    return [(event.kind, event.record.item_id) for event in events]
+
+
+def test_records_sharing_the_watermark_timestamp_are_not_dropped():
+    same = "2025-01-02T00:00:00.000Z"
+    feed = feed_over([[record(1, updatedAt=same)], [record(1, updatedAt=same), record(2, updatedAt=same)],
+                      [record(1, updatedAt=same), record(2, updatedAt=same)]])
+    assert ids(feed.poll()) == [(ADDED, "inv_1")]
+    assert ids(feed.poll()) == [(ADDED, "inv_2")] # inv_2 showed up late with the same timestamp
+    assert feed.poll() == []
+
+
+def test_older_records_are_skipped_and_newer_ones_reported():
+    feed = feed_over([[record(1), record(2)], [record(1), record(2, updatedAt="2025-02-01T00:00:00.000Z", name="New")]])
+    feed.poll()
+    assert ids(feed.poll()) == [(CHANGED, "inv_2")]
+    assert feed.inventory["inv_2"].name == "New"
+
+
+def test_records_without_updated_at_are_compared_by_content():
+    feed = feed_over([[record(1), record(2, updatedAt=None)], [record(1), record(2, updatedAt=None)],
+                      [record(1), record(2, updatedAt=None, instock=1)]])
+    assert len(feed.poll()) == 2
+    assert feed.poll() == []
+    events = feed.poll()
+    assert ids(events) == [(CHANGED, "inv_2")] and events[0].record.in_stock == 1
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from myrepairapp import codec
+from myrepairapp.checkin_ticket import ticket_from_json
+from myrepairapp.inventory_item import item_from_json
+
+from .conftest import raw_ticket, record
+
+
+@pytest.fixture(params=["typed", "json"])
+def backend(request, monkeypatch):
+    """Decodes with msgspec's typed schemas, then with plain json and the `*_from_json` builders."""
+    monkeypatch.setattr(codec, "_backend", None); monkeypatch.setattr(codec, "_typed", True)
+    if request.param == "typed":
+        pytest.importorskip("msgspec")
+        assert codec.use("msgspec").typed
+    else:
+        codec.use("json")
+    return request.param
+
+
+def fields(model) -> dict:
+    """Every public slot of a model, with nested models (such as ticket activities) read the same way."""
+    value = lambda v: [fields(e) if hasattr(e, "__slots__") else e for e in v] if isinstance(v, list) else v
+    return {name: value(getattr(model, name)) for name in model.__slots__ if not name.startswith("_")}
+
+
+def items() -> list[dict]:
+    full = record(1, storeId="sto_1", supplierId="sup_1", createdAt="2024-12-01T00:00:00.000Z", note="n", serialized=True, active=True,
+                  serialNum="SN1", carrier="AT&T", color="Black", storage="128GB", tradeInCondition="Used", tradeInStatus="Open",
+                  additionalInfo={"a": 1}, isRebate=False, taxFree=True, groupingId="g", repairProvider="r", isMotorolaSku=False,
+                  pulled=1, ordered=2, backOrdered=3, skuPulled=4, skuInstock=5, somethingNew="ignored")
+    sparse = {"id": "inv_2", "name": "Sparse"} # everything else missing
+    odd = record(3, condition="Not a condition", category=None, type="Part - Unknown")
+    return [full, sparse, odd]
+
+
+def test_typed_inventory_decoding_matches_item_from_json(backend):
+    decoded = codec.decode_inventory(json.dumps(items()).encode())
+    assert [fields(item) for item in decoded] == [fields(item_from_json(raw)) for raw in items()]
+
+
+def test_typed_ticket_decoding_matches_ticket_from_json(backend):
+    tickets = [raw_ticket(1, checkinItems=[{"id": "line_1", "quantity": 2, "inventoryItem": record(1)}], customer={"id": "cus_1"}),
+               raw_ticket(2, checkinTicketActivities=[], somethingNew="ignored")]
+    decoded = codec.decode_tickets(json.dumps({"tickets": tickets}).encode())
+    assert [fields(ticket) for ticket in decoded] == [fields(ticket_from_json(raw)) for raw in tickets]
+
+
+@pytest.mark.parametrize("broken", [lambda ticket: ticket.pop("orgId"), lambda ticket: ticket["checkinTicketActivities"][0].pop("userId")])
+def test_a_missing_ticket_key_raises_key_error_on_every_backend(backend, broken):
+    ticket = raw_ticket(1); broken(ticket)
+    with pytest.raises(KeyError):
+        codec.decode_tickets(json.dumps({"tickets": [ticket]}).encode())
+
+
+def test_missing_tickets_list_raises_key_error_on_every_backend(backend):
+    with pytest.raises(KeyError):
+        codec.decode_tickets(b"{}")
+
+
+def test_activities_null_fails_the_same_on_every_backend(backend):
+    with pytest.raises(TypeError):
+        codec.decode_tickets(json.dumps({"tickets": [raw_ticket(1, checkinTicketActivities=None)]}).encode())
+
+
+def test_typed_false_uses_the_plain_decoders(monkeypatch):
+    pytest.importorskip("msgspec")
+    monkeypatch.setattr(codec, "_backend", None); monkeypatch.setattr(codec, "_typed", True)
+    codec.use("msgspec", typed=False)
+    monkeypatch.setattr(codec, "_schemas", None) # would fail if called
+    assert [item.name for item in codec.decode_inventory(json.dumps([record(1)]).encode())] == ["Screen 1"]
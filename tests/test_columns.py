@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from myrepairapp import columns as columns_module
+from myrepairapp.columns import InventoryColumns
+from myrepairapp.inventory_item import InventoryItemCategory, item_from_json
+
+from .conftest import record
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Runs a test once on the pure-Python paths and once on NumPy, which should give the same answers."""
+    if request.param == "numpy":
+        monkeypatch.setattr(columns_module, "_numpy", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(columns_module, "_numpy", False)
+    return request.param
+
+
+def records() -> list[dict]:
+    return [record(1, price=10.0, cost=4.0, instock=2), record(2, category="Device", type="Device - Phone", price=100.0, cost=60.0, instock=1),
+            record(3, price=None, cost=1.5, instock=7), record(4, category=None, price=5.0, instock=3),
+            record(5, category="Accessory", type="Accessory - Case", price=8.0, instock=None, bin="B2")]
+
+
+def test_from_items_and_from_records_agree():
+    from_records = InventoryColumns.from_records(records())
+    from_items = InventoryColumns.from_items([item_from_json(raw) for raw in records()])
+    for field in ("in_stock", "category", "type", "condition", "sku", "bin"):
+        assert list(from_records[field]) == list(from_items[field])
+    assert [math.isnan(value) for value in from_records["price"]] == [False, False, True, False, False]
+    assert list(from_records["in_stock"]) == [2, 1, 7, 3, 0]
+    assert from_records.labels("category")[3] is None
+
+
+def test_sum_skips_missing_values(backend):
+    columns = InventoryColumns.from_records(records())
+    assert columns.sum("price") == 123.0 and columns.sum("in_stock") == 13.0
+    assert columns.sum("price", by="category") == {InventoryItemCategory.PART: 10.0, InventoryItemCategory.DEVICE: 100.0,
+                                                   InventoryItemCategory.ACCESSORY: 8.0}
+
+
+def test_group_sum_leaves_out_rows_without_the_group(backend):
+    grouped = InventoryColumns.from_records(records()).group_sum("category", ("cost", "in_stock"))
+    assert list(grouped) == [InventoryItemCategory.PART, InventoryItemCategory.DEVICE, InventoryItemCategory.ACCESSORY]
+    assert grouped[InventoryItemCategory.PART] == {"cost": 5.5, "in_stock": 9.0}
+    assert grouped[InventoryItemCategory.DEVICE] == {"cost": 60.0, "in_stock": 1.0}
+
+
+def test_stock_value(backend):
+    columns = InventoryColumns.from_records(records())
+    assert columns.stock_value() == 20.0 + 100.0 + 0.0 + 15.0 + 0.0
+    assert columns.stock_value(basis="cost") == 8.0 + 60.0 + 10.5 + 12.0 + 0.0
+    assert columns.stock_value(by="category") == {InventoryItemCategory.PART: 20.0, InventoryItemCategory.DEVICE: 100.0,
+                                                  InventoryItemCategory.ACCESSORY: 0.0}
+
+
+def test_mask_and_filter_select_the_same_rows(backend):
+    columns = InventoryColumns.from_records(records())
+    mask = columns.mask(category=[InventoryItemCategory.PART, InventoryItemCategory.ACCESSORY], bin="A1")
+    assert mask == [True, False, True, False, False]
+    parts = columns.filter(mask)
+    assert len(parts) == 2 and parts["sku"] == ["SKU-1", "SKU-3"]
+    assert list(parts["in_stock"]) == [2, 7] and parts.labels("category") == [InventoryItemCategory.PART] * 2
+    assert parts.numeric["price"].typecode == "d" and parts.codes["type"].typecode == "h"
+    assert len(columns.where(sku="nope")) == 0 and len(columns.where(category=InventoryItemCategory.DEVICE)) == 1
+
+
+def test_empty_columns(backend):
+    columns = InventoryColumns.from_records([])
+    assert columns.sum("price") == 0.0 and columns.stock_value() == 0.0 and columns.group_sum("category") == {}
+    assert len(columns.filter([])) == 0
+
+
+def test_unknown_column_names_the_real_ones():
+    with pytest.raises(KeyError, match="in_stock"):
+        InventoryColumns.from_records(records())["stock"]
@@ -0,0 +1,72 @@
+from myrepairapp.api import MyRepairApp
+from myrepairapp.customer import CustomerIdentityMap
+from myrepairapp.hydrate import IdentityMap
+
+from .conftest import FakeTransport
+
+
+def customer(n: int, **fields) -> dict:
+    return {"id": f"cus_{n}", "firstName": "Pat", "lastName": f"Customer {n}", "updatedAt": "2025-01-01T00:00:00.000Z"} | fields
+
+
+def test_entries_expire_after_their_ttl():
+    customers = CustomerIdentityMap(ttl=0)
+    customers.put(customer(1))
+    assert customers.get("cus_1") is None
+    assert customers.stats.expirations == 1 and len(customers) == 1 # kept for an in-place refresh
+
+
+def test_least_recently_used_entries_are_evicted():
+    customers = CustomerIdentityMap(max_entries=2)
+    customers.put(customer(1)); customers.put(customer(2))
+    customers.get("cus_1")
+    customers.put(customer(3))
+    assert "cus_1" in customers and "cus_2" not in customers and "cus_3" in customers
+    assert customers.stats.evictions == 1
+
+
+def test_newer_copy_refreshes_the_shared_object_in_place():
+    customers = CustomerIdentityMap(ttl=0)
+    held = customers.put(customer(1))
+    assert customers.put(customer(1, lastName="Renamed", updatedAt="2025-02-01T00:00:00.000Z")) is held
+    assert held.last_name == "Renamed" and customers.stats.refreshes == 1
+
+
+def test_older_copy_does_not_roll_the_customer_back():
+    customers = CustomerIdentityMap()
+    held = customers.put(customer(1, lastName="Current", updatedAt="2025-02-01T00:00:00.000Z"))
+    assert customers.put(customer(1, lastName="Old")) is held
+    assert held.last_name == "Current" and customers.stats.stale == 1
+
+
+def test_customers_without_an_id_are_not_held():
+    customers = CustomerIdentityMap()
+    first = customers.put({"firstName": "Ann"}); second = customers.put({"firstName": "Bob"})
+    assert (first.first_name, second.first_name) == ("Ann", "Bob")
+    assert len(customers) == 0
+
+
+def test_hydrating_does_not_count_as_customer_lookups():
+    customers = CustomerIdentityMap()
+    held = customers.put(customer(1))
+    identities = IdentityMap(customers)
+    identities._merge_customers([customer(1), customer(2)])
+    assert identities.customers["cus_1"] is held
+    assert (customers.stats.hits, customers.stats.misses) == (0, 0)
+
+
+def test_clients_only_share_customers_with_the_same_key():
+    transport = FakeTransport({("GET", "/customer/cus_1"): customer(1)})
+    first = MyRepairApp("key-a", transport=transport).get_customer("cus_1")
+    assert MyRepairApp("key-a", transport=transport).get_customer("cus_1") is first
+    assert len(transport.calls) == 1
+    other = MyRepairApp("key-b", transport=transport).get_customer("cus_1")
+    assert other is not first and len(transport.calls) == 2 # key B has to ask the API itself
+
+
+def test_sharing_across_keys_is_opt_in():
+    transport = FakeTransport({("GET", "/customer/cus_1"): customer(1)})
+    customers = CustomerIdentityMap()
+    first = MyRepairApp("key-a", transport=transport, customers=customers).get_customer("cus_1")
+    assert MyRepairApp("key-b", transport=transport, customers=customers).get_customer("cus_1") is first
+    assert len(transport.calls) == 1
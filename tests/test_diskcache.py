@@ -0,0 +1,95 @@
+import asyncio, json, sqlite3, threading, time
+
+from myrepairapp.api import AsyncMyRepairApp, MyRepairApp
+from myrepairapp.diskcache import DiskCache
+
+from .conftest import FakeTransport, record
+
+
+def test_fresh_stale_and_expired(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"), ttl=60, ttls={"/stale": 0}, max_stale=60)
+    cache.set("/fresh", {"query": "a"}, b"[1]"); cache.set("/stale", {}, b"[2]")
+    time.sleep(0.01)
+    assert cache.get("/fresh", {"query": "a"}) == (b"[1]", True)
+    assert cache.get("/fresh", {"query": "b"}) == (None, False)
+    assert cache.get("/stale") == (b"[2]", False)
+    cache.max_stale = 0
+    assert cache.get("/stale") == (None, False)
+    assert (cache.stats.hits, cache.stats.stale_hits, cache.stats.misses) == (1, 1, 2)
+
+
+def test_least_recently_read_are_evicted_past_max_bytes(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"), max_bytes=20)
+    cache.set("/a", {}, b"x" * 8); time.sleep(0.01)
+    cache.set("/b", {}, b"x" * 8); time.sleep(0.01)
+    cache.get("/a"); time.sleep(0.01)
+    cache.set("/c", {}, b"x" * 8)
+    assert cache.get("/b")[0] is None and cache.get("/a")[0] is not None
+    assert cache.size == 16 and cache.stats.evictions == 1
+
+
+def test_invalidate_id_drops_every_body_mentioning_the_item(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    cache.set("/inventory/search", {"query": "a"}, json.dumps([record(1), record(2)]).encode())
+    cache.set("/inventory/search", {"query": "b"}, json.dumps([record(2)]).encode())
+    cache.set("/inventory/search", {"query": "c"}, json.dumps([record(11)]).encode())
+    cache.invalidate_id("inv_1")
+    assert [cache.get("/inventory/search", {"query": query})[0] is None for query in "abc"] == [True, False, False]
+
+
+def test_processes_sharing_a_file_see_each_others_bodies(tmp_path):
+    path = str(tmp_path / "cache.db")
+    DiskCache(path).set("/a", {}, b"[]")
+    assert DiskCache(path).get("/a") == (b"[]", True)
+
+
+def test_client_serves_stale_bodies_and_refetches_them_in_the_background(tmp_path):
+    answers = iter([[record(1)], [record(1, name="New")]])
+    transport = FakeTransport({("GET", "/inventory/search"): lambda params, data: next(answers)})
+    cache = DiskCache(str(tmp_path / "cache.db"), ttl=0)
+    mrp = MyRepairApp("test-key", transport=transport, disk_cache=cache, coalesce=False)
+    mrp.inventory_search("Screen"); time.sleep(0.01)
+    assert mrp.inventory_search("Screen")[0].name == "Screen 1" # stale, served at once
+    cache.close() # waits for the refetch
+    assert len(transport.calls) == 2 and cache.stats.revalidations == 1
+    assert json.loads(cache.get("/inventory/search", {"query": "Screen"})[0])[0]["name"] == "New"
+
+
+def test_update_item_invalidates_the_disk_cache(tmp_path):
+    transport = FakeTransport({("GET", "/inventory/search"): [record(1)], ("PATCH", "/inventory/inv_1"): {}})
+    mrp = MyRepairApp("test-key", transport=transport, disk_cache=DiskCache(str(tmp_path / "cache.db")))
+    mrp.update_item(mrp.inventory_search("Screen")[0], {"in_stock": 1})
+    mrp.inventory_search("Screen")
+    assert [call[0] for call in transport.calls] == ["GET", "PATCH", "GET"]
+
+
+def test_a_locked_database_falls_through_to_the_api(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = DiskCache(path, busy_timeout=0.01)
+    cache.set("/inventory/search", {"query": "Screen"}, json.dumps([record(1)]).encode())
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN EXCLUSIVE") # another process writing past busy_timeout
+    transport = FakeTransport({("GET", "/inventory/search"): [record(2)]})
+    mrp = MyRepairApp("test-key", transport=transport, disk_cache=cache, coalesce=False)
+    try:
+        assert [item.name for item in mrp.inventory_search("Screen")] == ["Screen 2"]
+    finally:
+        holder.execute("ROLLBACK"); holder.close()
+    assert len(transport.calls) == 1 and cache.stats.errors == 2 # the read's accessed_at update, then the store
+
+
+def test_async_client_reads_and_writes_the_disk_cache_off_the_loop(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.db"))
+    threads = []
+    get, set_ = cache.get, cache.set
+    cache.get = lambda *args: threads.append(threading.current_thread()) or get(*args)
+    cache.set = lambda *args: threads.append(threading.current_thread()) or set_(*args)
+    transport = FakeTransport({("GET", "/inventory/search"): [record(1)]})
+
+    async def main():
+        mrp = AsyncMyRepairApp("test-key", transport=transport, disk_cache=cache, coalesce=False)
+        await mrp.inventory_search("Screen"); await mrp.inventory_search("Screen")
+        return threading.current_thread()
+    loop_thread = asyncio.run(main())
+    assert len(threads) == 3 and loop_thread not in threads
+    assert len(transport.calls) == 1
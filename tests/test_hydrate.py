@@ -0,0 +1,37 @@
+from myrepairapp.checkin_ticket import CheckinLine, ticket_from_json
+from myrepairapp.hydrate import IdentityMap, hydrate
+from myrepairapp.inventory_item import InventoryItem
+
+from .conftest import raw_ticket, record
+
+
+def lines(n: int) -> list[dict]:
+    return [{"id": f"line_{n}_a", "quantity": 2, "price": 19.5, "inventoryItem": record(1)},
+            {"id": f"line_{n}_b", "quantity": 1, "price": 5.0, "inventoryItem": record(2)},
+            {"id": f"line_{n}_c", "quantity": 1, "price": 40.0, "name": "Labor"},
+            {"id": f"line_{n}_d", "quantity": 3, "price": 1.0, "inventoryItem": record(1)}]
+
+
+def test_every_line_is_kept_with_its_own_fields():
+    ticket, = hydrate([ticket_from_json(raw_ticket(1, checkinItems=lines(1)))])
+    assert len(ticket.checkinItems) == 4 and all(isinstance(line, CheckinLine) for line in ticket.checkinItems)
+    assert [(line.line_id, line.quantity, line.price) for line in ticket.checkinItems] == \
+        [("line_1_a", 2, 19.5), ("line_1_b", 1, 5.0), ("line_1_c", 1, 40.0), ("line_1_d", 3, 1.0)]
+    labor = ticket.checkinItems[2]
+    assert labor.item is None and labor.raw["name"] == "Labor"
+    assert isinstance(ticket.checkinItems[0].item, InventoryItem)
+
+
+def test_items_are_built_once_and_shared_between_lines_and_tickets():
+    identity = IdentityMap()
+    first, second = hydrate([ticket_from_json(raw_ticket(1, checkinItems=lines(1))), ticket_from_json(raw_ticket(2, checkinItems=lines(2)))], identity)
+    assert first.checkinItems[0].item is first.checkinItems[3].item is second.checkinItems[0].item
+    assert len(identity.items) == 2 and identity.built == 2
+
+
+def test_hydrating_twice_changes_nothing():
+    ticket, = hydrate([ticket_from_json(raw_ticket(1, checkinItems=lines(1)))])
+    before = list(ticket.checkinItems)
+    hydrate([ticket])
+    assert ticket.checkinItems == before
+    assert "Labor" in repr(ticket)
@@ -0,0 +1,46 @@
+from myrepairapp.instrumentation import Instrumentation
+from myrepairapp.ratelimit import RateLimiter
+from myrepairapp.transport import Transport
+
+
+class Response:
+    def __init__(self, status_code: int, content: bytes = b"[]", headers: dict = None):
+        self.status_code = status_code; self.content = content; self.headers = headers or {}
+
+
+class Session:
+    """Stands in for `requests.Session`, answering with `responses` in turn."""
+
+    def __init__(self, *responses: Response):
+        self.responses = list(responses)
+
+    def request(self, method, url, params=None, data=None):
+        return self.responses.pop(0)
+
+
+def transport_answering(*responses: Response) -> tuple[Transport, Instrumentation]:
+    instrumentation = Instrumentation()
+    transport = Transport("test-key", "http://test", rate_limiter=RateLimiter(rate=1e6, burst=1e6, base_delay=0.01), instrumentation=instrumentation)
+    transport._sync_session = Session(*responses)
+    return transport, instrumentation
+
+
+def test_retried_statuses_are_counted():
+    transport, instrumentation = transport_answering(Response(429, headers={"Retry-After": "0.05"}), Response(429), Response(200))
+    records = []
+    instrumentation.add_hook(after=records.append)
+    assert transport.fetch("GET", "/inventory/search") == b"[]"
+    assert records[0].statuses == [429, 429, 200] and records[0].status == 200 and records[0].retries == 2
+    assert instrumentation.statuses[("/inventory/search", 429)] == 2
+    assert instrumentation.statuses[("/inventory/search", 200)] == 1
+    assert 'status="429"} 2' in instrumentation.prometheus()
+
+
+def test_backoff_is_reported_as_waiting_not_latency():
+    transport, instrumentation = transport_answering(Response(429, headers={"Retry-After": "0.2"}), Response(200))
+    records = []
+    instrumentation.add_hook(after=records.append)
+    transport.fetch("GET", "/inventory/search")
+    assert records[0].waited >= 0.2
+    assert records[0].elapsed < 0.1
+    assert instrumentation.wait["/inventory/search"].count == 1
@@ -0,0 +1,89 @@
+import pytest
+
+from myrepairapp.api import MyRepairApp
+from myrepairapp.mirror import InventoryMirror
+
+from .conftest import FakeTransport, record
+
+
+def client_with_mirror(records: list) -> tuple[MyRepairApp, InventoryMirror, FakeTransport]:
+    transport = FakeTransport({("GET", "/inventory/search"): records, ("PATCH", "/inventory/inv_1"): lambda params, data: records[0] | data})
+    mirror = InventoryMirror()
+    return MyRepairApp("test-key", transport=transport, mirror=mirror), mirror, transport
+
+
+def test_update_item_writes_through_to_the_mirror():
+    mrp, mirror, transport = client_with_mirror([record(1), record(2)])
+    item = mrp.inventory_search("Screen")[0]
+    mrp.update_item(item, {"in_stock": 9, "bin": "Z9"})
+    held = mirror.get("inv_1")
+    assert (held.in_stock, held.bin) == (9, "Z9")
+    assert mirror.find(bin="Z9")[0].item_id == "inv_1"
+
+
+def test_update_item_without_a_returned_item_still_updates_the_mirror():
+    mrp, mirror, transport = client_with_mirror([record(1)])
+    transport.routes[("PATCH", "/inventory/inv_1")] = {}
+    mrp.update_item(mrp.inventory_search("Screen")[0], {"name": "Renamed"})
+    assert mirror.get("inv_1").name == "Renamed"
+    assert [item.item_id for item in mirror.search("Renamed")] == ["inv_1"]
+
+
+def test_repeat_search_is_answered_from_the_mirror_while_fresh():
+    mrp, mirror, transport = client_with_mirror([record(1), record(2)])
+    mrp.inventory_search("Screen")
+    assert [item.item_id for item in mrp.inventory_search("Screen")] == ["inv_1", "inv_2"]
+    assert len(transport.calls) == 1
+
+
+def test_stale_search_goes_back_to_the_api():
+    mrp, mirror, transport = client_with_mirror([record(1)])
+    mirror.max_age = 0
+    mrp.inventory_search("Screen"); mrp.inventory_search("Screen")
+    assert len(transport.calls) == 2
+
+
+def test_partial_local_match_does_not_answer_a_new_query():
+    # inv_1 matches "Screen" locally, but the mirror was never told what the API answers "Screen" with
+    mrp, mirror, transport = client_with_mirror([record(1), record(2)])
+    mirror.upsert([record(1)])
+    assert len(mrp.inventory_search("Screen")) == 2
+    assert len(transport.calls) == 1
+
+
+def test_search_is_refetched_when_an_item_has_left_the_mirror():
+    mrp, mirror, transport = client_with_mirror([record(1), record(2)])
+    mrp.inventory_search("Screen")
+    mirror.discard("inv_2")
+    assert len(mrp.inventory_search("Screen")) == 2
+    assert len(transport.calls) == 2
+
+
+def test_mirror_answers_respect_lazy():
+    from myrepairapp.lazy import LazyInventoryItem
+    mrp, mirror, transport = client_with_mirror([record(1)])
+    assert isinstance(mrp.inventory_search("Screen", lazy=True)[0], LazyInventoryItem)
+    local = mrp.inventory_search("Screen", lazy=True)
+    assert isinstance(local[0], LazyInventoryItem) and local[0].name == "Screen 1"
+    assert len(transport.calls) == 1
+
+
+def test_find_by_enum_matches_the_stored_wire_strings():
+    from myrepairapp.inventory_item import InventoryItemCategory, InventoryItemType
+    mirror = InventoryMirror()
+    mirror.upsert([record(1), record(2, type="Repair - Phone", category="Repair")])
+    assert [item.item_id for item in mirror.find(item_type=InventoryItemType.PartItem.PHONE)] == ["inv_1"]
+    assert [item.item_id for item in mirror.find(category=InventoryItemCategory.REPAIR)] == ["inv_2"]
+    assert [item.item_id for item in mirror.find(item_type="Repair - Phone")] == ["inv_2"]
+
+
+def test_full_text_index_puts_name_and_sku_in_their_own_columns():
+    mirror = InventoryMirror()
+    if not mirror.fts:
+        pytest.skip("this SQLite has no FTS5")
+    mirror.upsert([record(1, name="Battery", sku="BAT-9")])
+    mirror.merge("inv_1", {"name": "Battery Pro"})
+    match = lambda query: [row[0] for row in mirror._db.execute("SELECT id FROM inventory_fts WHERE inventory_fts MATCH ?", (query,))]
+    assert match("name:Battery") == ["inv_1"] and match("sku:BAT") == ["inv_1"]
+    assert match("name:BAT") == [] and match("sku:Pro") == []
+    assert [item.item_id for item in mirror.search("bat-9")] == ["inv_1"]
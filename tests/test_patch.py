@@ -0,0 +1,20 @@
+from myrepairapp.api import MyRepairApp, UpdateType, _patch_request
+from myrepairapp.inventory_item import item_from_json
+
+from .conftest import FakeTransport, record
+
+
+def test_patch_request_maps_names_without_touching_the_callers_dict(capsys):
+    changed = {"in_stock": 3, "instock_typo": 1, "bin": "C3"}
+    path, sent = _patch_request(UpdateType.INVENTORY, item_from_json(record(1)), changed)
+    assert (path, sent) == ("/inventory/inv_1", {"instock": 3, "bin": "C3"})
+    assert changed == {"in_stock": 3, "instock_typo": 1, "bin": "C3"}
+    assert capsys.readouterr().out == ""
+
+
+def test_update_item_sends_the_mapped_fields():
+    transport = FakeTransport({("PATCH", "/inventory/inv_1"): {}})
+    changed = {"in_stock": 3}
+    MyRepairApp("test-key", transport=transport).update_item(item_from_json(record(1)), changed)
+    assert transport.calls == [("PATCH", "/inventory/inv_1", None, {"instock": 3})]
+    assert changed == {"in_stock": 3}
@@ -0,0 +1,54 @@
+import time
+
+import pytest
+
+from myrepairapp import exceptions
+from myrepairapp.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+
+
+def test_bucket_bursts_then_spaces_reservations_at_its_rate():
+    bucket = TokenBucket(rate=10, capacity=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits == pytest.approx([0, 0, 0.1, 0.2], abs=0.01)
+
+
+def test_reservations_after_a_pause_are_spaced_not_released_at_once():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(0.5)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits == pytest.approx([0.5, 0.6, 0.7, 0.8], abs=0.01)
+
+
+def test_the_same_pause_from_several_429s_does_not_stack():
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(0.5); bucket.pause(0.5); bucket.pause(0.2)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+
+
+def test_every_acquire_is_counted():
+    limiter = RateLimiter(rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+    assert time.monotonic() - started == pytest.approx(0.04, abs=0.02)
+    assert (limiter.stats.requests, limiter.stats.waited) == (3, 2)
+
+
+def test_retry_after_pauses_the_whole_bucket():
+    limiter = RateLimiter(rate=100, burst=10, base_delay=0.01)
+    assert limiter.retry_delay(0, "0.3", time.monotonic()) >= 0.3
+    assert limiter.bucket.reserve() == pytest.approx(0.3, abs=0.02)
+    assert limiter.stats.throttled == 1
+
+
+def test_gives_up_after_max_retries():
+    limiter = RateLimiter(max_retries=1, base_delay=0.01)
+    limiter.retry_delay(0, None, time.monotonic())
+    with pytest.raises(exceptions.TooManyRequests):
+        limiter.retry_delay(1, None, time.monotonic())
+    assert limiter.stats.gave_up == 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
@@ -0,0 +1,44 @@
+import asyncio
+
+from myrepairapp import reports
+from myrepairapp.api import AsyncMyRepairApp, MyRepairApp
+
+from .conftest import FakeTransport
+
+
+def ticket(n, closed: bool) -> dict:
+    return {"id": f"tic_{n}", "createdAt": "2025-01-01T00:00:00.000Z", "closedAt": "2025-01-01T02:00:00.000Z" if closed else None,
+            "isWarranty": str(n)[-1] in "02468", "isReturn": False, "waitingForPart": False, "assigneeId": None}
+
+
+def pages_transport() -> FakeTransport:
+    return FakeTransport({("GET", "/checkin-ticket"): lambda params, data: {"tickets": [ticket(f"{params['query']}1", True), ticket(f"{params['query']}2", params["closed"] == "True")]}})
+
+
+def test_fetch_pages_goes_through_the_public_raw_fetch():
+    transport = pages_transport()
+    pages = list(reports.fetch_pages(MyRepairApp("test-key", transport=transport), ["a", "b"]))
+    assert [call[2] for call in transport.calls] == [{"query": "a", "closed": "True"}, {"query": "b", "closed": "True"}]
+    report = reports.run_report(pages, processes=1)
+    assert (report.tickets, report.closed, report.warranty) == (4, 4, 2)
+    assert report.mean_turnaround == 2.0
+
+
+def test_fetch_pages_async():
+    async def fetch():
+        return await reports.fetch_pages_async(AsyncMyRepairApp("test-key", transport=pages_transport()), ["a", "b"], closed_included=False)
+    report = reports.run_report(asyncio.run(fetch()), processes=1)
+    assert (report.tickets, report.closed) == (4, 2)
+
+
+def test_overlapping_pages_count_each_ticket_once():
+    page = {"tickets": [ticket(1, True), ticket(2, False)]}
+    overlap = {"tickets": [ticket(2, False) | {"updatedAt": "2025-01-02T00:00:00.000Z", "closedAt": "2025-01-01T04:00:00.000Z"}]}
+    for processes in (1, 2):
+        report = reports.run_report([page, overlap] + [page] * 3, processes=processes, pages_per_task=1)
+        assert (report.tickets, report.closed) == (2, 2) # the newer copy of tic_2 is the closed one
+        assert report.mean_turnaround == 3.0
+
+
+def test_duplicates_in_one_page_are_counted_once():
+    assert reports.report_page([ticket(1, True)] * 5).tickets == 1
@@ -0,0 +1,94 @@
+import asyncio, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from myrepairapp.api import MyRepairApp
+from myrepairapp.singleflight import SingleFlight
+
+from .conftest import FakeTransport, record
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_together(flights: SingleFlight, key: tuple, call, callers: int = 8) -> list:
+    """Has `callers` threads ask for `key` while `call` is held open, then lets it finish."""
+    release = threading.Event()
+    def held():
+        release.wait(5)
+        return call()
+    with ThreadPoolExecutor(callers) as pool:
+        futures = [pool.submit(flights.do, key, held) for _ in range(callers)]
+        wait_for(lambda: flights.leaders + flights.saved == callers)
+        release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_threads_asking_at_once_share_one_call():
+    flights = SingleFlight(); calls = []
+    results = run_together(flights, ("k",), lambda: calls.append(1) or object())
+    assert len(calls) == 1 and all(result is results[0] for result in results)
+    assert (flights.leaders, flights.saved, len(flights)) == (1, 7, 0)
+
+
+def test_an_error_reaches_every_waiter_and_is_not_kept():
+    flights = SingleFlight()
+    def fail():
+        raise RuntimeError("down")
+    assert all(isinstance(result, RuntimeError) for result in run_together(flights, ("k",), fail))
+    assert flights.do(("k",), lambda: "up") == "up"
+
+
+def test_different_keys_do_not_share():
+    flights = SingleFlight()
+    assert (flights.do(("a",), lambda: 1), flights.do(("b",), lambda: 2)) == (1, 2)
+    assert flights.saved == 0
+
+
+def test_tasks_asking_at_once_share_one_call():
+    flights = SingleFlight(); calls = []
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+    async def main():
+        return await asyncio.gather(*(flights.do_async(("k",), call) for _ in range(5)))
+    assert asyncio.run(main()) == [1] * 5
+    assert (len(calls), flights.saved, len(flights)) == (1, 4, 0)
+
+
+def test_cancelling_one_waiter_leaves_the_others_their_result():
+    flights = SingleFlight()
+    async def call():
+        await asyncio.sleep(0.05)
+        return "done"
+    async def main():
+        first = asyncio.ensure_future(flights.do_async(("k",), call))
+        second = asyncio.ensure_future(flights.do_async(("k",), call))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+    assert asyncio.run(main()) == "done"
+
+
+def test_client_coalesces_identical_searches_but_hands_out_separate_items():
+    release = threading.Event()
+    def answer(params, data):
+        release.wait(5)
+        return [record(1)]
+    transport = FakeTransport({("GET", "/inventory/search"): answer})
+    mrp = MyRepairApp("test-key", transport=transport)
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(mrp.inventory_search, "Screen") for _ in range(4)]
+        wait_for(lambda: mrp.single_flight.leaders + mrp.single_flight.saved == 4)
+        release.set()
+        results = [future.result()[0] for future in futures]
+    assert len(transport.calls) == 1
+    assert len({id(item) for item in results}) == 4 and {item.item_id for item in results} == {"inv_1"}
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from myrepairapp.streaming import JSONArrayStream
+
+TICKETS = [{"id": "tic_1", "note": 'brace } bracket ] quote \" backslash \\', "items": [{"id": "inv_1"}, []]},
+           {"id": "tic_2", "note": "naïve café — 📱", "nested": {"a": [1, 2, {"b": None}]}},
+           {"id": "tic_3", "note": "\\\\\"", "empty": {}}]
+BODY = json.dumps({"count": 3, "tickets": TICKETS, "after": [0]}, ensure_ascii=False).encode()
+
+
+def stream_in_chunks(body: bytes, bounds: list[int], key: str = "tickets") -> list:
+    stream = JSONArrayStream(key)
+    found = []
+    for start, end in zip([0] + bounds, bounds + [len(body)]):
+        found += stream.feed(body[start:end])
+    stream.close()
+    return found
+
+
+@pytest.mark.parametrize("split", range(1, len(BODY)))
+def test_every_split_point(split):
+    assert stream_in_chunks(BODY, [split]) == TICKETS
+
+
+def test_one_byte_at_a_time():
+    assert stream_in_chunks(BODY, list(range(1, len(BODY)))) == TICKETS
+
+
+def test_bare_array_of_scalars_and_objects():
+    body = b'[1, 22.5, "x,]", true, null, {"a": 1}, [2]]'
+    assert stream_in_chunks(body, [3, 9, 15], key=None) == [1, 22.5, "x,]", True, None, {"a": 1}, [2]]
+
+
+def test_elements_arrive_as_soon_as_they_are_complete():
+    stream = JSONArrayStream("tickets")
+    cut = BODY.index(b'"tic_2"')
+    assert stream.feed(BODY[:cut]) == TICKETS[:1]
+    assert stream.feed(BODY[cut:]) == TICKETS[1:]
+
+
+def test_truncated_response_raises_on_close():
+    stream = JSONArrayStream("tickets")
+    stream.feed(BODY[:len(BODY) // 2])
+    with pytest.raises(ValueError):
+        stream.close()
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from myrepairapp import timestamps
+from myrepairapp.checkin_ticket import ticket_from_json
+from myrepairapp.inventory_item import item_from_json
+from myrepairapp.timestamps import TimeIndex
+
+from .conftest import raw_ticket, record
+
+
+def items() -> list:
+    # updated on days 3, 1, never, 2 and 1 again, an hour later
+    stamps = ["2025-01-03T00:00:00.000Z", "2025-01-01T00:00:00.000Z", None, "2025-01-02T00:00:00.000Z", "2025-01-01T01:00:00.000Z"]
+    return [item_from_json(record(n, updatedAt=stamp)) for n, stamp in enumerate(stamps)]
+
+
+def day(n: int) -> datetime:
+    return datetime(2025, 1, n, tzinfo=timezone.utc)
+
+
+def test_to_datetime_reads_api_and_naive_timestamps_as_utc():
+    assert timestamps.to_datetime("2025-01-17T02:44:28.254Z") == datetime(2025, 1, 17, 2, 44, 28, 254000, tzinfo=timezone.utc)
+    assert timestamps.to_datetime("2025-01-17T02:44:28") == datetime(2025, 1, 17, 2, 44, 28, tzinfo=timezone.utc)
+    assert timestamps.to_datetime("") is None and timestamps.epoch_seconds(None) is None
+    assert timestamps.as_epoch(datetime(2025, 1, 1)) == timestamps.as_epoch("2025-01-01T00:00:00Z") == day(1).timestamp()
+    with pytest.raises(ValueError):
+        timestamps.to_datetime("yesterday")
+
+
+def test_parsed_timestamp_is_parsed_again_after_the_raw_string_changes():
+    item = item_from_json(record(1, updatedAt="2025-01-01T00:00:00.000Z"))
+    assert item.updated_datetime == day(1)
+    assert item.updated_datetime is item.updated_datetime # parsed once
+    item.updated_at = "2025-01-02T00:00:00.000Z"
+    assert item.updated_datetime == day(2)
+    item.updated_at = None
+    assert item.updated_datetime is None
+
+
+def test_ticket_timestamps_follow_their_raw_strings():
+    ticket = ticket_from_json(raw_ticket(1, updatedAt="2025-01-02T00:00:00.000Z"))
+    assert ticket.updatedDatetime == day(2)
+    ticket.updatedAt = "2025-01-03T00:00:00.000Z"
+    assert timestamps.sort_by_time([ticket], "updatedAt") == [ticket] and ticket.updatedDatetime == day(3)
+
+
+def test_sort_by_time_puts_missing_timestamps_last():
+    results = items()
+    assert [item.sku for item in timestamps.sort_by_time(results, "updated_at")] == ["SKU-1", "SKU-4", "SKU-3", "SKU-0", "SKU-2"]
+    assert [item.sku for item in timestamps.sort_by_time(results, "updated_datetime", reverse=True)] == ["SKU-0", "SKU-3", "SKU-4", "SKU-1", "SKU-2"]
+    with pytest.raises(AttributeError):
+        timestamps.sort_by_time(results, "price")
+
+
+@pytest.mark.parametrize("start, end", [(None, None), (day(1), day(2)), ("2025-01-01T00:00:00Z", None), (None, day(3)),
+                                        (day(1).timestamp() + 1, day(3).timestamp()), (day(2), day(2)), (day(4), None)])
+def test_time_index_matches_between(start, end):
+    results = items()
+    assert TimeIndex(results, "updated_at").between(start, end) == timestamps.sort_by_time(timestamps.between(results, "updated_at", start, end), "updated_at")
+
+
+def test_time_index_bounds_are_half_open():
+    index = TimeIndex(items(), "updated_at")
+    assert len(index) == 4 # the item without a timestamp is left out
+    assert [item.sku for item in index.between(day(1), day(2))] == ["SKU-1", "SKU-4"] # start included
+    assert [item.sku for item in index.between(day(2), day(3))] == ["SKU-3"] # end excluded
+    assert [item.sku for item in index.between(start=day(3))] == ["SKU-0"] and index.between(day(2), day(2)) == []